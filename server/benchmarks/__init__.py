@@ -0,0 +1,6 @@
+"""
+Benchmarks
+
+Standalone performance scripts. Run them from the server directory with
+``python -m benchmarks.<name>``.
+"""
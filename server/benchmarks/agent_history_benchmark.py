@@ -0,0 +1,79 @@
+"""
+Per-turn cost of ``BaseReactAgent.execute`` as a conversation grows.
+
+The checkpointer hands back the whole thread history on every turn. Before the
+per-thread message cursor, the response was built by walking all of it, so
+each turn cost more than the last. This drives one thread for a few hundred
+turns against a stub graph that keeps the history in memory, so no LLM or
+network access is needed. It compares the current ``execute`` with building the
+response from the full history, which was the old behaviour.
+
+Run from the server directory:
+
+    python -m benchmarks.agent_history_benchmark
+"""
+
+import os
+import time
+import asyncio
+import statistics
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+# The Gemini client is created but never called
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+os.environ["ALRIS_SPECULATIVE_YOUTUBE"] = "false"
+
+from layers.langchain_agent.browser_agent import BrowserAgent
+
+REPORT_AT = (1, 10, 50, 100, 200, 300)
+
+class HistoryGraph:
+    """Stands in for the compiled ReAct graph: appends one tool round trip per turn and returns the full history."""
+    
+    def __init__(self):
+        self.threads = {}
+    
+    async def ainvoke(self, state, config=None):
+        history = self.threads.setdefault(config["configurable"]["thread_id"], [])
+        turn = len(history) // 4
+        history.extend(state["messages"])
+        history.append(AIMessage(content="", tool_calls=[{"name": "navigate_to_url", "args": {"url": f"https://example.com/{turn}"}, "id": f"call_{turn}"}]))
+        history.append(ToolMessage(content=f"Navigated to https://example.com/{turn}", tool_call_id=f"call_{turn}", name="navigate_to_url"))
+        history.append(AIMessage(content=f"Opened page {turn} for you."))
+        return {"messages": list(history)}
+
+async def run(agent: BrowserAgent, turns: int, full_history: bool):
+    agent.agent_executor = HistoryGraph()
+    thread_id = f"benchmark-{full_history}"
+    agent.release_thread(thread_id)
+    timings = {}
+    for turn in range(1, turns + 1):
+        command = f"open page {turn}"
+        started = time.perf_counter()
+        if full_history:
+            result = await agent.agent_executor.ainvoke({"messages": [HumanMessage(content=command)]},
+                                                        config=agent._get_config(thread_id))
+            response = await agent._build_response(command, result)
+        else:
+            response = await agent.execute(command, thread_id=thread_id)
+        timings[turn] = time.perf_counter() - started
+        assert response["status"] == "success"
+    return timings, len(response["messages"])
+
+async def main(turns: int = 300, repeats: int = 3):
+    agent = BrowserAgent()
+    results = {}
+    for name, full_history in (("full history (before)", True), ("current turn (cursor)", False)):
+        runs = [await run(agent, turns, full_history) for _ in range(repeats)]
+        results[name] = ({turn: statistics.median(timings[turn] for timings, _ in runs) for turn in runs[0][0]}, runs[0][1])
+    
+    print(f"{turns} turns on one thread, 4 messages per turn; median of {repeats} runs")
+    print(f"{'turn':>6}" + "".join(f"{name:>26}" for name in results))
+    for turn in REPORT_AT:
+        if turn <= turns:
+            print(f"{turn:>6}" + "".join(f"{timings[turn] * 1e6:>23.0f} us" for timings, _ in results.values()))
+    for name, (_, returned) in results.items():
+        print(f"{name}: {returned} messages returned on the last turn")
+
+if __name__ == "__main__":
+    asyncio.run(main())
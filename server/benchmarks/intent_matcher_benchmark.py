@@ -0,0 +1,75 @@
+"""
+Micro-benchmark: IntentDetector.detect_intent, end to end on raw commands, vs. the
+original per-pattern re.search loop and a single combined alternation.
+
+Run from the server directory:
+
+    python -m benchmarks.intent_matcher_benchmark
+"""
+
+import re
+import timeit
+from layers.langchain_agent.intent_detector import IntentDetector
+
+COMMANDS = [
+    "Navigate to example.com and take a screenshot",
+    "Please schedule a meeting with the design team tomorrow at 3pm",
+    "Send an email to alice about the quarterly report",
+    "What is the capital of France?",
+    "Fill the form on the signup page and click the submit button",
+    "Tell me a joke about programmers",
+    "remind me to call mum on sunday evening",
+    "I'd like to watch a video about sourdough bread"
+]
+
+def legacy_detect_intent(patterns, command: str) -> str:
+    command = command.lower()
+    for intent_type, intent_patterns in patterns.items():
+        for pattern in intent_patterns:
+            if re.search(pattern, command):
+                return intent_type
+    return "general"
+
+def build_alternation(patterns):
+    """One regex for all patterns; exact precedence needs a follow-up check of earlier patterns."""
+    flat = [(intent, pattern) for intent, intent_patterns in patterns.items() for pattern in intent_patterns]
+    combined = re.compile("|".join(f"(?P<p{i}>{pattern})" for i, (_, pattern) in enumerate(flat)))
+    compiled = [re.compile(pattern) for _, pattern in flat]
+    
+    def detect(command: str) -> str:
+        command = command.lower()
+        found = combined.search(command)
+        if not found:
+            return "general"
+        winner = int(found.lastgroup[1:])
+        for i in range(winner):
+            if compiled[i].search(command):
+                return flat[i][0]
+        return flat[winner][0]
+    return detect
+
+def main(number: int = 20000):
+    detector = IntentDetector()
+    patterns = {intent: detector.get_patterns_for_intent(intent) for intent in ("browser", "email", "calendar")}
+    alternation = build_alternation(patterns)
+    
+    for command in COMMANDS:
+        expected = legacy_detect_intent(patterns, command)
+        assert detector.detect_intent(command) == expected, command
+        assert detector.match_intent(command).intent == expected, command
+        assert alternation(command) == expected, command
+    
+    timings = {
+        "legacy re.search loop": timeit.timeit(lambda: [legacy_detect_intent(patterns, c) for c in COMMANDS], number=number),
+        "combined alternation": timeit.timeit(lambda: [alternation(c) for c in COMMANDS], number=number),
+        "detect_intent": timeit.timeit(lambda: [detector.detect_intent(c) for c in COMMANDS], number=number),
+        "match_intent (spans)": timeit.timeit(lambda: [detector.match_intent(c) for c in COMMANDS], number=number)
+    }
+    
+    calls = number * len(COMMANDS)
+    baseline = timings["legacy re.search loop"]
+    for name, elapsed in timings.items():
+        print(f"{name:<28} {elapsed / calls * 1e6:6.2f} us/command  ({baseline / elapsed:.2f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Event-loop latency while YouTube searches are in flight: calling the blocking
+``YouTubeSearchTool.run`` inline (the old behaviour) vs. ``run_youtube_search``
+on the bounded worker pool.
+
+A ticker coroutine sleeps for 5 ms in a loop and records how late it wakes
+up; that lag is what every other WebSocket client sees. The search tool is a
+stub that blocks for a fixed time, so no network access is needed.
+
+Run from the server directory:
+
+    python -m benchmarks.youtube_search_benchmark
+"""
+
+import time
+import asyncio
+import statistics
+from layers.external_services import youtube_search
+
+TICK_SECONDS = 0.005
+
+class BlockingSearchTool:
+    """Stands in for YouTubeSearchTool: a synchronous call that blocks its thread."""
+    
+    def __init__(self, latency: float):
+        self.latency = latency
+    
+    def run(self, query: str) -> str:
+        time.sleep(self.latency)
+        return "['https://www.youtube.com/watch?v=dQw4w9WgXcQ']"
+
+async def measure_lag(searches):
+    lags = []
+    done = asyncio.Event()
+    
+    async def ticker():
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(TICK_SECONDS)
+            lags.append(time.perf_counter() - started - TICK_SECONDS)
+    
+    tick_task = asyncio.ensure_future(ticker())
+    await asyncio.sleep(TICK_SECONDS * 4)
+    started = time.perf_counter()
+    await asyncio.gather(*searches)
+    elapsed = time.perf_counter() - started
+    done.set()
+    await tick_task
+    return elapsed, lags
+
+async def main(concurrency: int = 8, latency: float = 0.2):
+    tool = BlockingSearchTool(latency)
+    youtube_search.configure(max_workers=concurrency, timeout=5.0)
+    
+    async def inline_search(i):
+        return tool.run(f"query {i},5")
+    
+    baseline = await measure_lag([asyncio.sleep(latency) for _ in range(concurrency)])
+    inline = await measure_lag([inline_search(i) for i in range(concurrency)])
+    pooled = await measure_lag([youtube_search.run_youtube_search(f"query {i}", 5, tool) for i in range(concurrency)])
+    youtube_search.shutdown()
+    
+    print(f"{concurrency} concurrent searches, {latency * 1000:.0f} ms each")
+    for name, (elapsed, lags) in (("no searches (asyncio.sleep)", baseline), ("inline tool.run", inline), ("worker pool", pooled)):
+        lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+        p99 = lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))]
+        print(f"{name:<28} wall {elapsed * 1000:7.1f} ms  loop lag median {statistics.median(lags_ms):7.2f} ms"
+              f"  p99 {p99:7.2f} ms  max {lags_ms[-1]:7.2f} ms  ticks {len(lags)}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -16,4 +16,85 @@ GEMINI_MODEL = os.getenv("GEMINI_MODEL")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-LOG_FILE = os.getenv("LOG_FILE", "alris_server.log") 
\ No newline at end of file
+LOG_FILE = os.getenv("LOG_FILE", "alris_server.log") 
+
+BATCH_MAX_COMMANDS = int(os.getenv("ALRIS_BATCH_MAX_COMMANDS", "500"))
+BATCH_DEFAULT_CONCURRENCY = int(os.getenv("ALRIS_BATCH_CONCURRENCY", "4"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("ALRIS_BATCH_MAX_CONCURRENCY", "16"))
+
+JOB_MAX_JOBS = int(os.getenv("ALRIS_JOB_MAX_JOBS", "1000"))
+JOB_TTL_SECONDS = float(os.getenv("ALRIS_JOB_TTL_SECONDS", "900"))
+
+ADMISSION_MAX_CONCURRENT = int(os.getenv("ALRIS_MAX_CONCURRENT", "32"))
+ADMISSION_MAX_QUEUE = int(os.getenv("ALRIS_MAX_QUEUE", "100"))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ALRIS_QUEUE_TIMEOUT", "10"))
+# Per-intent concurrency caps, e.g. "browser=8,general=8,calendar=4"
+ADMISSION_INTENT_LIMITS = {
+    intent.strip(): int(limit)
+    for intent, limit in (
+        item.split("=", 1) for item in os.getenv("ALRIS_INTENT_LIMITS", "browser=8,general=8,calendar=4").split(",") if "=" in item
+    )
+}
+
+# Logging pipeline; sampling and truncation take "logger=value" lists, e.g. "mcp_connector.client=0.1"
+LOG_ASYNC = os.getenv("ALRIS_LOG_ASYNC", "True").lower() == "true"
+LOG_MAX_BYTES = int(os.getenv("ALRIS_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("ALRIS_LOG_BACKUP_COUNT", "5"))
+LOG_COMPRESS = os.getenv("ALRIS_LOG_COMPRESS", "False").lower() == "true"
+LOG_SAMPLING = os.getenv("ALRIS_LOG_SAMPLING", "")
+LOG_TRUNCATE = os.getenv("ALRIS_LOG_TRUNCATE", "")
+
+TRACING_ENABLED = os.getenv("ALRIS_TRACING", "True").lower() == "true"
+TRACE_FILE = os.getenv("ALRIS_TRACE_FILE")
+TRACE_BUFFER_SIZE = int(os.getenv("ALRIS_TRACE_BUFFER_SIZE", "200"))
+
+# Local intent classifier (see train_intent_classifier.py); unset disables it
+INTENT_MODEL_PATH = os.getenv("ALRIS_INTENT_MODEL")
+INTENT_CLASSIFIER_THRESHOLD = float(os.getenv("ALRIS_INTENT_THRESHOLD", "0.8"))
+
+# Shared YouTube search result cache; ALRIS_YOUTUBE_CACHE_STALE > 0 enables stale-while-revalidate
+YOUTUBE_CACHE_MAX_ENTRIES = int(os.getenv("ALRIS_YOUTUBE_CACHE_SIZE", "1000"))
+YOUTUBE_CACHE_TTL = float(os.getenv("ALRIS_YOUTUBE_CACHE_TTL", "3600"))
+YOUTUBE_CACHE_STALE = float(os.getenv("ALRIS_YOUTUBE_CACHE_STALE", "0"))
+YOUTUBE_CACHE_FILE = os.getenv("ALRIS_YOUTUBE_CACHE_FILE")
+# YouTube fetches run on a bounded thread pool with a per-call timeout
+YOUTUBE_SEARCH_WORKERS = int(os.getenv("ALRIS_YOUTUBE_WORKERS", "8"))
+YOUTUBE_SEARCH_TIMEOUT = float(os.getenv("ALRIS_YOUTUBE_TIMEOUT", "10"))
+# Query folding for the cache; the default 1.0 only merges exact rephrasings, lower values also merge near-duplicates
+YOUTUBE_QUERY_CANONICALIZE = os.getenv("ALRIS_QUERY_CANONICALIZE", "True").lower() == "true"
+YOUTUBE_QUERY_SIMILARITY = float(os.getenv("ALRIS_QUERY_SIMILARITY", "1.0"))
+# Video metadata enrichment: a YouTube Data API key, or a local JSON stub of {video_id: {...}}
+YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
+YOUTUBE_API_URL = os.getenv("ALRIS_YOUTUBE_API_URL")
+YOUTUBE_METADATA_STUB = os.getenv("ALRIS_YOUTUBE_METADATA_STUB")
+YOUTUBE_METADATA_TTL = float(os.getenv("ALRIS_YOUTUBE_METADATA_TTL", "86400"))
+# Max concurrent agent runs per LLM model; "*" applies to models not listed, 0 means unlimited
+LLM_CONCURRENCY_LIMITS = {
+    model.strip(): int(limit)
+    for model, limit in (
+        item.split("=", 1) for item in os.getenv("ALRIS_LLM_CONCURRENCY", "*=16").split(",") if "=" in item
+    )
+}
+# Opt-in SQLite cache of single-turn LLM responses; unset disables it
+LLM_CACHE_FILE = os.getenv("ALRIS_LLM_CACHE_FILE")
+LLM_CACHE_MAX_BYTES = int(os.getenv("ALRIS_LLM_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+LLM_CACHE_TTL = float(os.getenv("ALRIS_LLM_CACHE_TTL", "86400"))
+
+# Agent conversation memory: in-process with TTL and LRU caps, or SQLite when ALRIS_CHECKPOINT_DB is set
+MEMORY_THREAD_TTL = float(os.getenv("ALRIS_THREAD_TTL", "1800"))
+MEMORY_MAX_THREADS = int(os.getenv("ALRIS_MAX_THREADS", "1000"))
+MEMORY_MAX_BYTES = int(os.getenv("ALRIS_MAX_THREAD_BYTES", str(256 * 1024 * 1024)))
+CHECKPOINT_DB = os.getenv("ALRIS_CHECKPOINT_DB")
+CHECKPOINT_TTL = float(os.getenv("ALRIS_CHECKPOINT_TTL", str(7 * 86400)))
+# What each agent model call replays from a thread; the stored history is untouched
+HISTORY_MAX_TURNS = int(os.getenv("ALRIS_HISTORY_MAX_TURNS", "10"))
+HISTORY_MAX_TOKENS = int(os.getenv("ALRIS_HISTORY_MAX_TOKENS", "8000"))
+HISTORY_SUMMARY = os.getenv("ALRIS_HISTORY_SUMMARY", "True").lower() == "true"
+HISTORY_SUMMARY_EVERY = int(os.getenv("ALRIS_HISTORY_SUMMARY_EVERY", "5"))
+HISTORY_TOOL_CHARS = int(os.getenv("ALRIS_HISTORY_TOOL_CHARS", "1000"))
+# Smaller model tried before GEMINI_MODEL on every agent call; unset disables the cascade
+CASCADE_MODEL = os.getenv("ALRIS_CASCADE_MODEL")
+# Tool calls of one model reply run at once; 0 means no limit
+TOOL_CONCURRENCY = int(os.getenv("ALRIS_TOOL_CONCURRENCY", "4"))
+# Start the fallback YouTube search alongside the LLM instead of after it
+SPECULATIVE_YOUTUBE = os.getenv("ALRIS_SPECULATIVE_YOUTUBE", "True").lower() == "true"
@@ -0,0 +1,13 @@
+"""
+Core Server Infrastructure
+
+This package holds the request-handling machinery that sits in front of the
+agent layers (background jobs, admission control, turn ordering) and the
+cross-cutting concerns shared by every layer, such as metrics.
+"""
+
+from .job_store import Job, JobStore, JobStoreFullError
+from .admission import AdmissionController, AdmissionRejectedError
+from .turn_order import Turn, TurnQueue
+
+__all__ = ["Job", "JobStore", "JobStoreFullError", "AdmissionController", "AdmissionRejectedError", "Turn", "TurnQueue"]
@@ -0,0 +1,124 @@
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional
+from core.metrics import REGISTRY
+
+logger = logging.getLogger("core.admission")
+
+ADMISSIONS = REGISTRY.counter(
+    "alris_admission_total",
+    "Commands admitted or rejected by the admission controller, by outcome",
+    ("outcome",)
+)
+
+class AdmissionRejectedError(Exception):
+    """Raised when a request cannot be admitted.
+    
+    ``status_code`` is 429 when the wait queue is already full and 503 when the
+    request waited past the queue deadline.
+    """
+    
+    def __init__(self, message: str, status_code: int, retry_after: float):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+class AdmissionController:
+    """Caps how many commands run at once, globally and per intent.
+    
+    Requests beyond the concurrency limits wait in a bounded queue for at most
+    ``queue_timeout`` seconds. Requests that find the queue full are rejected
+    immediately so a burst fails fast instead of timing out downstream.
+    """
+    
+    def __init__(self, max_concurrent: int = 32, max_queue: int = 100,
+                 queue_timeout: float = 10.0, intent_limits: Optional[Dict[str, int]] = None):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.intent_limits = dict(intent_limits or {})
+        
+        self._global = asyncio.Semaphore(max_concurrent)
+        self._intent_semaphores = {
+            intent: asyncio.Semaphore(limit) for intent, limit in self.intent_limits.items()
+        }
+        
+        self._waiting = 0
+        self._active = 0
+        self._active_by_intent: Dict[str, int] = {}
+        self._admitted = 0
+        self._rejected = {"queue_full": 0, "deadline": 0}
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+    
+    @asynccontextmanager
+    async def admit(self, intent: str = "general"):
+        if self._waiting >= self.max_queue:
+            self._rejected["queue_full"] += 1
+            ADMISSIONS.inc(outcome="queue_full")
+            logger.warning(f"Rejecting {intent} command: admission queue full ({self._waiting} waiting)")
+            raise AdmissionRejectedError("Server is busy, please retry shortly", 429, self.queue_timeout)
+        
+        intent_semaphore = self._intent_semaphores.get(intent)
+        acquired = []
+        started = time.perf_counter()
+        deadline = started + self.queue_timeout
+        try:
+            for semaphore in (intent_semaphore, self._global):
+                if semaphore is None:
+                    continue
+                if semaphore.locked():
+                    await self._wait_for_slot(semaphore, deadline)
+                else:
+                    await semaphore.acquire()
+                acquired.append(semaphore)
+        except asyncio.TimeoutError:
+            for semaphore in acquired:
+                semaphore.release()
+            self._rejected["deadline"] += 1
+            ADMISSIONS.inc(outcome="deadline")
+            logger.warning(f"Rejecting {intent} command: waited longer than {self.queue_timeout}s for a slot")
+            raise AdmissionRejectedError("Server is overloaded, please retry later", 503, self.queue_timeout)
+        except BaseException:
+            for semaphore in acquired:
+                semaphore.release()
+            raise
+        
+        waited = time.perf_counter() - started
+        self._admitted += 1
+        ADMISSIONS.inc(outcome="admitted")
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        self._active += 1
+        self._active_by_intent[intent] = self._active_by_intent.get(intent, 0) + 1
+        try:
+            yield
+        finally:
+            self._active -= 1
+            self._active_by_intent[intent] -= 1
+            for semaphore in acquired:
+                semaphore.release()
+    
+    async def _wait_for_slot(self, semaphore: asyncio.Semaphore, deadline: float):
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=max(deadline - time.perf_counter(), 0))
+        finally:
+            self._waiting -= 1
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active": self._active,
+            "queue_depth": self._waiting,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "queue_timeout": self.queue_timeout,
+            "active_by_intent": {k: v for k, v in self._active_by_intent.items() if v},
+            "intent_limits": self.intent_limits,
+            "admitted": self._admitted,
+            "rejected": dict(self._rejected),
+            "wait_seconds_avg": self._wait_total / self._admitted if self._admitted else 0.0,
+            "wait_seconds_max": self._wait_max
+        }
@@ -0,0 +1,138 @@
+import time
+import uuid
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger("core.job_store")
+
+PENDING = "pending"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = (COMPLETED, FAILED, CANCELLED)
+
+class JobStoreFullError(Exception):
+    """Raised when the store is at capacity and every job is still running."""
+
+class Job:
+    def __init__(self, command: str):
+        self.id = str(uuid.uuid4())
+        self.command = command
+        self.status = PENDING
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+        self._done = asyncio.Event()
+    
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+    
+    def start(self):
+        self.status = RUNNING
+    
+    def complete(self, result: Dict[str, Any]):
+        self._finish(COMPLETED, result=result)
+    
+    def fail(self, error: str):
+        self._finish(FAILED, error=error)
+    
+    def mark_cancelled(self):
+        self._finish(CANCELLED)
+    
+    def _finish(self, status: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
+        self.status = status
+        self.result = result
+        self.error = error
+        self.finished_at = time.time()
+        self._done.set()
+    
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the job to finish; returns False if the timeout elapsed first."""
+        try:
+            await asyncio.wait_for(self._done.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+    
+    def to_dict(self) -> Dict[str, Any]:
+        job = {
+            "id": self.id,
+            "status": self.status,
+            "command": self.command,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at
+        }
+        if self.result is not None:
+            job["result"] = self.result
+        if self.error is not None:
+            job["error"] = self.error
+        return job
+
+class JobStore:
+    """Bounded in-memory job registry.
+    
+    Finished jobs are kept for ``ttl_seconds`` so clients can collect their
+    results, then evicted. When the store is full the oldest finished jobs are
+    evicted early; running jobs are never evicted.
+    """
+    
+    def __init__(self, max_jobs: int = 1000, ttl_seconds: float = 900):
+        self.max_jobs = max_jobs
+        self.ttl_seconds = ttl_seconds
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._jobs)
+    
+    def create(self, command: str) -> Job:
+        self.evict_expired()
+        
+        if len(self._jobs) >= self.max_jobs:
+            for job_id, job in list(self._jobs.items()):
+                if job.finished:
+                    del self._jobs[job_id]
+                    break
+            else:
+                raise JobStoreFullError(f"Job store is full ({self.max_jobs} jobs in progress)")
+        
+        job = Job(command)
+        self._jobs[job.id] = job
+        logger.debug(f"Created job {job.id} for command: {command}")
+        return job
+    
+    def get(self, job_id: str) -> Optional[Job]:
+        job = self._jobs.get(job_id)
+        if job and self._expired(job, time.time()):
+            del self._jobs[job_id]
+            return None
+        return job
+    
+    def evict_expired(self) -> int:
+        now = time.time()
+        expired = [job_id for job_id, job in self._jobs.items() if self._expired(job, now)]
+        for job_id in expired:
+            del self._jobs[job_id]
+        if expired:
+            logger.debug(f"Evicted {len(expired)} expired jobs")
+        return len(expired)
+    
+    def cancel_all(self):
+        for job in self._jobs.values():
+            if job.task and not job.task.done():
+                job.task.cancel()
+    
+    def stats(self) -> Dict[str, int]:
+        counts = {"total": len(self._jobs)}
+        for job in self._jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return counts
+    
+    def _expired(self, job: Job, now: float) -> bool:
+        return job.finished and now - job.finished_at > self.ttl_seconds
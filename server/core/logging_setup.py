@@ -0,0 +1,149 @@
+import os
+import gzip
+import queue
+import random
+import atexit
+import shutil
+import logging
+import logging.handlers
+from typing import Dict, Optional
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+
+def _match_logger(name: str, settings: Dict[str, float]) -> Optional[float]:
+    """Find the setting for a logger, falling back to its parents and then ``*``."""
+    while name:
+        if name in settings:
+            return settings[name]
+        name = name.rpartition(".")[0]
+    return settings.get("*")
+
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of sub-WARNING records from selected loggers."""
+    
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = _match_logger(record.name, self.rates)
+        return rate is None or random.random() < rate
+
+class TruncatingFilter(logging.Filter):
+    """Cap the length of log messages from selected loggers."""
+    
+    def __init__(self, limits: Dict[str, int]):
+        super().__init__()
+        self.limits = limits
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        limit = _match_logger(record.name, self.limits)
+        if limit:
+            message = record.getMessage()
+            if len(message) > limit:
+                record.msg = f"{message[:int(limit)]}... [truncated {len(message) - int(limit)} chars]"
+                record.args = None
+        return True
+
+def _gzip_namer(name: str) -> str:
+    return f"{name}.gz"
+
+def _gzip_rotator(source: str, dest: str):
+    with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+def parse_logger_settings(value: str) -> Dict[str, float]:
+    """Parse ``"mcp_connector.client=0.1,*=1"`` style settings."""
+    settings = {}
+    for item in value.split(","):
+        if "=" in item:
+            name, setting = item.split("=", 1)
+            settings[name.strip()] = float(setting)
+    return settings
+
+def configure_logging(level: int = logging.INFO,
+                      log_file: Optional[str] = None,
+                      async_mode: bool = True,
+                      max_bytes: int = 10 * 1024 * 1024,
+                      backup_count: int = 5,
+                      compress: bool = False,
+                      sample_rates: Optional[Dict[str, float]] = None,
+                      truncate_limits: Optional[Dict[str, int]] = None):
+    """Configure root logging for the server.
+    
+    In async mode records are handed to a ``QueueHandler`` and written to the
+    console and file by a background ``QueueListener`` thread, so the event
+    loop never blocks on log I/O. The log file is rotated at ``max_bytes``
+    (0 disables rotation) and old files are gzipped when ``compress`` is set.
+    Sampling and truncation run before a record is queued.
+    """
+    global _listener, _queue_handler
+    
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        if max_bytes:
+            file_handler = logging.handlers.RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count)
+            if compress:
+                file_handler.namer = _gzip_namer
+                file_handler.rotator = _gzip_rotator
+        else:
+            file_handler = logging.FileHandler(log_file)
+        handlers.append(file_handler)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    filters = []
+    if sample_rates:
+        filters.append(SamplingFilter(sample_rates))
+    if truncate_limits:
+        filters.append(TruncatingFilter(truncate_limits))
+    
+    if _listener:
+        _listener.stop()
+        _listener = None
+        _queue_handler = None
+    
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    root.setLevel(level)
+    
+    if async_mode:
+        log_queue = queue.SimpleQueue()
+        _queue_handler = logging.handlers.QueueHandler(log_queue)
+        for log_filter in filters:
+            _queue_handler.addFilter(log_filter)
+        root.addHandler(_queue_handler)
+        
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+    else:
+        for handler in handlers:
+            for log_filter in filters:
+                handler.addFilter(log_filter)
+            root.addHandler(handler)
+
+def shutdown_logging():
+    """Flush queued records, stop the background writer thread and log synchronously from then on."""
+    global _listener, _queue_handler
+    if _listener:
+        _listener.stop()
+        root = logging.getLogger()
+        if _queue_handler in root.handlers:
+            # Records logged later (e.g. by other atexit hooks) would sit in a queue nobody reads
+            root.removeHandler(_queue_handler)
+            for handler in _listener.handlers:
+                for log_filter in _queue_handler.filters:
+                    handler.addFilter(log_filter)
+                root.addHandler(handler)
+        _listener = None
+        _queue_handler = None
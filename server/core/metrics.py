@@ -0,0 +1,182 @@
+import time
+import asyncio
+import logging
+import functools
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Tuple, Callable, Any, Optional
+from .tracing import tracer
+
+logger = logging.getLogger("core.metrics")
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _format_labels(labelnames: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class _Metric:
+    type_name = ""
+    
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], Any] = {}
+    
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+    
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+    
+    def _samples(self):
+        for key, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {value}"
+
+class Counter(_Metric):
+    type_name = "counter"
+    
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+class Gauge(_Metric):
+    type_name = "gauge"
+    
+    def set(self, value: float, **labels):
+        self._values[self._key(labels)] = value
+    
+    def clear(self):
+        """Drop every labelled value, so series that are no longer reported disappear."""
+        self._values.clear()
+
+class Histogram(_Metric):
+    type_name = "histogram"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+    
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        series = self._values.get(key)
+        if series is None:
+            # Per-bucket counts (last slot is +Inf), then sum and count
+            series = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+    
+    def _samples(self):
+        for key, (counts, total, count) in self._values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {count}"
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+    
+    def _register(self, metric: _Metric) -> _Metric:
+        return self._metrics.setdefault(metric.name, metric)
+    
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+    
+    def gauge(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+    
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+    
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+REGISTRY = MetricsRegistry()
+
+STAGE_LATENCY = REGISTRY.histogram(
+    "alris_stage_duration_seconds",
+    "Time spent in each command processing stage",
+    ("stage",)
+)
+STAGE_CALLS = REGISTRY.counter(
+    "alris_stage_calls_total",
+    "Calls to each command processing stage by outcome",
+    ("stage", "status")
+)
+
+class StageTimer:
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.status = "ok"
+    
+    def fail(self):
+        self.status = "error"
+
+def _result_status(result: Any) -> str:
+    if result is False or (isinstance(result, dict) and result.get("status") == "error"):
+        return "error"
+    return "ok"
+
+def record_stage(stage: str, seconds: float, status: str = "ok"):
+    """Record a stage the caller timed itself; no span, so it is cheap enough for once-per-command hot paths."""
+    STAGE_LATENCY.observe(seconds, stage=stage)
+    STAGE_CALLS.inc(stage=stage, status=status)
+
+@contextmanager
+def track_stage(stage: str, **attributes):
+    """Record latency and outcome of the enclosed block under ``stage``.
+    
+    The block is counted as an error if it raises or calls ``fail()`` on the
+    yielded timer. Inside a traced command the stage is also recorded as a
+    span named after it.
+    """
+    timer = StageTimer(stage)
+    started = time.perf_counter()
+    with tracer.start_span(stage, require_parent=True, **attributes) as span:
+        try:
+            yield timer
+        except BaseException:
+            timer.fail()
+            raise
+        finally:
+            if span is not None and timer.status == "error":
+                span.status = "error"
+            record_stage(stage, time.perf_counter() - started, timer.status)
+
+def observe_stage(stage: str) -> Callable:
+    """Decorator form of ``track_stage`` for sync and async functions.
+    
+    A returned ``{"status": "error"}`` dict or ``False`` is counted as an
+    error, matching how the services in this codebase report failures.
+    """
+    def decorator(fn: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with track_stage(stage) as timer:
+                    result = await fn(*args, **kwargs)
+                    timer.status = _result_status(result)
+                    return result
+            return async_wrapper
+        
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with track_stage(stage) as timer:
+                result = fn(*args, **kwargs)
+                timer.status = _result_status(result)
+                return result
+        return wrapper
+    return decorator
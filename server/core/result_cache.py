@@ -0,0 +1,273 @@
+import os
+import json
+import time
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from core.metrics import REGISTRY
+
+logger = logging.getLogger("core.result_cache")
+
+CACHE_EVENTS = REGISTRY.counter(
+    "alris_result_cache_total",
+    "Result cache lookups and maintenance, by cache and event",
+    ("cache", "event")
+)
+
+FRESH = "fresh"
+STALE = "stale"
+MISS = "miss"
+
+class ResultCache:
+    """Bounded TTL + LRU cache for results of slow external lookups.
+    
+    Entries are fresh for ``ttl_seconds``. With ``stale_seconds`` set, an
+    expired entry is still served for that much longer while a single
+    background refresh replaces it (stale-while-revalidate). The least
+    recently used entry is evicted once ``max_entries`` is reached.
+    
+    The cache may be used from more than one event loop (the in-process MCP
+    server runs on its own thread), so the table is guarded by a thread lock
+    and never held across an await. Values must be JSON-serializable when
+    ``persist_path`` is set; the file is rewritten atomically at most every
+    ``persist_interval`` seconds and on ``flush()``.
+    """
+    
+    def __init__(self, name: str, max_entries: int = 1000, ttl_seconds: float = 3600,
+                 stale_seconds: float = 0, persist_path: Optional[str] = None, persist_interval: float = 30):
+        self.name = name
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._persist_lock = threading.Lock()
+        self._refreshing = set()
+        self._refresh_tasks = set()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._last_persist = 0.0
+        self._dirty = False
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self.evictions = 0
+        self.configure(max_entries, ttl_seconds, stale_seconds, persist_path, persist_interval)
+    
+    def configure(self, max_entries: int = 1000, ttl_seconds: float = 3600, stale_seconds: float = 0,
+                  persist_path: Optional[str] = None, persist_interval: float = 30):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.persist_interval = persist_interval
+        self.persist_path = persist_path
+        if persist_path:
+            self.load()
+    
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+    
+    def get(self, key: str) -> Tuple[Any, str]:
+        """Return ``(value, state)`` where state is ``fresh``, ``stale`` or ``miss``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, MISS
+            value, stored_at = entry
+            age = time.time() - stored_at
+            if age < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                return value, FRESH
+            if age < self.ttl_seconds + self.stale_seconds:
+                self._entries.move_to_end(key)
+                return value, STALE
+            del self._entries[key]
+            return None, MISS
+    
+    def get_many(self, keys: List[str]) -> Tuple[Dict[str, Any], List[str]]:
+        """Look up several keys for a batched fetch: returns fresh values and the keys to fetch."""
+        found, missing = {}, []
+        for key in dict.fromkeys(keys):
+            value, state = self.get(key)
+            if state == FRESH:
+                found[key] = value
+            else:
+                missing.append(key)
+        self.hits += len(found)
+        self.misses += len(missing)
+        CACHE_EVENTS.inc(len(found), cache=self.name, event="hit")
+        CACHE_EVENTS.inc(len(missing), cache=self.name, event="miss")
+        return found, missing
+    
+    def set(self, key: str, value: Any, stored_at: Optional[float] = None):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (value, stored_at or time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+                CACHE_EVENTS.inc(cache=self.name, event="eviction")
+            self._dirty = True
+        self._maybe_persist()
+    
+    def invalidate(self, key: str) -> bool:
+        with self._lock:
+            self._dirty = True
+            return self._entries.pop(key, None) is not None
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._dirty = True
+    
+    async def get_or_fetch(self, key: str, fetch: Callable[[], Awaitable[Any]],
+                           cache_if: Optional[Callable[[Any], bool]] = None) -> Any:
+        """Return the cached value for ``key``, calling ``fetch`` on a miss.
+        
+        Stale values are returned immediately and refreshed in the background,
+        and concurrent misses for a key wait on one fetch. Exceptions from
+        ``fetch`` propagate and nothing is cached; neither is a value rejected
+        by ``cache_if``.
+        """
+        if not self.enabled:
+            return await fetch()
+        
+        value, state = self.get(key)
+        if state == FRESH:
+            self.hits += 1
+            CACHE_EVENTS.inc(cache=self.name, event="hit")
+            return value
+        if state == STALE:
+            self.stale_hits += 1
+            CACHE_EVENTS.inc(cache=self.name, event="stale_hit")
+            self._refresh(key, fetch, cache_if)
+            return value
+        
+        return await self._fetch_once(key, fetch, cache_if)
+    
+    async def _fetch_once(self, key: str, fetch: Callable[[], Awaitable[Any]],
+                          cache_if: Optional[Callable[[Any], bool]]) -> Any:
+        """Run one fetch per key at a time; concurrent misses on the same loop share it.
+        
+        The fetch runs as its own task and stores its result itself, so a caller
+        that stops waiting (e.g. a cancelled prefetch) still leaves the value cached.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            pending = self._inflight.get(key)
+            if pending is not None and pending.get_loop() is loop:
+                self.coalesced += 1
+                CACHE_EVENTS.inc(cache=self.name, event="coalesced")
+            else:
+                self.misses += 1
+                CACHE_EVENTS.inc(cache=self.name, event="miss")
+                
+                async def fetch_and_store():
+                    value = await fetch()
+                    if cache_if is None or cache_if(value):
+                        self.set(key, value)
+                    return value
+                
+                pending = loop.create_task(fetch_and_store())
+                self._inflight[key] = pending
+                pending.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(pending)
+    
+    def _forget(self, key: str, task: asyncio.Future):
+        with self._lock:
+            if self._inflight.get(key) is task:
+                del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"{self.name} fetch for '{key}' failed: {str(task.exception())}")
+    
+    def _refresh(self, key: str, fetch: Callable[[], Awaitable[Any]], cache_if: Optional[Callable[[Any], bool]]):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        
+        async def refresh():
+            try:
+                value = await fetch()
+                if cache_if is None or cache_if(value):
+                    self.set(key, value)
+                self.refreshes += 1
+                CACHE_EVENTS.inc(cache=self.name, event="refresh")
+            except Exception as e:
+                logger.warning(f"Background refresh of {self.name} entry '{key}' failed: {str(e)}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+        
+        task = asyncio.ensure_future(refresh())
+        # The event loop only keeps a weak reference to tasks, so hold it until it finishes
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+    
+    def _maybe_persist(self):
+        if not self.persist_path or time.time() - self._last_persist < self.persist_interval:
+            return
+        self._last_persist = time.time()
+        try:
+            asyncio.get_running_loop().run_in_executor(None, self.flush)
+        except RuntimeError:
+            self.flush()
+    
+    def flush(self):
+        """Write the cache to ``persist_path`` if anything changed since the last write."""
+        if not self.persist_path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = [[key, value, stored_at] for key, (value, stored_at) in self._entries.items()]
+            self._dirty = False
+        
+        tmp_path = f"{self.persist_path}.{os.getpid()}.tmp"
+        try:
+            with self._persist_lock:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({"version": 1, "entries": snapshot}, f)
+                os.replace(tmp_path, self.persist_path)
+            logger.debug(f"Persisted {len(snapshot)} {self.name} entries to {self.persist_path}")
+        except Exception as e:
+            logger.error(f"Failed to persist {self.name} to {self.persist_path}: {str(e)}")
+    
+    def load(self):
+        """Load entries persisted by another process or a previous run, skipping expired ones."""
+        try:
+            with open(self.persist_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.error(f"Failed to load {self.name} from {self.persist_path}: {str(e)}")
+            return
+        
+        horizon = time.time() - self.ttl_seconds - self.stale_seconds
+        loaded = 0
+        with self._lock:
+            for key, value, stored_at in data.get("entries", []):
+                if stored_at > horizon and key not in self._entries:
+                    self._entries[key] = (value, stored_at)
+                    loaded += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        logger.info(f"Loaded {loaded} {self.name} entries from {self.persist_path}")
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.coalesced + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": (lookups - self.misses) / lookups if lookups else 0.0,
+            "refreshes": self.refreshes,
+            "evictions": self.evictions
+        }
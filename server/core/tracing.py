@@ -0,0 +1,214 @@
+import os
+import json
+import time
+import uuid
+import queue
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger("core.tracing")
+
+# Key under which trace context travels inside MCP tool params
+TRACE_PARAM = "_trace"
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("alris_current_span", default=None)
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "attributes", "status", "start_ns", "end_ns")
+    
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.status = "ok"
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+    
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+    
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e6
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """OTLP-style JSON representation of the span."""
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "durationMs": self.duration_ms,
+            "status": self.status,
+            "attributes": self.attributes,
+            "service": Tracer.service_name
+        }
+
+class _FileSink:
+    """Appends finished spans as JSON lines from a background thread."""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="trace-file-sink", daemon=True)
+        self._thread.start()
+    
+    def write(self, span: Span):
+        self._queue.put(span.to_dict())
+    
+    def _run(self):
+        with open(self.path, "a", encoding="utf-8") as f:
+            while True:
+                record = self._queue.get()
+                try:
+                    f.write(json.dumps(record, default=str) + "\n")
+                    f.flush()
+                except Exception as e:
+                    logger.error(f"Failed to write span to {self.path}: {str(e)}")
+
+class Tracer:
+    """Records span trees per command.
+    
+    The current span is tracked in a ``ContextVar``, so spans opened inside
+    awaited calls and spawned tasks nest under whatever span was active when
+    they started. Finished spans are kept for the most recent traces and
+    optionally appended to a JSON lines file.
+    """
+    
+    service_name = "alris-server"
+    
+    def __init__(self, enabled: bool = True, buffer_size: int = 200, max_spans_per_trace: int = 500):
+        self.enabled = enabled
+        self.buffer_size = buffer_size
+        self.max_spans_per_trace = max_spans_per_trace
+        self._traces: "OrderedDict[str, List[Span]]" = OrderedDict()
+        self._sink: Optional[_FileSink] = None
+    
+    def configure(self, enabled: bool = True, file_path: Optional[str] = None,
+                  buffer_size: int = 200, service_name: Optional[str] = None):
+        self.enabled = enabled
+        self.buffer_size = buffer_size
+        if service_name:
+            Tracer.service_name = service_name
+        if file_path and (not self._sink or self._sink.path != file_path):
+            self._sink = _FileSink(file_path)
+        elif not file_path:
+            self._sink = None
+    
+    @contextmanager
+    def start_span(self, name: str, remote_parent: Optional[Dict[str, str]] = None,
+                   require_parent: bool = False, **attributes):
+        """Open a span as a child of the current span, or of ``remote_parent`` when continuing a trace from another process.
+        
+        With ``require_parent`` no span is recorded unless one is already active,
+        which keeps helpers called outside any command from starting traces.
+        """
+        if not self.enabled or (require_parent and not remote_parent and _current_span.get() is None):
+            yield None
+            return
+        
+        if remote_parent and remote_parent.get("trace_id"):
+            trace_id, parent_id = remote_parent["trace_id"], remote_parent.get("span_id")
+        else:
+            parent = _current_span.get()
+            if parent:
+                trace_id, parent_id = parent.trace_id, parent.span_id
+            else:
+                trace_id, parent_id = uuid.uuid4().hex, None
+        
+        span = Span(name, trace_id, parent_id, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.attributes["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            try:
+                _current_span.reset(token)
+            except ValueError:
+                # Finished in a different context (e.g. an async generator closed elsewhere)
+                _current_span.set(None)
+            self._record(span)
+    
+    def record_span(self, name: str, start_ns: int, end_ns: int, **attributes):
+        """Record already finished work as a child of the current span, e.g. a step timed before the span opened."""
+        parent = _current_span.get()
+        if not self.enabled or parent is None:
+            return
+        span = Span(name, parent.trace_id, parent.span_id, attributes)
+        span.start_ns, span.end_ns = start_ns, end_ns
+        self._record(span)
+    
+    def _record(self, span: Span):
+        spans = self._traces.get(span.trace_id)
+        if spans is None:
+            spans = self._traces[span.trace_id] = []
+            while len(self._traces) > self.buffer_size:
+                self._traces.popitem(last=False)
+        if len(spans) < self.max_spans_per_trace:
+            spans.append(span)
+        if self._sink:
+            self._sink.write(span)
+    
+    def current_context(self) -> Optional[Dict[str, str]]:
+        """Trace context to hand to another process, or None outside a span."""
+        span = _current_span.get()
+        if not span:
+            return None
+        return {"trace_id": span.trace_id, "span_id": span.span_id}
+    
+    def current_trace_id(self) -> Optional[str]:
+        span = _current_span.get()
+        return span.trace_id if span else None
+    
+    def recent_traces(self, limit: int = 50) -> List[Dict[str, Any]]:
+        summaries = []
+        for trace_id in reversed(self._traces):
+            spans = self._traces[trace_id]
+            root = next((s for s in spans if s.parent_id is None), spans[-1])
+            summaries.append({
+                "trace_id": trace_id,
+                "name": root.name,
+                "duration_ms": root.duration_ms,
+                "status": root.status,
+                "span_count": len(spans),
+                "attributes": root.attributes
+            })
+            if len(summaries) >= limit:
+                break
+        return summaries
+    
+    def get_trace(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        """Return a trace as a nested span tree with per-span durations."""
+        spans = self._traces.get(trace_id)
+        if spans is None:
+            return None
+        
+        nodes = {span.span_id: {**span.to_dict(), "children": []} for span in spans}
+        roots = []
+        for span in sorted(spans, key=lambda s: s.start_ns):
+            node = nodes[span.span_id]
+            parent = nodes.get(span.parent_id)
+            if parent:
+                parent["children"].append(node)
+            else:
+                roots.append(node)
+        return {"trace_id": trace_id, "spans": roots}
+
+tracer = Tracer()
+
+def start_span(name: str, **attributes):
+    return tracer.start_span(name, **attributes)
@@ -0,0 +1,40 @@
+import asyncio
+from typing import Optional
+
+class Turn:
+    """A place in a ``TurnQueue``; ``wait`` returns once every earlier turn has been released."""
+    
+    def __init__(self, previous: Optional[asyncio.Future], done: asyncio.Future):
+        self._previous = previous
+        self._done = done
+    
+    async def wait(self):
+        if self._previous is not None:
+            # asyncio.wait never cancels what it waits on, so a cancelled waiter leaves the line intact
+            await asyncio.wait((self._previous,))
+    
+    def release(self):
+        """Let the next turn go. Safe to call more than once, and without having waited."""
+        if self._done.done():
+            return
+        if self._previous is None or self._previous.done():
+            self._done.set_result(None)
+        else:
+            # Left the line early (e.g. cancelled while queued): the next turn still waits for the earlier ones
+            self._previous.add_done_callback(lambda _: self.release())
+
+class TurnQueue:
+    """Runs work one turn at a time in the order the turns were reserved.
+    
+    ``reserve`` is synchronous, so a command takes its place the moment it is
+    received, before admission or task scheduling get a chance to reorder it.
+    """
+    
+    def __init__(self):
+        self._tail: Optional[asyncio.Future] = None
+    
+    def reserve(self) -> Turn:
+        done = asyncio.get_running_loop().create_future()
+        turn = Turn(self._tail, done)
+        self._tail = done
+        return turn
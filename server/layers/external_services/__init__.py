@@ -8,5 +8,10 @@ such as browsers, email servers, calendar services, and other APIs.
 from .browser_service import BrowserService
 from .email_service import EmailService
 from .calendar_service import CalendarService, CalendarEventParams
+from .youtube_search import cached_youtube_search, youtube_cache
+from .youtube_metadata import enrich_videos
 
-__all__ = ["BrowserService", "EmailService", "CalendarService", "CalendarEventParams"]
+__all__ = [
+    "BrowserService", "EmailService", "CalendarService", "CalendarEventParams",
+    "cached_youtube_search", "youtube_cache", "enrich_videos"
+]
@@ -1,6 +1,7 @@
 import logging
 from typing import Dict, Optional
 from playwright.async_api import async_playwright
+from core.metrics import observe_stage
 
 logger = logging.getLogger("external_services.browser")
 
@@ -20,6 +21,7 @@ class BrowserService:
             self._page = await self._context.new_page()
             logger.info("Browser service initialized")
     
+    @observe_stage("browser_navigate")
     async def navigate(self, url: str) -> bool:
         logger.info(f"Navigating to {url}")
         await self.initialize()
@@ -30,6 +32,7 @@ class BrowserService:
             logger.error(f"Failed to navigate to {url}: {str(e)}")
             return False
     
+    @observe_stage("browser_fill_form")
     async def fill_form(self, form_data: Dict[str, str], selectors: Optional[Dict[str, str]] = None) -> bool:
         await self.initialize()
         try:
@@ -41,6 +44,7 @@ class BrowserService:
             logger.error(f"Failed to fill form: {str(e)}")
             return False
     
+    @observe_stage("browser_click")
     async def click_element(self, selector: str) -> bool:
         await self.initialize()
         try:
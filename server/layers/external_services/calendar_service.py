@@ -5,6 +5,7 @@ import asyncio
 import requests
 from typing import Dict, Any, Optional
 from pydantic import BaseModel
+from core.metrics import observe_stage
 
 logger = logging.getLogger("external_services.calendar")
 
@@ -16,6 +17,7 @@ class CalendarEventParams(BaseModel):
 
 class CalendarService:
     @staticmethod
+    @observe_stage("calendar_post")
     async def schedule_event(params: CalendarEventParams) -> Dict[str, Any]:
         logger.info(f"Scheduling calendar event with title: {params.title}")
         apps_script_url = os.environ.get("GOOGLE_APPS_SCRIPT_CALENDAR_URL")
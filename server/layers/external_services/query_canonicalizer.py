@@ -0,0 +1,155 @@
+import re
+import zlib
+import random
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, Tuple
+from core.metrics import REGISTRY
+
+logger = logging.getLogger("external_services.query_canonicalizer")
+
+CANONICAL_LOOKUPS = REGISTRY.counter(
+    "alris_query_canonicalizer_total",
+    "Search queries resolved to an existing representative or registered as new, by match",
+    ("match",)
+)
+
+# Pure filler: words that never change which videos a request is after
+FILLER_WORDS = frozenset(("please", "pls", "video", "videos"))
+FILLER_PHRASES = re.compile(r"\bsearch (?:youtube )?for\b")
+
+# Keeps symbols that name things, so "c++", "c#" and "c" or "3.10" and "3.1" stay distinct
+_TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+(?:\.[a-z0-9+#]+)*")
+# Mersenne prime for the universal hash family used to simulate permutations
+_PRIME = (1 << 61) - 1
+
+def content_tokens(query: str) -> List[str]:
+    """Lowercased query tokens with filler removed."""
+    query = FILLER_PHRASES.sub(" ", query.lower())
+    return [token for token in _TOKEN_PATTERN.findall(query) if token not in FILLER_WORDS]
+
+def signature(query: str) -> str:
+    """Order-insensitive token-set signature: identical for exact rephrasings."""
+    return " ".join(sorted(set(content_tokens(query))))
+
+def _identifiers(tokens: FrozenSet[str]) -> FrozenSet[str]:
+    """Tokens that must match exactly: anything with a digit or a symbol, like "3", "c++" or "node.js"."""
+    return frozenset(token for token in tokens if not token.isalpha())
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+class QueryCanonicalizer:
+    """Maps near-duplicate search queries onto one representative cache key.
+    
+    A query is reduced to its token-set ``signature``. Exact signature matches
+    resolve immediately; otherwise the token set's MinHash signature is
+    bucketed with LSH (``bands`` x ``rows`` hashes) and candidates are
+    confirmed with an exact Jaccard check against ``threshold``. Numbers and
+    symbol-bearing tokens must match exactly, so "python 2" never resolves to
+    "python 3" and "c++ tutorial" never resolves to "c# tutorial". The default
+    ``threshold`` of 1.0 only merges exact rephrasings: a single differing word
+    ("new york" vs "new jersey") can ask for different videos. A query with no
+    close match becomes a new representative. Representatives are kept in LRU
+    order up to ``max_entries``.
+    """
+    
+    def __init__(self, threshold: float = 1.0, bands: int = 12, rows: int = 3,
+                 max_entries: int = 10000, seed: int = 1):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+        self.max_entries = max_entries
+        rng = random.Random(seed)
+        self._hash_params = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(bands * rows)]
+        self._lock = threading.Lock()
+        # signature -> (token set, band keys)
+        self._representatives: "OrderedDict[str, Tuple[FrozenSet[str], List[Tuple[int, Tuple[int, ...]]]]]" = OrderedDict()
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], set] = {}
+        self.exact = 0
+        self.near = 0
+        self.new = 0
+    
+    def configure(self, threshold: float = 1.0, max_entries: int = 10000):
+        self.threshold = threshold
+        self.max_entries = max_entries
+    
+    def _minhash(self, tokens: FrozenSet[str]) -> List[int]:
+        hashed = [zlib.crc32(token.encode("utf-8")) for token in tokens]
+        return [min((a * h + b) % _PRIME for h in hashed) for a, b in self._hash_params]
+    
+    def _band_keys(self, tokens: FrozenSet[str]) -> List[Tuple[int, Tuple[int, ...]]]:
+        minhash = self._minhash(tokens)
+        return [(band, tuple(minhash[band * self.rows:(band + 1) * self.rows])) for band in range(self.bands)]
+    
+    def resolve(self, query: str) -> str:
+        """Return the representative signature for ``query``, registering it if it is new."""
+        tokens = frozenset(content_tokens(query))
+        key = " ".join(sorted(tokens))
+        if not key:
+            # Nothing but fillers; fall back to the plain lowercased query
+            return re.sub(r"\s+", " ", query.lower()).strip()
+        
+        with self._lock:
+            if key in self._representatives:
+                self._representatives.move_to_end(key)
+                self.exact += 1
+                CANONICAL_LOOKUPS.inc(match="exact")
+                return key
+            
+            if self.threshold >= 1.0:
+                self._add(key, tokens, [])
+                return key
+            
+            band_keys = self._band_keys(tokens)
+            identifiers = _identifiers(tokens)
+            best, best_score = None, self.threshold
+            candidates = set()
+            for band_key in band_keys:
+                candidates.update(self._buckets.get(band_key, ()))
+            for candidate in candidates:
+                candidate_tokens = self._representatives[candidate][0]
+                if _identifiers(candidate_tokens) != identifiers:
+                    continue
+                score = jaccard(tokens, candidate_tokens)
+                if score >= best_score:
+                    best, best_score = candidate, score
+            
+            if best is not None:
+                self._representatives.move_to_end(best)
+                self.near += 1
+                CANONICAL_LOOKUPS.inc(match="near")
+                logger.debug(f"Query '{query}' matched '{best}' (jaccard {best_score:.2f})")
+                return best
+            
+            self._add(key, tokens, band_keys)
+            return key
+    
+    def _add(self, key: str, tokens: FrozenSet[str], band_keys: List[Tuple[int, Tuple[int, ...]]]):
+        self.new += 1
+        CANONICAL_LOOKUPS.inc(match="new")
+        self._representatives[key] = (tokens, band_keys)
+        for band_key in band_keys:
+            self._buckets.setdefault(band_key, set()).add(key)
+        while len(self._representatives) > self.max_entries:
+            evicted, (_, evicted_bands) = self._representatives.popitem(last=False)
+            for band_key in evicted_bands:
+                bucket = self._buckets.get(band_key)
+                if bucket is not None:
+                    bucket.discard(evicted)
+                    if not bucket:
+                        del self._buckets[band_key]
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.exact + self.near + self.new
+        return {
+            "representatives": len(self._representatives),
+            "threshold": self.threshold,
+            "exact_matches": self.exact,
+            "near_matches": self.near,
+            "new_queries": self.new,
+            "match_rate": (self.exact + self.near) / lookups if lookups else 0.0
+        }
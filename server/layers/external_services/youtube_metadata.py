@@ -0,0 +1,144 @@
+import re
+import json
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+from core.metrics import track_stage
+from core.result_cache import ResultCache
+from .youtube_search import run_blocking
+
+logger = logging.getLogger("external_services.youtube_metadata")
+
+# The YouTube Data API accepts up to 50 IDs per videos.list call
+API_BATCH_SIZE = 50
+
+_VIDEO_ID_PATTERN = re.compile(r"(?:watch\?v=|youtu\.be/|/embed/)([A-Za-z0-9_-]{11})")
+_DURATION_PATTERN = re.compile(r"P(?:(\d+)D)?T?(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?")
+
+metadata_cache = ResultCache("youtube_metadata", max_entries=5000, ttl_seconds=86400)
+
+_source = None
+
+def video_id(url: str) -> Optional[str]:
+    found = _VIDEO_ID_PATTERN.search(url)
+    if found:
+        return found.group(1)
+    return url if re.fullmatch(r"[A-Za-z0-9_-]{11}", url) else None
+
+def parse_duration(value: Optional[str]) -> Optional[int]:
+    """Convert an ISO 8601 duration such as ``PT1H2M3S`` to seconds."""
+    if not value:
+        return None
+    found = _DURATION_PATTERN.fullmatch(value)
+    if not found:
+        return None
+    days, hours, minutes, seconds = (int(part or 0) for part in found.groups())
+    return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+
+class VideoMetadataSource(ABC):
+    """Resolves metadata for a batch of video IDs in one lookup.
+    
+    ``fetch`` is synchronous and runs on the YouTube worker pool. It returns a
+    dict of video ID to metadata and simply leaves out IDs it does not know.
+    """
+    
+    @abstractmethod
+    def fetch(self, video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        pass
+
+class YouTubeDataAPISource(VideoMetadataSource):
+    """``videos.list`` from the YouTube Data API v3; ``base_url`` can point at a local stub server."""
+    
+    def __init__(self, api_key: str, base_url: str = "https://www.googleapis.com/youtube/v3", timeout: float = 5.0):
+        import requests
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        # One keep-alive session for all lookups
+        self.session = requests.Session()
+    
+    def fetch(self, video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        metadata = {}
+        for start in range(0, len(video_ids), API_BATCH_SIZE):
+            response = self.session.get(
+                f"{self.base_url}/videos",
+                params={
+                    "part": "snippet,contentDetails,statistics",
+                    "id": ",".join(video_ids[start:start + API_BATCH_SIZE]),
+                    "key": self.api_key
+                },
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            for item in response.json().get("items", []):
+                snippet = item.get("snippet", {})
+                thumbnails = snippet.get("thumbnails", {})
+                thumbnail = (thumbnails.get("high") or thumbnails.get("medium") or thumbnails.get("default") or {}).get("url")
+                metadata[item["id"]] = {
+                    "title": snippet.get("title"),
+                    "channel": snippet.get("channelTitle"),
+                    "published_at": snippet.get("publishedAt"),
+                    "thumbnail": thumbnail,
+                    "duration_seconds": parse_duration(item.get("contentDetails", {}).get("duration")),
+                    "view_count": int(item["statistics"]["viewCount"]) if "viewCount" in item.get("statistics", {}) else None
+                }
+        return metadata
+
+class StaticMetadataSource(VideoMetadataSource):
+    """Serves metadata from a dict or a JSON file of ``{video_id: {...}}``, for tests and offline use."""
+    
+    def __init__(self, records: Optional[Dict[str, Dict[str, Any]]] = None, path: Optional[str] = None):
+        if path:
+            with open(path, encoding="utf-8") as f:
+                records = json.load(f)
+        self.records = records or {}
+        self.calls = 0
+    
+    def fetch(self, video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        self.calls += 1
+        return {vid: dict(self.records[vid]) for vid in video_ids if vid in self.records}
+
+def configure(source: Optional[VideoMetadataSource] = None, ttl_seconds: float = 86400, max_entries: int = 5000):
+    """Set the metadata source; with no source, enrichment is disabled."""
+    global _source
+    _source = source
+    metadata_cache.configure(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+def create_source(api_key: Optional[str] = None, base_url: Optional[str] = None,
+                  stub_file: Optional[str] = None) -> Optional[VideoMetadataSource]:
+    if stub_file:
+        return StaticMetadataSource(path=stub_file)
+    if api_key:
+        return YouTubeDataAPISource(api_key, base_url) if base_url else YouTubeDataAPISource(api_key)
+    return None
+
+def enabled() -> bool:
+    return _source is not None
+
+async def enrich_videos(video_urls: List[str]) -> Optional[List[Dict[str, Any]]]:
+    """Return metadata for each URL, in order, using one batched lookup for the cache misses.
+    
+    Returns None when no source is configured. Videos the source does not know,
+    or a failed lookup, yield entries with just ``video_id`` and ``url``.
+    """
+    if _source is None or not video_urls:
+        return None
+    
+    ids = [video_id(url) for url in video_urls]
+    known, missing = metadata_cache.get_many([vid for vid in ids if vid])
+    
+    if missing:
+        with track_stage("youtube_metadata", videos=len(missing)) as stage:
+            try:
+                fetched = await run_blocking(_source.fetch, missing)
+                for vid, metadata in fetched.items():
+                    metadata_cache.set(vid, metadata)
+                known.update(fetched)
+            except Exception as e:
+                stage.fail()
+                logger.warning(f"Video metadata lookup failed for {len(missing)} videos: {str(e)}")
+    
+    return [
+        {"video_id": vid, "url": url, **known.get(vid, {})}
+        for url, vid in zip(video_urls, ids)
+    ]
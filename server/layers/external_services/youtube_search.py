@@ -0,0 +1,122 @@
+import re
+import ast
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional
+from core.metrics import track_stage
+from core.result_cache import ResultCache
+from .query_canonicalizer import QueryCanonicalizer
+
+logger = logging.getLogger("external_services.youtube")
+
+DEFAULT_RESULT_COUNT = 5
+
+# Shared by BrowserAgent and the MCP search_youtube tool; configured at startup
+youtube_cache = ResultCache("youtube_search")
+# Folds rephrasings like "videos on react hooks" / "react hooks videos please" onto one cache key
+query_canonicalizer = QueryCanonicalizer()
+_canonicalize = True
+
+_default_tool = None
+
+# YouTubeSearchTool.run is a blocking HTTP fetch, so it runs on a small dedicated pool
+_max_workers = 8
+_timeout = 10.0
+_executor: Optional[ThreadPoolExecutor] = None
+
+def configure(max_workers: int = 8, timeout: float = 10.0, canonicalize: bool = True, similarity_threshold: float = 1.0):
+    """Size the search worker pool, set the per-call timeout in seconds and tune query canonicalization."""
+    global _max_workers, _timeout, _executor, _canonicalize
+    _max_workers = max_workers
+    _timeout = timeout
+    _canonicalize = canonicalize
+    query_canonicalizer.configure(threshold=similarity_threshold)
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
+
+def shutdown():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=_max_workers, thread_name_prefix="youtube-search")
+    return _executor
+
+def normalize_query(query: str) -> str:
+    """Canonical form of a search query for cache lookups."""
+    query = query.strip().strip("\"'").lower()
+    query = re.sub(r"\s+", " ", query)
+    return query.rstrip(" .!?")
+
+def cache_key(query: str, count: int = DEFAULT_RESULT_COUNT) -> str:
+    if _canonicalize:
+        return f"{count}:{query_canonicalizer.resolve(query)}"
+    return f"{count}:{normalize_query(query)}"
+
+def _get_tool():
+    global _default_tool
+    if _default_tool is None:
+        from langchain_community.tools import YouTubeSearchTool
+        _default_tool = YouTubeSearchTool()
+    return _default_tool
+
+def _has_results(results: Any) -> bool:
+    # Empty results are often transient (rate limiting, network), so they are not cached
+    return bool(parse_results(results))
+
+def parse_results(results: Any) -> List[str]:
+    """Turn the tool output (usually the repr of a list) into a list of strings."""
+    if isinstance(results, str):
+        try:
+            results = ast.literal_eval(results)
+        except Exception:
+            return []
+    if not isinstance(results, list):
+        return []
+    return [item for item in results if isinstance(item, str) and item]
+
+async def run_youtube_search(query: str, count: int = DEFAULT_RESULT_COUNT, tool=None) -> Any:
+    """Run ``YouTubeSearchTool`` on the worker pool without blocking the event loop.
+    
+    Raises ``asyncio.TimeoutError`` after the configured timeout. The worker
+    thread cannot be interrupted and finishes the fetch in the background, but
+    the pool is bounded, so a slow YouTube can only tie up ``max_workers`` threads.
+    """
+    with track_stage("youtube_fetch"):
+        return await run_blocking((tool or _get_tool()).run, f"{query},{count}")
+
+async def run_blocking(fn, *args) -> Any:
+    """Run a blocking YouTube call on the worker pool, raising ``asyncio.TimeoutError`` after the configured timeout."""
+    loop = asyncio.get_running_loop()
+    return await asyncio.wait_for(loop.run_in_executor(_get_executor(), fn, *args), timeout=_timeout)
+
+async def cached_youtube_search(query: str, count: int = DEFAULT_RESULT_COUNT, tool=None) -> Any:
+    """Run ``YouTubeSearchTool`` for ``query`` through the shared result cache.
+    
+    Returns the tool's raw output so existing callers keep their parsing.
+    """
+    async def fetch():
+        logger.info(f"YouTube search cache miss, fetching '{query}'")
+        return await run_youtube_search(query, count, tool)
+    
+    return await youtube_cache.get_or_fetch(cache_key(query, count), fetch, cache_if=_has_results)
+
+def video_urls(results: Any, limit: Optional[int] = None) -> List[str]:
+    """Watch URLs for the video IDs in a search result, skipping shorts and duplicates."""
+    urls = []
+    for item in parse_results(results):
+        if "/shorts/" in item:
+            continue
+        vid = item.split("watch?v=")[1].split("&")[0] if "watch?v=" in item else item.strip()
+        if len(vid) != 11:
+            continue
+        url = f"https://www.youtube.com/watch?v={vid}"
+        if url not in urls:
+            urls.append(url)
+    return urls[:limit] if limit else urls
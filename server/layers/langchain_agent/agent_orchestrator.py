@@ -1,77 +1,182 @@
+import time
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator, Optional, Union
 import asyncio
+from core.metrics import REGISTRY, record_stage
+from core.tracing import tracer
+from ..external_services.youtube_metadata import enrich_videos
 from .browser_agent import BrowserAgent
 from .calendar_handler import handle_calendar_intent
 from .youtube_handler import detect_youtube_url, is_youtube_search_command, extract_youtube_search_query, create_youtube_direct_url_response
 from .intent_detector import IntentDetector
+from .single_flight import SingleFlight, normalize_command
+from .fast_path_router import FastPathHandler, FastPathRouter, RouteRequest
+from .llm_registry import llm_registry
 
 logger = logging.getLogger("langchain_agent.orchestrator")
 
+CLASSIFIER_ROUTES = REGISTRY.counter(
+    "alris_intent_classifier_total",
+    "General commands seen by the intent classifier by predicted intent and outcome",
+    ("intent", "outcome")
+)
+
+# Classifier labels that have a deterministic handler; anything else goes to the agent
+CLASSIFIER_FAST_PATHS = ("youtube_search", "calendar")
+
 class AgentOrchestrator:
-    def __init__(self):
-        self.browser_agent = BrowserAgent()
+    def __init__(self, intent_classifier=None, classifier_threshold: float = 0.8):
+        # Process-wide instance: its compiled graph and LLM client are built once and reused
+        self.browser_agent = llm_registry.agent(BrowserAgent)
         self._cleanup_tasks = set()
         self.mcp_client = None
         self.intent_detector = IntentDetector()
+        # Only stateless routes are coalesced; agent runs depend on per-thread history
+        self.single_flight = SingleFlight()
+        # Optional local model consulted for commands the regex detector calls "general"
+        self.intent_classifier = intent_classifier
+        self.classifier_threshold = classifier_threshold
+        self.fast_path = FastPathRouter()
+        self._register_fast_paths()
         
         logger.info("Agent Orchestrator initialized")
     
+    def _register_fast_paths(self):
+        """Register the built-in deterministic routes; anything they all decline goes to the browser agent."""
+        self.fast_path.register(FastPathHandler(
+            "youtube_direct_url",
+            match=lambda request: detect_youtube_url(request.command),
+            handle=self._handle_youtube_url,
+            priority=100
+        ))
+        self.fast_path.register(FastPathHandler(
+            "youtube_search",
+            match=lambda request: is_youtube_search_command(request.command),
+            handle=lambda request, _: self._coalesced_youtube_search(request.command),
+            priority=90
+        ))
+        self.fast_path.register(FastPathHandler(
+            "calendar",
+            match=lambda request: request.intent == "calendar",
+            handle=self._handle_calendar_route,
+            priority=80
+        ))
+        self.fast_path.register(FastPathHandler(
+            "intent_classifier",
+            match=lambda request: request.intent == "general" and self._classify_general(request.command),
+            handle=self._handle_classified,
+            cost="model"
+        ))
+    
     def set_mcp_client(self, mcp_client):
         self.mcp_client = mcp_client
         self.browser_agent.set_mcp_client(mcp_client)
     
+    def release_thread(self, thread_id: str):
+        """Drop a conversation's agent memory once its client is gone."""
+        self.browser_agent.release_thread(thread_id)
+    
     async def _handle_calendar_intent(self, command: str) -> Dict[str, Any]:
         """Handle calendar-related commands by parsing time information and calling calendar tools."""
         return await handle_calendar_intent(command, self.mcp_client)
     
-    async def process_command(self, command: str, thread_id: str = None) -> Dict[str, Any]:
+    async def _handle_youtube_url(self, request: RouteRequest, video_url: str) -> Dict[str, Any]:
+        return create_youtube_direct_url_response(request.command, video_url)
+    
+    async def _handle_calendar_route(self, request: RouteRequest, _=None) -> Dict[str, Any]:
+        result = await self._handle_calendar_intent(request.command)
+        return self._build_response("calendar", request.command, result)
+    
+    async def _handle_classified(self, request: RouteRequest, intent: str) -> Dict[str, Any]:
+        if intent == "youtube_search":
+            return await self._coalesced_youtube_search(request.command)
+        return await self._handle_calendar_route(request)
+    
+    def route(self, command: str, thread_id: str = None) -> RouteRequest:
+        """Match a command against the fast paths once; pass the result on to run it on that route.
+        
+        This is the intent_detection stage, timed once per command rather than per detector call.
+        """
+        started_ns = time.time_ns()
+        request = RouteRequest(command, thread_id, self.intent_detector.detect_intent)
+        request.routed = self.fast_path.match(request)
+        request.routed_ns = (started_ns, time.time_ns())
+        record_stage("intent_detection", (request.routed_ns[1] - started_ns) / 1e9)
+        return request
+    
+    def _trace_routing(self, request: RouteRequest):
+        """Add the routing step to the command's trace; it usually ran before the command span opened."""
+        if request.routed_ns is not None:
+            tracer.record_span("intent_detection", *request.routed_ns, route=self.classify_command(request))
+    
+    def classify_command(self, command: Union[str, RouteRequest]) -> str:
+        """Return the route a command takes: the fast-path handler that claims it, or its intent for the agent."""
+        request = command if isinstance(command, RouteRequest) else self.route(command)
+        if request.routed is None:
+            return request.intent
+        handler, matched = request.routed
+        # The classifier matches with the intent it predicted, which names the handler it hands over to
+        return matched if handler.name == "intent_classifier" else handler.name
+    
+    def _classify_general(self, command: str) -> Optional[str]:
+        """Return a fast-path intent for a general command if the classifier is confident, else None."""
+        if self.intent_classifier is None:
+            return None
+        try:
+            (intent, confidence), = self.intent_classifier.predict([command])
+        except Exception as e:
+            logger.error(f"Intent classifier failed: {str(e)}")
+            return None
+        
+        if intent not in CLASSIFIER_FAST_PATHS:
+            CLASSIFIER_ROUTES.inc(intent=intent, outcome="agent")
+            return None
+        if confidence < self.classifier_threshold:
+            CLASSIFIER_ROUTES.inc(intent=intent, outcome="low_confidence")
+            return None
+        
+        CLASSIFIER_ROUTES.inc(intent=intent, outcome="routed")
+        logger.info(f"Intent classifier routed general command to {intent} ({confidence:.2f}): {command}")
+        return intent
+    
+    async def process_command(self, command: str, thread_id: str = None,
+                              request: Optional[RouteRequest] = None) -> Dict[str, Any]:
+        """Run a command; ``request`` is its result from ``route``, if it was already routed."""
+        with tracer.start_span("command", command=command, thread_id=thread_id) as span:
+            request = request or self.route(command, thread_id)
+            self._trace_routing(request)
+            response = await self._route_command(request)
+            await self._attach_video_metadata(response)
+            if span is not None:
+                span.set_attribute("intent", response.get("intent"))
+                response["trace_id"] = span.trace_id
+            return response
+    
+    async def _attach_video_metadata(self, response: Dict[str, Any]):
+        """Add per-video metadata for any result URLs, resolved in one batched lookup."""
+        video_urls = response.get("video_urls")
+        if not video_urls and isinstance(response.get("result"), dict):
+            video_urls = response["result"].get("video_urls")
+        if video_urls and "videos" not in response:
+            videos = await enrich_videos(video_urls)
+            if videos:
+                response["videos"] = videos
+    
+    async def _route_command(self, request: RouteRequest) -> Dict[str, Any]:
+        command = request.command
         try:
             logger.info(f"Processing command: {command}")
             
-            video_url = detect_youtube_url(command)
-            if video_url:
-                return create_youtube_direct_url_response(command, video_url)
-            
-            if is_youtube_search_command(command):
-                logger.info(f"Detected YouTube search in command: {command}")
-                query = extract_youtube_search_query(command)
-                
-                result = await self.browser_agent.direct_youtube_search(query)
-                
-                response = {
-                    "intent": "youtube_search",
-                    "command": command,
-                    "result": result
-                }
-                
-                if "video_urls" in result:
-                    response["video_urls"] = result["video_urls"]
-                    logger.info(f"Added {len(result['video_urls'])} video URLs to response")
-                
-                return response
-            
-            intent = self.intent_detector.detect_intent(command)
+            if request.routed:
+                handler, matched = request.routed
+                logger.info(f"Fast path '{handler.name}' handling command: {command}")
+                return await handler.handle(request, matched)
             
-            if intent == "browser":
-                result = await self.browser_agent.execute(command, thread_id=thread_id)
-            elif intent == "calendar":
-                result = await self._handle_calendar_intent(command)
-            else:
-                logger.info(f"Using browser agent for general command: {command}")
-                result = await self.browser_agent.execute(command, thread_id=thread_id)
+            intent = request.intent
+            logger.info(f"Using browser agent for {intent} command: {command}")
+            result = await self.browser_agent.execute(command, thread_id=request.thread_id)
             
-            response = {
-                "intent": intent,
-                "command": command,
-                "result": result
-            }
-            
-            if isinstance(result, dict) and "video_urls" in result:
-                response["video_urls"] = result["video_urls"]
-                logger.info(f"Propagating {len(result['video_urls'])} video URLs to response")
-            
-            return response
+            return self._build_response(intent, command, result)
         except Exception as e:
             logger.error(f"Error processing command: {str(e)}")
             logger.exception("Full command processing error:")
@@ -81,6 +186,87 @@ class AgentOrchestrator:
                 "error": str(e)
             }
     
+    async def _coalesced_youtube_search(self, command: str) -> Dict[str, Any]:
+        key = ("youtube_search", normalize_command(command))
+        response = await self.single_flight.do(key, lambda: self._youtube_search(command))
+        return {**response, "command": command}
+    
+    async def _youtube_search(self, command: str) -> Dict[str, Any]:
+        query = extract_youtube_search_query(command)
+        
+        result = await self.browser_agent.direct_youtube_search(query)
+        
+        response = {
+            "intent": "youtube_search",
+            "command": command,
+            "result": result
+        }
+        
+        if "video_urls" in result:
+            response["video_urls"] = result["video_urls"]
+            logger.info(f"Added {len(result['video_urls'])} video URLs to response")
+        
+        return response
+    
+    async def stream_command(self, command: str, thread_id: str = None,
+                             request: Optional[RouteRequest] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Process a command, yielding agent progress events before a final ``{"type": "final"}`` event.
+        
+        Only commands routed to the browser agent produce intermediate events;
+        fast-path handlers yield their final response directly. ``request`` is
+        the command's result from ``route``, if it was already routed.
+        """
+        with tracer.start_span("command", command=command, thread_id=thread_id, stream=True) as span:
+            request = request or self.route(command, thread_id)
+            self._trace_routing(request)
+            async for event in self._stream_route_command(request):
+                if event["type"] == "final":
+                    await self._attach_video_metadata(event["response"])
+                    if span is not None:
+                        span.set_attribute("intent", event["response"].get("intent"))
+                        event["response"]["trace_id"] = span.trace_id
+                yield event
+    
+    async def _stream_route_command(self, request: RouteRequest) -> AsyncIterator[Dict[str, Any]]:
+        command = request.command
+        try:
+            if request.routed:
+                handler, matched = request.routed
+                yield {"type": "final", "response": await handler.handle(request, matched)}
+                return
+            
+            intent = request.intent
+            logger.info(f"Streaming browser agent for command: {command}")
+            async for event in self.browser_agent.stream_execute(command, thread_id=request.thread_id):
+                if event["type"] == "final":
+                    yield {"type": "final", "response": self._build_response(intent, command, event["result"])}
+                else:
+                    yield event
+        except Exception as e:
+            logger.error(f"Error streaming command: {str(e)}")
+            logger.exception("Full command streaming error:")
+            yield {
+                "type": "final",
+                "response": {
+                    "intent": "error",
+                    "command": command,
+                    "error": str(e)
+                }
+            }
+    
+    def _build_response(self, intent: str, command: str, result: Any) -> Dict[str, Any]:
+        response = {
+            "intent": intent,
+            "command": command,
+            "result": result
+        }
+        
+        if isinstance(result, dict) and "video_urls" in result:
+            response["video_urls"] = result["video_urls"]
+            logger.info(f"Propagating {len(result['video_urls'])} video URLs to response")
+        
+        return response
+    
     async def cleanup(self):
         try:
             for task in self._cleanup_tasks:
@@ -89,6 +275,7 @@ class AgentOrchestrator:
             
             if self._cleanup_tasks:
                 await asyncio.gather(*self._cleanup_tasks, return_exceptions=True)
+            await self.browser_agent.flush_memory()
         except Exception as e:
             logger.error(f"Error during cleanup: {str(e)}")
         finally:
@@ -0,0 +1,148 @@
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from langgraph.checkpoint.memory import MemorySaver
+from core.metrics import REGISTRY
+
+logger = logging.getLogger("langchain_agent.bounded_memory")
+
+THREAD_EVICTIONS = REGISTRY.counter(
+    "alris_memory_evictions_total",
+    "Conversation threads dropped from agent memory, by reason",
+    ("reason",)
+)
+
+def _thread_id(config: Dict[str, Any]) -> Optional[str]:
+    return config.get("configurable", {}).get("thread_id")
+
+def _size(serialized: Tuple[str, bytes]) -> int:
+    return len(serialized[1])
+
+class BoundedMemorySaver(MemorySaver):
+    """``MemorySaver`` that forgets conversation threads instead of growing without bound.
+
+    Every checkpoint and pending write refreshes its thread's last-use time
+    and adds the bytes ``MemorySaver`` stored for it to the thread's byte
+    count. Sizes are read from the values ``MemorySaver`` already serialized,
+    and a checkpoint only counts the channels that changed, as only those are
+    stored again. A thread idle for
+    longer than ``ttl_seconds`` is dropped (checked at most every
+    ``sweep_interval`` seconds), and the least recently used threads are
+    dropped while there are more than ``max_threads`` or more than
+    ``max_bytes`` are held. ``release`` drops a thread immediately, e.g. when
+    its WebSocket closes. A limit of 0 disables it.
+    """
+    
+    def __init__(self, ttl_seconds: float = 1800, max_threads: int = 1000, max_bytes: int = 256 * 1024 * 1024,
+                 sweep_interval: float = 60, **kwargs):
+        super().__init__(**kwargs)
+        self.ttl_seconds = ttl_seconds
+        self.max_threads = max_threads
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        self._lock = threading.RLock()
+        # thread_id -> [last_used, bytes], least recently used first
+        self._threads: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._bytes = 0
+        self._last_sweep = time.monotonic()
+        self.evictions = {"ttl": 0, "capacity": 0, "released": 0}
+    
+    def _checkpoint_size(self, stored: Dict[str, Any], new_versions) -> int:
+        thread_id, checkpoint_ns, checkpoint_id = (
+            stored["configurable"][key] for key in ("thread_id", "checkpoint_ns", "checkpoint_id")
+        )
+        checkpoint, metadata, _ = self.storage[thread_id][checkpoint_ns][checkpoint_id]
+        blobs = [self.blobs.get((thread_id, checkpoint_ns, channel, version)) for channel, version in new_versions.items()]
+        return _size(checkpoint) + _size(metadata) + sum(_size(blob) for blob in blobs if blob)
+    
+    def _writes_size(self, config, task_id: str) -> int:
+        key = (_thread_id(config), config["configurable"].get("checkpoint_ns", ""), config["configurable"].get("checkpoint_id"))
+        return sum(_size(write[2]) for write in self.writes.get(key, {}).values() if write[0] == task_id)
+    
+    def put(self, config, checkpoint, metadata, new_versions):
+        stored = super().put(config, checkpoint, metadata, new_versions)
+        self._track(_thread_id(config), self._checkpoint_size(stored, new_versions))
+        return stored
+    
+    def put_writes(self, config, writes, task_id: str, task_path: str = ""):
+        # Only count what this call added; MemorySaver skips writes a task already stored
+        before = self._writes_size(config, task_id)
+        super().put_writes(config, writes, task_id, task_path)
+        self._track(_thread_id(config), self._writes_size(config, task_id) - before)
+    
+    def _track(self, thread_id: Optional[str], size: int):
+        if thread_id is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            entry = self._threads.get(thread_id)
+            if entry is None:
+                entry = self._threads[thread_id] = [now, 0]
+            else:
+                self._threads.move_to_end(thread_id)
+                entry[0] = now
+            entry[1] += size
+            self._bytes += size
+            
+            if self.ttl_seconds > 0 and now - self._last_sweep >= self.sweep_interval:
+                self._last_sweep = now
+                self.sweep(now)
+            while len(self._threads) > 1 and (
+                (self.max_threads > 0 and len(self._threads) > self.max_threads)
+                or (self.max_bytes > 0 and self._bytes > self.max_bytes)
+            ):
+                self._drop(next(iter(self._threads)), "capacity")
+    
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Drop threads idle for longer than ``ttl_seconds``; returns how many were dropped."""
+        now = now if now is not None else time.monotonic()
+        expired = []
+        with self._lock:
+            for thread_id, (last_used, _) in self._threads.items():
+                if now - last_used < self.ttl_seconds:
+                    break
+                expired.append(thread_id)
+            for thread_id in expired:
+                self._drop(thread_id, "ttl")
+        if expired:
+            logger.info(f"Dropped {len(expired)} idle conversation threads")
+        return len(expired)
+    
+    def release(self, thread_id: str):
+        """Drop a thread whose conversation is over."""
+        with self._lock:
+            if thread_id in self._threads:
+                self._drop(thread_id, "released")
+    
+    def delete_thread(self, thread_id: str):
+        with self._lock:
+            entry = self._threads.pop(thread_id, None)
+            if entry is not None:
+                self._bytes -= entry[1]
+            super().delete_thread(thread_id)
+    
+    def _drop(self, thread_id: str, reason: str):
+        _, size = self._threads.pop(thread_id)
+        self._bytes -= size
+        if hasattr(super(), "delete_thread"):
+            super().delete_thread(thread_id)
+        else:
+            self.storage.pop(thread_id, None)
+            for key in [key for key in self.writes if key[0] == thread_id]:
+                del self.writes[key]
+        self.evictions[reason] += 1
+        THREAD_EVICTIONS.inc(reason=reason)
+        logger.debug(f"Dropped conversation thread {thread_id} ({reason}, {size} bytes)")
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "threads": len(self._threads),
+                "bytes": self._bytes,
+                "max_threads": self.max_threads,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "evictions": dict(self.evictions)
+            }
@@ -2,6 +2,8 @@ import logging
 from typing import List, Dict, Any
 from langchain.agents import Tool
 from langchain_community.tools import YouTubeSearchTool
+from core.metrics import observe_stage
+from ..external_services.youtube_search import cached_youtube_search
 from .react_agent import BaseReactAgent
 
 logger = logging.getLogger("langchain_agent.browser")
@@ -15,26 +17,34 @@ class BrowserAgent(BaseReactAgent):
         return [
             Tool(
                 name="navigate_to_url",
-                func=self._navigate_to_url,
+                func=None,
+                coroutine=self._navigate_to_url,
                 description="Navigate to a specified URL in the browser. Input should be a URL string."
             ),
             Tool(
                 name="search_youtube",
-                func=self._search_youtube,
+                func=None,
+                coroutine=self._search_youtube,
                 description="Search for videos on YouTube and return video links. Input should be a search query string."
             ),
             Tool(
                 name="fill_form",
-                func=self._fill_form,
+                func=None,
+                coroutine=self._fill_form,
                 description="Fill a form with the provided data. Input should be a JSON string with form_data (a dictionary of field names and values) and optionally selectors (a dictionary of field names and selectors)."
             ),
             Tool(
                 name="click_element",
-                func=self._click_element,
+                func=None,
+                coroutine=self._click_element,
                 description="Click on an element in the browser. Input should be a CSS selector string."
             )
         ]
     
+    def _exclusive_tools(self) -> List[str]:
+        # These act on the one browser page; search_youtube is free to run alongside them
+        return ["navigate_to_url", "fill_form", "click_element"]
+    
     def _get_system_prompt(self) -> str:
         return """
         You are Alris, an AI agent created by Daniel Toba that helps users automate tasks like scheduling events to calendar and providing YouTube videos. When asked about your identity, you should mention that you are Alris and were created by Daniel Toba.
@@ -89,7 +99,7 @@ class BrowserAgent(BaseReactAgent):
                 query = query[1:-1]
             
             try:
-                video_ids = self.youtube_tool.run(f"{query},5")
+                video_ids = await cached_youtube_search(query, 5, self.youtube_tool)
                 logger.info(f"YouTube search returned: {video_ids}")
             except Exception as e:
                 logger.error(f"YouTube search tool error: {str(e)}")
@@ -213,6 +223,7 @@ class BrowserAgent(BaseReactAgent):
     def set_mcp_client(self, mcp_client):
         self.mcp_client = mcp_client 
 
+    @observe_stage("youtube_search")
     async def direct_youtube_search(self, query: str) -> Dict[str, Any]:
         logger.info(f"Performing direct YouTube search for '{query}'")
         try:
@@ -239,7 +250,7 @@ class BrowserAgent(BaseReactAgent):
             else:
                 logger.info(f"MCP client not available, using internal YouTube search tool")
             
-            video_ids_str = self.youtube_tool.run(f"{query},5")
+            video_ids_str = await cached_youtube_search(query, 5, self.youtube_tool)
             logger.info(f"Direct YouTube search returned: {video_ids_str}")
             
             import ast
@@ -0,0 +1,131 @@
+import time
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from core.metrics import REGISTRY
+
+logger = logging.getLogger("langchain_agent.fast_path")
+
+# Cheapest first: the router evaluates every "lookup" handler before any "regex" one, and so on
+COST_CLASSES = ("lookup", "regex", "model")
+
+FAST_PATH_CALLS = REGISTRY.counter(
+    "alris_fast_path_total",
+    "Fast-path handler evaluations by outcome; handler=llm counts commands no handler claimed",
+    ("handler", "outcome")
+)
+
+class RouteRequest:
+    """A command being routed, with the regex-detected intent computed at most once.
+    
+    ``routed`` holds the router's decision once it has been made: the matching
+    handler and its match value, or None when the command goes to the agent.
+    ``routed_ns`` is the wall-clock (start, end) of that decision, in nanoseconds.
+    """
+    
+    def __init__(self, command: str, thread_id: str = None, detect_intent: Optional[Callable[[str], str]] = None):
+        self.command = command
+        self.thread_id = thread_id
+        self._detect_intent = detect_intent
+        self._intent = None
+        self.routed: Optional[Tuple["FastPathHandler", Any]] = None
+        self.routed_ns: Optional[Tuple[int, int]] = None
+    
+    @property
+    def intent(self) -> Optional[str]:
+        if self._intent is None and self._detect_intent is not None:
+            self._intent = self._detect_intent(self.command)
+        return self._intent
+
+class FastPathHandler:
+    """A deterministic (non-LLM) route.
+    
+    ``match`` runs for every command that reaches it, so it must be cheap. It
+    returns a falsy value when the handler does not apply, or any truthy value,
+    which is handed to ``handle`` together with the request.
+    """
+    
+    def __init__(self, name: str, match: Callable[[RouteRequest], Any],
+                 handle: Callable[[RouteRequest, Any], Awaitable[Dict[str, Any]]],
+                 priority: int = 0, cost: str = "regex"):
+        if cost not in COST_CLASSES:
+            raise ValueError(f"Unknown cost class '{cost}', expected one of {COST_CLASSES}")
+        self.name = name
+        self.match = match
+        self.handle = handle
+        self.priority = priority
+        self.cost = cost
+        self.evaluations = 0
+        self.hits = 0
+        self.match_seconds = 0.0
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "cost": self.cost,
+            "priority": self.priority,
+            "evaluations": self.evaluations,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.evaluations if self.evaluations else 0.0,
+            "avg_match_us": self.match_seconds / self.evaluations * 1e6 if self.evaluations else 0.0
+        }
+
+class FastPathRouter:
+    """Registry of deterministic handlers tried before a command falls through to the LLM agent.
+    
+    Handlers are evaluated in cost-class order, then by descending priority,
+    then in registration order; the first match wins.
+    """
+    
+    def __init__(self):
+        self._handlers: List[FastPathHandler] = []
+        self.routed = 0
+        self.fallthrough = 0
+    
+    def register(self, handler: FastPathHandler) -> FastPathHandler:
+        if any(existing.name == handler.name for existing in self._handlers):
+            raise ValueError(f"Fast-path handler '{handler.name}' is already registered")
+        self._handlers.append(handler)
+        # sort() is stable, so equal keys keep registration order
+        self._handlers.sort(key=lambda h: (COST_CLASSES.index(h.cost), -h.priority))
+        logger.info(f"Registered fast-path handler '{handler.name}' (cost={handler.cost}, priority={handler.priority})")
+        return handler
+    
+    def unregister(self, name: str) -> bool:
+        before = len(self._handlers)
+        self._handlers = [h for h in self._handlers if h.name != name]
+        return len(self._handlers) != before
+    
+    @property
+    def handlers(self) -> List[FastPathHandler]:
+        return list(self._handlers)
+    
+    def match(self, request: RouteRequest) -> Optional[Tuple[FastPathHandler, Any]]:
+        """Return the first handler that claims the request and its match value, or None."""
+        for handler in self._handlers:
+            started = time.perf_counter()
+            try:
+                matched = handler.match(request)
+            except Exception as e:
+                logger.error(f"Fast-path handler '{handler.name}' match failed: {str(e)}")
+                matched = None
+            handler.match_seconds += time.perf_counter() - started
+            handler.evaluations += 1
+            
+            if matched:
+                handler.hits += 1
+                FAST_PATH_CALLS.inc(handler=handler.name, outcome="hit")
+                self.routed += 1
+                return handler, matched
+            FAST_PATH_CALLS.inc(handler=handler.name, outcome="miss")
+        
+        self.fallthrough += 1
+        FAST_PATH_CALLS.inc(handler="llm", outcome="fallthrough")
+        return None
+    
+    def stats(self) -> Dict[str, Any]:
+        total = self.routed + self.fallthrough
+        return {
+            "commands": total,
+            "fast_path_rate": self.routed / total if total else 0.0,
+            "llm_fallthrough": self.fallthrough,
+            "handlers": {handler.name: handler.stats() for handler in self._handlers}
+        }
@@ -0,0 +1,194 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage, ToolMessage
+from core.metrics import REGISTRY
+
+logger = logging.getLogger("langchain_agent.history_policy")
+
+HISTORY_COMPACTION = REGISTRY.counter(
+    "alris_history_compaction_total",
+    "History compaction applied to agent prompts, by action",
+    ("action",)
+)
+PROMPT_TOKENS = REGISTRY.histogram(
+    "alris_agent_prompt_tokens",
+    "Estimated tokens of conversation history sent to the model per call",
+    buckets=(250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+)
+
+# Rough chars-per-token ratio; good enough for budgeting without a tokenizer round trip
+CHARS_PER_TOKEN = 4
+
+SUMMARY_INSTRUCTIONS = (
+    "Summarize the earlier part of this conversation between a user and a browser assistant "
+    "in at most {sentences} sentences. Keep what the user asked for, names, URLs, preferences "
+    "and anything still unfinished. Reply with the summary only."
+)
+
+def _text(message: BaseMessage) -> str:
+    content = message.content
+    return content if isinstance(content, str) else str(content)
+
+def estimate_tokens(messages: List[BaseMessage]) -> int:
+    return sum(len(_text(message)) for message in messages) // CHARS_PER_TOKEN
+
+def split_turns(messages: List[BaseMessage]) -> List[List[BaseMessage]]:
+    """Group messages into turns, each starting at a human message, so tool calls stay with their results."""
+    turns: List[List[BaseMessage]] = []
+    for message in messages:
+        if isinstance(message, HumanMessage) or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+class HistoryPolicy:
+    """Decides how much of a thread's history is replayed to the model on each call.
+
+    The stored history is never modified; only the prompt is compacted:
+
+    - at most ``max_turns`` recent turns are kept, and older turns are dropped
+      until the estimated size fits ``max_tokens`` (the current turn is always kept)
+    - with ``summarize`` set, dropped turns are folded into a synopsis that is
+      appended to the system prompt. Synopses are cached per thread and extended
+      once ``summary_every`` more turns have fallen out of the window; until
+      then those turns are replayed verbatim, so summarizing costs one extra
+      model call per ``summary_every`` turns rather than one per turn.
+    - tool outputs from earlier turns are cut to ``max_tool_chars``
+
+    A limit of 0 disables it.
+    """
+    
+    def __init__(self, max_turns: int = 10, max_tokens: int = 8000, summarize: bool = True,
+                 max_tool_chars: int = 1000, summary_every: int = 5, summary_sentences: int = 5,
+                 max_summaries: int = 1000):
+        self.max_turns = max_turns
+        self.max_tokens = max_tokens
+        self.summarize = summarize
+        self.summary_every = max(1, summary_every)
+        self.max_tool_chars = max_tool_chars
+        self.summary_sentences = summary_sentences
+        self.max_summaries = max_summaries
+        self._lock = threading.Lock()
+        # thread_id -> (number of leading turns summarized, synopsis)
+        self._summaries: "OrderedDict[str, Tuple[int, str]]" = OrderedDict()
+    
+    def _window(self, turns: List[List[BaseMessage]]) -> int:
+        """Index of the first turn that is replayed verbatim."""
+        start = max(0, len(turns) - self.max_turns) if self.max_turns > 0 else 0
+        if self.max_tokens > 0:
+            sizes = [estimate_tokens(turn) for turn in turns]
+            total = sum(sizes[start:])
+            while start < len(turns) - 1 and total > self.max_tokens:
+                total -= sizes[start]
+                start += 1
+        return start
+    
+    def _truncate(self, turns: List[List[BaseMessage]]) -> List[BaseMessage]:
+        messages = []
+        for index, turn in enumerate(turns):
+            current = index == len(turns) - 1
+            for message in turn:
+                if (not current and self.max_tool_chars > 0 and isinstance(message, ToolMessage)
+                        and len(_text(message)) > self.max_tool_chars):
+                    text = _text(message)
+                    message = ToolMessage(
+                        content=f"{text[:self.max_tool_chars]}... [{len(text) - self.max_tool_chars} characters truncated]",
+                        tool_call_id=message.tool_call_id,
+                        name=message.name
+                    )
+                    HISTORY_COMPACTION.inc(action="tool_truncated")
+                messages.append(message)
+        return messages
+    
+    def cached_summary(self, thread_id: Optional[str], dropped: int) -> Tuple[int, Optional[str]]:
+        """The cached synopsis usable for ``dropped`` leading turns, and how many turns it covers."""
+        with self._lock:
+            cached = self._summaries.get(thread_id)
+            if cached:
+                self._summaries.move_to_end(thread_id)
+        # A synopsis covering more turns than were dropped means the history shrank; it no longer applies
+        if cached and cached[0] <= dropped:
+            return cached
+        return 0, None
+    
+    async def _summary(self, thread_id: Optional[str], turns: List[List[BaseMessage]], dropped: int,
+                       summarizer: Callable[[str], Awaitable[str]]) -> Tuple[int, Optional[str]]:
+        """Return ``(covered, synopsis)``: turns before ``covered`` are summarized, the rest are replayed."""
+        covered, previous = self.cached_summary(thread_id, dropped)
+        if dropped - covered < self.summary_every:
+            if previous:
+                HISTORY_COMPACTION.inc(action="summary_cached")
+            return covered, previous
+        
+        # Extend the cached synopsis with the turns that fell out since
+        new_turns = turns[covered:dropped]
+        transcript = "\n".join(
+            f"{'User' if isinstance(message, HumanMessage) else 'Tool' if isinstance(message, ToolMessage) else 'Assistant'}: "
+            f"{_text(message)[:self.max_tool_chars or None]}"
+            for turn in new_turns for message in turn if _text(message)
+        )
+        prompt = SUMMARY_INSTRUCTIONS.format(sentences=self.summary_sentences)
+        if previous:
+            prompt += f"\n\nSummary so far:\n{previous}"
+        prompt += f"\n\nConversation:\n{transcript}"
+        
+        try:
+            summary = (await summarizer(prompt)).strip()
+        except Exception as e:
+            logger.warning(f"History summarization failed for thread {thread_id}: {str(e)}")
+            return covered, previous
+        HISTORY_COMPACTION.inc(action="summarized")
+        with self._lock:
+            self._summaries[thread_id] = (dropped, summary)
+            self._summaries.move_to_end(thread_id)
+            while len(self._summaries) > self.max_summaries:
+                self._summaries.popitem(last=False)
+        return dropped, summary
+    
+    def _prompt(self, system_prompt: str, summary: Optional[str], kept: List[List[BaseMessage]]) -> List[BaseMessage]:
+        if summary:
+            system_prompt = f"{system_prompt}\n\nSummary of the earlier conversation:\n{summary}"
+        messages = [SystemMessage(content=system_prompt)] + self._truncate(kept)
+        PROMPT_TOKENS.observe(estimate_tokens(messages))
+        return messages
+    
+    def compact(self, messages: List[BaseMessage], system_prompt: str, thread_id: Optional[str] = None) -> List[BaseMessage]:
+        """Synchronous compaction; uses a cached synopsis but never calls the model."""
+        turns = split_turns(messages)
+        start = self._window(turns)
+        if start:
+            HISTORY_COMPACTION.inc(action="trimmed")
+        summary = None
+        if self.summarize and start:
+            covered, summary = self.cached_summary(thread_id, start)
+            # Replay the turns the synopsis lags behind, as acompact would, but never more than that
+            if summary and start - covered < self.summary_every:
+                start = covered
+        return self._prompt(system_prompt, summary, turns[start:])
+    
+    async def acompact(self, messages: List[BaseMessage], system_prompt: str, thread_id: Optional[str] = None,
+                       summarizer: Optional[Callable[[str], Awaitable[str]]] = None) -> List[BaseMessage]:
+        turns = split_turns(messages)
+        start = self._window(turns)
+        summary = None
+        if start:
+            HISTORY_COMPACTION.inc(action="trimmed")
+            if self.summarize and summarizer is not None:
+                start, summary = await self._summary(thread_id, turns, start, summarizer)
+        return self._prompt(system_prompt, summary, turns[start:])
+    
+    def forget(self, thread_id: str):
+        with self._lock:
+            self._summaries.pop(thread_id, None)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_turns": self.max_turns,
+            "max_tokens": self.max_tokens,
+            "summarize": self.summarize,
+            "summary_every": self.summary_every,
+            "max_tool_chars": self.max_tool_chars,
+            "cached_summaries": len(self._summaries)
+        }
@@ -0,0 +1,160 @@
+import re
+import json
+import zlib
+import logging
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+import numpy as np
+
+logger = logging.getLogger("langchain_agent.intent_classifier")
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+def load_corpus(path: str) -> Tuple[List[str], List[str]]:
+    """Read a labeled corpus: one JSON object per line with ``text`` and ``intent`` keys."""
+    texts, labels = [], []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            example = json.loads(line)
+            if not example.get("text") or not example.get("intent"):
+                raise ValueError(f"{path}:{line_number}: each example needs 'text' and 'intent'")
+            texts.append(example["text"])
+            labels.append(example["intent"])
+    return texts, labels
+
+class HashedNgramFeaturizer:
+    """Maps text to sparse hashed word uni/bigram and character trigram features."""
+    
+    def __init__(self, n_features: int = 2 ** 15):
+        self.n_features = n_features
+    
+    def _hash(self, feature: str) -> int:
+        # crc32 is stable across processes, unlike hash()
+        return zlib.crc32(feature.encode("utf-8")) % self.n_features
+    
+    def features(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        tokens = _TOKEN_PATTERN.findall(text.lower())
+        grams = [f"w:{t}" for t in tokens]
+        grams.extend(f"b:{a} {b}" for a, b in zip(tokens, tokens[1:]))
+        padded = f" {' '.join(tokens)} "
+        grams.extend(f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2))
+        
+        if not grams:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        
+        indices, counts = np.unique([self._hash(g) for g in grams], return_counts=True)
+        values = counts.astype(np.float32)
+        values /= np.linalg.norm(values)
+        return indices, values
+    
+    def transform(self, texts: Iterable[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Featurize a batch into flat ``indices``/``values`` arrays plus per-row ``offsets``."""
+        rows = [self.features(text) for text in texts]
+        lengths = np.array([len(indices) for indices, _ in rows], dtype=np.int64)
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1])) if rows else np.zeros(0, dtype=np.int64)
+        indices = np.concatenate([r[0] for r in rows]) if rows else np.zeros(0, dtype=np.int64)
+        values = np.concatenate([r[1] for r in rows]) if rows else np.zeros(0, dtype=np.float32)
+        return indices, values, offsets
+
+class IntentClassifier:
+    """Multinomial logistic regression over hashed n-gram features.
+    
+    Small enough to run in-process on every command: inference for a batch is
+    a gather over the weight rows touched by its features and a segmented sum.
+    """
+    
+    def __init__(self, labels: List[str], n_features: int = 2 ** 15):
+        self.labels = list(labels)
+        self.featurizer = HashedNgramFeaturizer(n_features)
+        self.weights = np.zeros((n_features, len(self.labels)), dtype=np.float32)
+        self.bias = np.zeros(len(self.labels), dtype=np.float32)
+    
+    def _logits(self, indices: np.ndarray, values: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+        logits = np.tile(self.bias, (len(offsets), 1))
+        nonempty = np.diff(np.append(offsets, len(indices))) > 0
+        if len(indices):
+            weighted = self.weights[indices] * values[:, None]
+            logits[nonempty] += np.add.reduceat(weighted, offsets[nonempty], axis=0)
+        return logits
+    
+    @staticmethod
+    def _softmax(logits: np.ndarray) -> np.ndarray:
+        exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+        return exp / exp.sum(axis=1, keepdims=True)
+    
+    def predict_proba(self, texts: List[str]) -> np.ndarray:
+        return self._softmax(self._logits(*self.featurizer.transform(texts)))
+    
+    def predict(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """Return ``(label, probability)`` for each text."""
+        probabilities = self.predict_proba(texts)
+        best = probabilities.argmax(axis=1)
+        return [(self.labels[i], float(probabilities[row, i])) for row, i in enumerate(best)]
+    
+    def fit(self, texts: List[str], labels: List[str], epochs: int = 100, learning_rate: float = 1.0,
+            l2: float = 1e-4, batch_size: int = 32, seed: int = 0) -> "IntentClassifier":
+        """Train with mini-batch gradient descent on the cross-entropy loss."""
+        label_index = {label: i for i, label in enumerate(self.labels)}
+        targets = np.array([label_index[label] for label in labels])
+        rows = [self.featurizer.features(text) for text in texts]
+        rng = np.random.default_rng(seed)
+        
+        for epoch in range(epochs):
+            order = rng.permutation(len(rows))
+            for start in range(0, len(order), batch_size):
+                batch = order[start:start + batch_size]
+                lengths = np.array([len(rows[i][0]) for i in batch])
+                offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+                indices = np.concatenate([rows[i][0] for i in batch])
+                values = np.concatenate([rows[i][1] for i in batch])
+                
+                probabilities = self._softmax(self._logits(indices, values, offsets))
+                probabilities[np.arange(len(batch)), targets[batch]] -= 1.0
+                probabilities /= len(batch)
+                
+                row_of_feature = np.repeat(np.arange(len(batch)), lengths)
+                gradient = values[:, None] * probabilities[row_of_feature]
+                touched = np.unique(indices)
+                self.weights[touched] *= 1.0 - learning_rate * l2
+                np.add.at(self.weights, indices, -learning_rate * gradient)
+                self.bias -= learning_rate * probabilities.sum(axis=0)
+        
+        return self
+    
+    def evaluate(self, texts: List[str], labels: List[str]) -> Dict[str, Any]:
+        predictions = self.predict(texts)
+        correct = sum(1 for (predicted, _), label in zip(predictions, labels) if predicted == label)
+        return {"accuracy": correct / max(len(labels), 1), "examples": len(labels)}
+    
+    def save(self, path: str):
+        np.savez_compressed(
+            path,
+            weights=self.weights,
+            bias=self.bias,
+            labels=np.array(self.labels),
+            n_features=np.array(self.featurizer.n_features)
+        )
+        logger.info(f"Saved intent classifier with labels {self.labels} to {path}")
+    
+    @classmethod
+    def load(cls, path: str) -> "IntentClassifier":
+        data = np.load(path, allow_pickle=False)
+        classifier = cls([str(label) for label in data["labels"]], int(data["n_features"]))
+        classifier.weights = data["weights"]
+        classifier.bias = data["bias"]
+        logger.info(f"Loaded intent classifier with labels {classifier.labels} from {path}")
+        return classifier
+
+def load_classifier(path: Optional[str]) -> Optional[IntentClassifier]:
+    """Load a trained classifier, or return None when none is configured or it cannot be read."""
+    if not path:
+        return None
+    try:
+        return IntentClassifier.load(path)
+    except FileNotFoundError:
+        logger.warning(f"Intent classifier model not found at {path}, continuing without it")
+    except Exception as e:
+        logger.error(f"Failed to load intent classifier from {path}: {str(e)}")
+    return None
@@ -1,6 +1,6 @@
-import re
 import logging
 from typing import List
+from .intent_matcher import IntentMatcher, IntentMatch
 
 logger = logging.getLogger("langchain_agent.intent_detector")
 
@@ -21,20 +21,30 @@ class IntentDetector:
                 r"schedule|meeting|appointment|calendar|event|remind"
             ]
         }
-        
+        self._matcher = IntentMatcher(self._intent_patterns)
+    
+    # Timed once per command as the intent_detection stage by AgentOrchestrator.route, not per call here
     def detect_intent(self, command: str) -> str:
         command = command.lower()
         
-        for intent_type, patterns in self._intent_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, command):
-                    logger.info(f"Detected {intent_type} intent in command: {command}")
-                    return intent_type
+        intent_type = self._matcher.first(command)
+        if intent_type:
+            logger.debug(f"Detected {intent_type} intent in command: {command}")
+            return intent_type
         
-        logger.info(f"No specific intent detected in command: {command}")
+        logger.debug(f"No specific intent detected in command: {command}")
         return "general"
+    
+    def match_intent(self, command: str) -> IntentMatch:
+        """Detect the intent of a command along with the matched spans and a confidence score."""
+        command = command.lower()
+        
+        result = self._matcher.match(command)
+        return result or IntentMatch("general", 0.0, [], [])
         
     def add_intent_pattern(self, intent_type: str, pattern: str) -> None:
+        self._matcher.add(intent_type, pattern)
+        
         if intent_type not in self._intent_patterns:
             self._intent_patterns[intent_type] = []
             
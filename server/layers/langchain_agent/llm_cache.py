@@ -0,0 +1,238 @@
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence
+from langchain_core.caches import BaseCache
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration
+from core.metrics import REGISTRY
+
+logger = logging.getLogger("langchain_agent.llm_cache")
+
+LLM_CACHE_LOOKUPS = REGISTRY.counter(
+    "alris_llm_cache_total",
+    "LLM response cache lookups by outcome",
+    ("outcome",)
+)
+LLM_CACHE_SAVED = REGISTRY.counter(
+    "alris_llm_cache_saved_seconds_total",
+    "LLM latency avoided by serving cached responses"
+)
+
+# Misses waiting for their response to be stored; only used to time the LLM call
+_MAX_PENDING = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_responses (
+    key TEXT PRIMARY KEY,
+    model_hash TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    latency REAL NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def _message_type(message: Dict[str, Any]) -> str:
+    ids = message.get("id") or [""]
+    return ids[-1]
+
+class SQLiteLLMCache(BaseCache):
+    """LangChain LLM cache backed by a local SQLite file, for single-turn prompts only.
+
+    Entries are keyed on the model string (model name and call parameters,
+    including bound tools), a hash of the system prompt and the user message.
+    A prompt that carries any earlier AI or tool message depends on
+    conversation history and bypasses the cache, as do responses that plan
+    tool calls. Responses older than ``ttl_seconds`` are served no more (0
+    keeps them until evicted), and once the stored responses exceed
+    ``max_bytes``, the least recently used ones are evicted.
+
+    Each response is stored with the latency of the call that produced it, so
+    every hit adds that latency to ``latency_saved``.
+    """
+    
+    def __init__(self, path: str, max_bytes: int = 50 * 1024 * 1024, ttl_seconds: float = 86400):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_responses_last_used ON llm_responses (last_used)")
+        self._conn.commit()
+        self._bytes = self._stored_bytes()
+        self._pending: "OrderedDict[str, float]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.latency_saved = 0.0
+        logger.info(f"LLM response cache at {path} ({self._bytes} bytes stored)")
+    
+    def _stored_bytes(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_responses").fetchone()[0]
+    
+    def _key(self, prompt: str, llm_string: str) -> Optional[str]:
+        """Cache key for a single-turn prompt, or None if the prompt carries conversation history."""
+        try:
+            messages = json.loads(prompt)
+        except ValueError:
+            return None
+        if not isinstance(messages, list):
+            return None
+        
+        system, human = [], []
+        for message in messages:
+            kind = _message_type(message)
+            content = json.dumps(message.get("kwargs", {}).get("content"), sort_keys=True)
+            if kind == "SystemMessage":
+                system.append(content)
+            elif kind == "HumanMessage":
+                human.append(content)
+            else:
+                return None
+        if len(human) != 1:
+            return None
+        return _digest("\n".join((_digest(llm_string), _digest("\n".join(system)), human[0])))
+    
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Any]]:
+        key = self._key(prompt, llm_string)
+        if key is None:
+            self.bypassed += 1
+            LLM_CACHE_LOOKUPS.inc(outcome="bypass")
+            return None
+        
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, latency, created_at, size FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl_seconds > 0 and time.time() - row[2] >= self.ttl_seconds:
+                self._delete([key])
+                self._bytes -= row[3]
+                self.expirations += 1
+                row = None
+            if row is None:
+                self.misses += 1
+                self._pending[key] = time.perf_counter()
+                while len(self._pending) > _MAX_PENDING:
+                    self._pending.popitem(last=False)
+            else:
+                self._conn.execute("UPDATE llm_responses SET last_used = ? WHERE key = ?", (time.time(), key))
+                self._conn.commit()
+        
+        if row is None:
+            LLM_CACHE_LOOKUPS.inc(outcome="miss")
+            return None
+        
+        try:
+            generations = [
+                ChatGeneration(message=messages_from_dict([stored["message"]])[0], generation_info=stored["info"])
+                for stored in json.loads(row[0])
+            ]
+        except Exception as e:
+            logger.warning(f"Discarding unreadable LLM cache entry: {str(e)}")
+            with self._lock:
+                self._delete([key])
+            LLM_CACHE_LOOKUPS.inc(outcome="miss")
+            return None
+        
+        self.hits += 1
+        self.latency_saved += row[1]
+        LLM_CACHE_LOOKUPS.inc(outcome="hit")
+        LLM_CACHE_SAVED.inc(row[1])
+        return generations
+    
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Any]):
+        key = self._key(prompt, llm_string)
+        if key is None:
+            return
+        with self._lock:
+            started = self._pending.pop(key, None)
+        # Tool plans lead to side effects; only cache final chat answers
+        if any(not isinstance(generation, ChatGeneration) or getattr(generation.message, "tool_calls", None)
+               for generation in return_val):
+            return
+        
+        try:
+            response = json.dumps([
+                {"message": message_to_dict(generation.message), "info": generation.generation_info}
+                for generation in return_val
+            ])
+        except (TypeError, ValueError):
+            return
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        latency = time.perf_counter() - started if started is not None else 0.0
+        now = time.time()
+        
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM llm_responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, _digest(llm_string), response, size, latency, now, now)
+            )
+            self._conn.commit()
+            self._bytes += size - (previous[0] if previous else 0)
+            if self._bytes > self.max_bytes:
+                self._evict()
+    
+    def _evict(self):
+        # Other workers may share the file, so trust the table over the running total
+        self._bytes = self._stored_bytes()
+        while self._bytes > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM llm_responses ORDER BY last_used LIMIT 100"
+            ).fetchall()
+            if not rows:
+                break
+            evicted = []
+            for key, size in rows:
+                evicted.append(key)
+                self._bytes -= size
+                if self._bytes <= self.max_bytes:
+                    break
+            self._delete(evicted)
+            self.evictions += len(evicted)
+    
+    def _delete(self, keys):
+        self._conn.executemany("DELETE FROM llm_responses WHERE key = ?", [(key,) for key in keys])
+        self._conn.commit()
+    
+    def clear(self, **kwargs: Any):
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_responses")
+            self._conn.commit()
+            self._bytes = 0
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "latency_saved_seconds": round(self.latency_saved, 3)
+        }
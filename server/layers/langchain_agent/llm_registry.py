@@ -0,0 +1,115 @@
+import os
+import asyncio
+import logging
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Hashable, Optional, Tuple, Type
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+logger = logging.getLogger("langchain_agent.llm_registry")
+
+DEFAULT_MODEL = "gemini-2.5-flash"
+
+def default_model() -> str:
+    return os.getenv('GEMINI_MODEL', DEFAULT_MODEL)
+
+class LLMRegistry:
+    """Process-wide home for LLM clients, compiled agents and per-model concurrency limits.
+
+    Chat clients are created once per ``(model, params)`` and shared, so every
+    agent reuses the same underlying HTTP/gRPC connection pool instead of
+    opening its own. Agents are shared per ``(class, model)``: an agent's
+    compiled graph has its tools bound to that instance, so the instance
+    itself is what gets reused. ``limit(model)`` caps how many agent runs may
+    use a model at once; a limit of 0 means unlimited. With a
+    ``response_cache`` configured, every client created afterwards consults it.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients: Dict[Tuple[str, Tuple], Any] = {}
+        self._agents: Dict[Tuple[Type, str], Any] = {}
+        self._limits: Dict[str, int] = {}
+        self._default_limit = 0
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._waiting: Dict[str, int] = {}
+        self.response_cache = None
+    
+    def configure(self, limits: Optional[Dict[str, int]] = None, response_cache=None):
+        """Set per-model concurrency limits; the ``*`` entry applies to models not listed."""
+        limits = dict(limits or {})
+        self._default_limit = limits.pop("*", 0)
+        self._limits = limits
+        self._semaphores.clear()
+        self.response_cache = response_cache
+    
+    def llm(self, model: Optional[str] = None, **params) -> ChatGoogleGenerativeAI:
+        model = model or default_model()
+        key = (model, tuple(sorted(params.items())))
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                if self.response_cache is not None:
+                    params.setdefault("cache", self.response_cache)
+                client = ChatGoogleGenerativeAI(model=model, **params)
+                self._clients[key] = client
+                logger.info(f"Created LLM client for {model} {params}")
+            return client
+    
+    def agent(self, agent_class: Type, model: Optional[str] = None):
+        """Return the shared instance of ``agent_class`` for ``model``, building it on first use."""
+        key = (agent_class, model or default_model())
+        with self._lock:
+            agent = self._agents.get(key)
+        if agent is None:
+            # Built outside the lock: agent construction fetches clients from this registry
+            built = agent_class(model_name=model)
+            with self._lock:
+                agent = self._agents.setdefault(key, built)
+        return agent
+    
+    def _limit_for(self, model: str) -> int:
+        return self._limits.get(model, self._default_limit)
+    
+    @asynccontextmanager
+    async def limit(self, model: Hashable):
+        """Hold one of ``model``'s concurrency slots for the enclosed block."""
+        limit = self._limit_for(model)
+        semaphore = None
+        if limit > 0:
+            semaphore = self._semaphores.get(model)
+            if semaphore is None:
+                semaphore = self._semaphores[model] = asyncio.Semaphore(limit)
+        
+        if semaphore is not None:
+            self._waiting[model] = self._waiting.get(model, 0) + 1
+            try:
+                await semaphore.acquire()
+            finally:
+                self._waiting[model] -= 1
+        self._in_flight[model] = self._in_flight.get(model, 0) + 1
+        try:
+            yield
+        finally:
+            self._in_flight[model] -= 1
+            if semaphore is not None:
+                semaphore.release()
+    
+    def stats(self) -> Dict[str, Any]:
+        models = {model for model, _ in self._clients} | set(self._in_flight)
+        return {
+            "clients": len(self._clients),
+            "agents": [f"{agent_class.__name__}:{model}" for agent_class, model in self._agents],
+            "models": {
+                model: {
+                    "limit": self._limit_for(model) or None,
+                    "in_flight": self._in_flight.get(model, 0),
+                    "waiting": self._waiting.get(model, 0)
+                }
+                for model in sorted(models)
+            },
+            "response_cache": self.response_cache.stats() if self.response_cache is not None else {"status": "disabled"}
+        }
+
+llm_registry = LLMRegistry()
@@ -0,0 +1,196 @@
+import re
+import time
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from core.metrics import REGISTRY
+
+logger = logging.getLogger("langchain_agent.model_cascade")
+
+CASCADE_CALLS = REGISTRY.counter(
+    "alris_model_cascade_total",
+    "Model calls answered by each cascade tier, by outcome",
+    ("tier", "outcome")
+)
+CASCADE_LATENCY = REGISTRY.histogram(
+    "alris_model_cascade_seconds",
+    "Latency of model calls per cascade tier",
+    ("tier",)
+)
+
+# Replies that give up or hedge instead of answering; the large model gets a try
+LOW_CONFIDENCE = re.compile(
+    r"\b(i'?m not sure|i am not sure|i don'?t know|i do not know|i'?m unable to|i am unable to|"
+    r"i can'?t help|i cannot help|i can'?t do that|i cannot do that|i'?m not able to|could you clarify|"
+    r"please clarify)\b",
+    re.IGNORECASE
+)
+# Gemini finish reasons that mean the reply was cut off or refused
+FAILED_FINISH_REASONS = ("MAX_TOKENS", "SAFETY", "RECITATION", "BLOCKLIST", "PROHIBITED_CONTENT", "OTHER")
+
+def _text(message: BaseMessage) -> str:
+    content = message.content
+    if isinstance(content, list):
+        return "".join(part if isinstance(part, str) else part.get("text", "") for part in content if isinstance(part, (str, dict)))
+    return content if isinstance(content, str) else str(content)
+
+def _tool_name(tool: Any) -> Optional[str]:
+    if isinstance(tool, dict):
+        return tool.get("name") or tool.get("function", {}).get("name")
+    return getattr(tool, "name", None) or getattr(tool, "__name__", None)
+
+def escalation_reason(message: BaseMessage, tool_names: Sequence[str] = ()) -> Optional[str]:
+    """Why a small-model reply should not be used, or None if it is good enough."""
+    finish_reason = str(getattr(message, "response_metadata", {}).get("finish_reason") or "")
+    if "MALFORMED_FUNCTION_CALL" in finish_reason:
+        return "tool_plan"
+    if getattr(message, "invalid_tool_calls", None):
+        return "tool_plan"
+    tool_calls = getattr(message, "tool_calls", None) or []
+    for call in tool_calls:
+        if (tool_names and call.get("name") not in tool_names) or not isinstance(call.get("args"), dict):
+            return "tool_plan"
+    if finish_reason.split(".")[-1] in FAILED_FINISH_REASONS:
+        return "validation"
+    if tool_calls:
+        return None
+    
+    text = _text(message).strip()
+    if not text:
+        return "validation"
+    if LOW_CONFIDENCE.search(text):
+        return "low_confidence"
+    return None
+
+class CascadeStats:
+    """Per-tier call counts and latency, shared by every tool binding of one cascade."""
+    
+    def __init__(self, small_model: str, large_model: str):
+        self.small_model = small_model
+        self.large_model = large_model
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.escalations: Dict[str, int] = {}
+        self._tiers = {"small": [0, 0.0], "large": [0, 0.0]}
+    
+    def record(self, tier: str, seconds: float):
+        CASCADE_LATENCY.observe(seconds, tier=tier)
+        with self._lock:
+            entry = self._tiers[tier]
+            entry[0] += 1
+            entry[1] += seconds
+            if tier == "small":
+                self.calls += 1
+    
+    def escalate(self, reason: str):
+        CASCADE_CALLS.inc(tier="small", outcome=reason)
+        with self._lock:
+            self.escalations[reason] = self.escalations.get(reason, 0) + 1
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            escalated = sum(self.escalations.values())
+            return {
+                "small_model": self.small_model,
+                "large_model": self.large_model,
+                "calls": self.calls,
+                "escalated": escalated,
+                "escalation_rate": escalated / self.calls if self.calls else 0.0,
+                "escalations": dict(self.escalations),
+                "tiers": {
+                    tier: {"calls": calls, "latency_avg": seconds / calls if calls else 0.0}
+                    for tier, (calls, seconds) in self._tiers.items()
+                }
+            }
+
+class CascadeChatModel(BaseChatModel):
+    """Chat model that answers with a small model and falls back to a large one.
+
+    Every call goes to ``small`` first. Its reply is used unless it plans an
+    unknown or malformed tool call, fails validation (empty, cut off or
+    blocked) or hedges instead of answering; then the same prompt goes to
+    ``large``. The check runs before the ReAct loop acts on the reply, so a
+    rejected tool plan is never executed. Replies are only returned whole,
+    so a cascade does not stream tokens.
+    """
+    
+    small: Any
+    large: Any
+    usage: Any
+    tool_names: Any = ()
+    
+    @property
+    def _llm_type(self) -> str:
+        return "alris-cascade"
+    
+    def bind_tools(self, tools: Sequence[Any], **kwargs) -> "CascadeChatModel":
+        return CascadeChatModel(
+            small=self.small.bind_tools(tools, **kwargs),
+            large=self.large.bind_tools(tools, **kwargs),
+            usage=self.usage,
+            tool_names=tuple(name for name in map(_tool_name, tools) if name)
+        )
+    
+    def _accept(self, message: Optional[BaseMessage], error: Optional[Exception]) -> bool:
+        if error is not None:
+            logger.warning(f"Small model {self.usage.small_model} failed, escalating: {str(error)}")
+            reason = "error"
+        else:
+            reason = escalation_reason(message, self.tool_names)
+            if reason is None:
+                CASCADE_CALLS.inc(tier="small", outcome="accepted")
+                return True
+            logger.info(f"Escalating to {self.usage.large_model} ({reason})")
+        self.usage.escalate(reason)
+        return False
+    
+    def _result(self, message: BaseMessage) -> ChatResult:
+        if not isinstance(message, AIMessage):
+            message = AIMessage(content=message.content)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+    
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs) -> ChatResult:
+        # Inner calls get no parent callbacks, so a rejected reply never reaches stream listeners
+        config = {"callbacks": []}
+        message, error = None, None
+        started = time.perf_counter()
+        try:
+            message = self.small.invoke(messages, config=config, stop=stop, **kwargs)
+        except Exception as e:
+            error = e
+        self.usage.record("small", time.perf_counter() - started)
+        if self._accept(message, error):
+            return self._result(message)
+        
+        started = time.perf_counter()
+        try:
+            message = self.large.invoke(messages, config=config, stop=stop, **kwargs)
+        finally:
+            self.usage.record("large", time.perf_counter() - started)
+        CASCADE_CALLS.inc(tier="large", outcome="answered")
+        return self._result(message)
+    
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager=None, **kwargs) -> ChatResult:
+        config = {"callbacks": []}
+        message, error = None, None
+        started = time.perf_counter()
+        try:
+            message = await self.small.ainvoke(messages, config=config, stop=stop, **kwargs)
+        except Exception as e:
+            error = e
+        self.usage.record("small", time.perf_counter() - started)
+        if self._accept(message, error):
+            return self._result(message)
+        
+        started = time.perf_counter()
+        try:
+            message = await self.large.ainvoke(messages, config=config, stop=stop, **kwargs)
+        finally:
+            self.usage.record("large", time.perf_counter() - started)
+        CASCADE_CALLS.inc(tier="large", outcome="answered")
+        return self._result(message)
@@ -0,0 +1,64 @@
+import asyncio
+import logging
+from contextlib import AsyncExitStack
+from typing import Any, Iterable, Sequence
+from langgraph.prebuilt import ToolNode
+from langgraph.types import Command
+from core.metrics import REGISTRY
+
+logger = logging.getLogger("langchain_agent.parallel_tools")
+
+TOOL_CALLS_PER_TURN = REGISTRY.histogram(
+    "alris_agent_tool_calls_per_turn",
+    "Tool calls the model planned in a single step of the agent loop",
+    buckets=(1, 2, 3, 4, 6, 8, 12, 16)
+)
+
+class ParallelToolNode(ToolNode):
+    """``ToolNode`` that runs the tool calls of one model reply concurrently, within limits.
+
+    At most ``max_concurrency`` calls of a reply run at once (0 means no limit).
+    Tools named in ``exclusive`` share state, such as the browser page, so their
+    calls run one at a time in the order the model planned them, while other
+    calls run alongside. Results come back in call order either way, so each
+    ``ToolMessage`` follows the reply exactly as if the calls had run in sequence.
+
+    This overrides ``ToolNode._afunc`` and uses its ``_parse_input`` and
+    ``_arun_one`` helpers, whose signatures change between langgraph releases,
+    so langgraph is pinned in requirements.txt. Tools returning a ``Command``
+    are combined the same way ``ToolNode`` does it.
+    """
+    
+    def __init__(self, tools: Sequence[Any], max_concurrency: int = 4, exclusive: Iterable[str] = (), **kwargs):
+        super().__init__(tools, **kwargs)
+        self.max_concurrency = max_concurrency
+        self.exclusive = frozenset(exclusive)
+    
+    async def _afunc(self, input: Any, config: Any, **kwargs) -> Any:
+        tool_calls, input_type = self._parse_input(input, **kwargs)
+        TOOL_CALLS_PER_TURN.observe(len(tool_calls))
+        # Per reply, so one command's fan-out never holds slots another command is waiting for
+        semaphore = asyncio.Semaphore(self.max_concurrency) if self.max_concurrency > 0 else None
+        # asyncio.Lock wakes waiters first in, first out, so exclusive calls keep the planned order
+        exclusive_lock = asyncio.Lock()
+        
+        async def run(call):
+            async with AsyncExitStack() as stack:
+                # The exclusive lock is taken first so a queued page action does not sit on a slot
+                if call["name"] in self.exclusive:
+                    await stack.enter_async_context(exclusive_lock)
+                if semaphore is not None:
+                    await stack.enter_async_context(semaphore)
+                return await self._arun_one(call, input_type, config)
+        
+        if len(tool_calls) > 1:
+            logger.debug(f"Running {len(tool_calls)} tool calls: {[call['name'] for call in tool_calls]}")
+        outputs = await asyncio.gather(*(run(call) for call in tool_calls))
+        if not any(isinstance(output, Command) for output in outputs):
+            return outputs if input_type == "list" else {self.messages_key: outputs}
+        # Commands are passed through; plain results are wrapped as node updates, as ToolNode does
+        return [
+            output if isinstance(output, Command)
+            else [output] if input_type == "list" else {self.messages_key: [output]}
+            for output in outputs
+        ]
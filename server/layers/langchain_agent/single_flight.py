@@ -0,0 +1,56 @@
+import re
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable
+from core.metrics import REGISTRY
+
+logger = logging.getLogger("langchain_agent.single_flight")
+
+SINGLE_FLIGHT_CALLS = REGISTRY.counter(
+    "alris_single_flight_total",
+    "Coalescable calls that started the work or joined a call already running",
+    ("outcome",)
+)
+
+def normalize_command(command: str) -> str:
+    """Canonical form used to decide whether two commands are the same request."""
+    command = re.sub(r"\s+", " ", command.lower()).strip()
+    return command.rstrip(" .!?")
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into a single execution.
+    
+    The first caller for a key starts the work; callers arriving while it is
+    still running await the same result. The work runs as its own task, so a
+    caller that is cancelled does not cancel it for the others.
+    """
+    
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.executed = 0
+        self.coalesced = 0
+    
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        call = self._calls.get(key)
+        if call is None:
+            call = asyncio.ensure_future(fn())
+            self._calls[key] = call
+            call.add_done_callback(lambda done: self._forget(key, done))
+            self.executed += 1
+            SINGLE_FLIGHT_CALLS.inc(outcome="executed")
+        else:
+            self.coalesced += 1
+            SINGLE_FLIGHT_CALLS.inc(outcome="coalesced")
+            logger.info(f"Coalescing duplicate in-flight request: {key}")
+        return await asyncio.shield(call)
+    
+    def _forget(self, key: Hashable, call: asyncio.Future):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._calls),
+            "executed": self.executed,
+            "coalesced": self.coalesced
+        }
@@ -0,0 +1,408 @@
+import os
+import time
+import zlib
+import asyncio
+import sqlite3
+import logging
+import threading
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+from langgraph.checkpoint.base import BaseCheckpointSaver, CheckpointTuple
+from core.metrics import REGISTRY
+
+try:
+    from langgraph.checkpoint.base import WRITES_IDX_MAP, get_checkpoint_metadata
+except ImportError:
+    WRITES_IDX_MAP = {}
+    
+    def get_checkpoint_metadata(config, metadata):
+        return metadata
+
+logger = logging.getLogger("langchain_agent.sqlite_checkpointer")
+
+CHECKPOINT_FLUSHES = REGISTRY.histogram(
+    "alris_checkpoint_flush_rows",
+    "Checkpoint rows written per SQLite transaction",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200)
+)
+
+# Serialized values larger than this are zlib-compressed
+COMPRESS_THRESHOLD = 512
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS checkpoints (
+        thread_id TEXT NOT NULL,
+        checkpoint_ns TEXT NOT NULL DEFAULT '',
+        checkpoint_id TEXT NOT NULL,
+        parent_checkpoint_id TEXT,
+        type TEXT NOT NULL,
+        checkpoint BLOB NOT NULL,
+        metadata_type TEXT NOT NULL,
+        metadata BLOB NOT NULL,
+        created_at REAL NOT NULL,
+        PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS writes (
+        thread_id TEXT NOT NULL,
+        checkpoint_ns TEXT NOT NULL DEFAULT '',
+        checkpoint_id TEXT NOT NULL,
+        task_id TEXT NOT NULL,
+        idx INTEGER NOT NULL,
+        channel TEXT NOT NULL,
+        type TEXT NOT NULL,
+        value BLOB NOT NULL,
+        task_path TEXT NOT NULL DEFAULT '',
+        PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS checkpoints_created_at ON checkpoints (created_at)"
+)
+
+def _configurable(config: Dict[str, Any]) -> Tuple[str, str, Optional[str]]:
+    configurable = config["configurable"]
+    return configurable["thread_id"], configurable.get("checkpoint_ns", ""), configurable.get("checkpoint_id")
+
+class SQLiteCheckpointSaver(BaseCheckpointSaver):
+    """LangGraph checkpointer on a local SQLite file that several worker processes can share.
+
+    The database runs in WAL mode, so readers never block the single writer.
+    Each process opens its own connection, and writes take the lock up front
+    with ``BEGIN IMMEDIATE`` and wait up to ``busy_timeout`` for it. Checkpoints
+    and writes are buffered in memory and written in one transaction when
+    ``max_batch`` rows are pending, before any read and on ``flush()``, which
+    the agent calls at the end of every run so other workers see the turn.
+    Values use the graph serializer and are zlib-compressed above
+    ``COMPRESS_THRESHOLD`` bytes. Nothing is loaded up front; a thread's rows
+    are read when that thread is used.
+
+    Only the newest ``keep_checkpoints`` checkpoints of a thread are kept, and
+    threads untouched for ``ttl_seconds`` are deleted (0 keeps them forever).
+    Releasing a thread keeps it, so a client can resume it by id until then.
+
+    The async methods never touch the database on the event loop: ``aput`` and
+    ``aput_writes`` only buffer, and flushes and reads run in the default
+    executor. The buffer has its own lock, so buffering never waits on a
+    transaction. ``stats()`` reports stored threads and bytes as counted at the
+    last periodic sweep instead of scanning the tables on every call.
+    """
+    
+    def __init__(self, path: str, max_batch: int = 64, keep_checkpoints: int = 10,
+                 ttl_seconds: float = 7 * 86400, sweep_interval: float = 300,
+                 busy_timeout: float = 10.0, serde=None):
+        super().__init__(serde=serde)
+        self.path = path
+        self.max_batch = max_batch
+        self.keep_checkpoints = keep_checkpoints
+        self.ttl_seconds = ttl_seconds
+        self.sweep_interval = sweep_interval
+        self.busy_timeout = busy_timeout
+        # _lock serializes database access; _buffer_lock only guards the pending rows
+        self._lock = threading.RLock()
+        self._buffer_lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self._pending_checkpoints: List[tuple] = []
+        self._pending_writes: List[tuple] = []
+        self._last_sweep = 0.0
+        self.flushes = 0
+        self.rows_written = 0
+        self.stored_threads = 0
+        self.stored_bytes = 0
+        with self._lock:
+            self._count_stored(self._connection())
+    
+    def _connection(self) -> sqlite3.Connection:
+        # Connections must not cross a fork, so each worker process opens its own
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, timeout=self.busy_timeout,
+                                         check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+            self._pid = os.getpid()
+        return self._conn
+    
+    def _dumps(self, value: Any) -> Tuple[str, bytes]:
+        if hasattr(self.serde, "dumps_typed"):
+            kind, data = self.serde.dumps_typed(value)
+        else:
+            kind, data = "json", self.serde.dumps(value)
+        if len(data) > COMPRESS_THRESHOLD:
+            return f"z:{kind}", zlib.compress(data)
+        return kind, data
+    
+    def _loads(self, kind: str, data: bytes) -> Any:
+        if kind.startswith("z:"):
+            kind, data = kind[2:], zlib.decompress(data)
+        if hasattr(self.serde, "loads_typed"):
+            return self.serde.loads_typed((kind, data))
+        return self.serde.loads(data)
+    
+    def _buffer_checkpoint(self, config, checkpoint, metadata) -> Tuple[Dict[str, Any], bool]:
+        """Queue a checkpoint; returns its config and whether the buffer is full."""
+        thread_id, checkpoint_ns, parent_id = _configurable(config)
+        kind, data = self._dumps(checkpoint)
+        metadata_kind, metadata_data = self._dumps(get_checkpoint_metadata(config, metadata))
+        with self._buffer_lock:
+            self._pending_checkpoints.append((
+                thread_id, checkpoint_ns, checkpoint["id"], parent_id,
+                kind, data, metadata_kind, metadata_data, time.time()
+            ))
+            full = len(self._pending_checkpoints) + len(self._pending_writes) >= self.max_batch
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"]
+            }
+        }, full
+    
+    def _buffer_writes(self, config, writes: Sequence[Tuple[str, Any]], task_id: str, task_path: str) -> bool:
+        """Queue a task's writes; returns whether the buffer is full."""
+        thread_id, checkpoint_ns, checkpoint_id = _configurable(config)
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            kind, data = self._dumps(value)
+            rows.append((
+                thread_id, checkpoint_ns, checkpoint_id, task_id,
+                WRITES_IDX_MAP.get(channel, idx), channel, kind, data, task_path
+            ))
+        with self._buffer_lock:
+            self._pending_writes.extend(rows)
+            return len(self._pending_checkpoints) + len(self._pending_writes) >= self.max_batch
+    
+    def put(self, config, checkpoint, metadata, new_versions=None):
+        stored, full = self._buffer_checkpoint(config, checkpoint, metadata)
+        if full:
+            self.flush()
+        return stored
+    
+    def put_writes(self, config, writes: Sequence[Tuple[str, Any]], task_id: str, task_path: str = ""):
+        if self._buffer_writes(config, writes, task_id, task_path):
+            self.flush()
+    
+    def flush(self):
+        """Write all buffered checkpoints and writes in one transaction.
+
+        If the transaction fails, e.g. because another worker held the lock past
+        ``busy_timeout``, the rows stay buffered and the error is raised.
+        """
+        with self._lock:
+            # Taken under the database lock, so batches reach the file in the order they were buffered
+            with self._buffer_lock:
+                if not self._pending_checkpoints and not self._pending_writes:
+                    return
+                checkpoints, self._pending_checkpoints = self._pending_checkpoints, []
+                writes, self._pending_writes = self._pending_writes, []
+            try:
+                conn = self._connection()
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany("INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", checkpoints)
+                # Special channels (errors, interrupts) overwrite; regular writes keep the first value
+                conn.executemany("INSERT OR REPLACE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                 [row for row in writes if row[4] < 0])
+                conn.executemany("INSERT OR IGNORE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                 [row for row in writes if row[4] >= 0])
+                if self.keep_checkpoints > 0:
+                    for thread_id, checkpoint_ns in {(row[0], row[1]) for row in checkpoints}:
+                        self._prune(conn, thread_id, checkpoint_ns)
+                conn.execute("COMMIT")
+            except Exception:
+                if self._conn is not None and self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                # Put the rows back ahead of anything buffered since, so the next flush retries them
+                with self._buffer_lock:
+                    self._pending_checkpoints[:0] = checkpoints
+                    self._pending_writes[:0] = writes
+                raise
+            self.flushes += 1
+            self.rows_written += len(checkpoints) + len(writes)
+            CHECKPOINT_FLUSHES.observe(len(checkpoints) + len(writes))
+            
+            now = time.monotonic()
+            if now - self._last_sweep >= self.sweep_interval:
+                self._last_sweep = now
+                if self.ttl_seconds > 0:
+                    self.sweep()
+                self._count_stored(conn)
+    
+    async def aflush(self):
+        if not self._pending_checkpoints and not self._pending_writes:
+            return
+        await asyncio.get_running_loop().run_in_executor(None, self.flush)
+    
+    def _prune(self, conn: sqlite3.Connection, thread_id: str, checkpoint_ns: str):
+        row = conn.execute(
+            "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+            "ORDER BY checkpoint_id DESC LIMIT 1 OFFSET ?",
+            (thread_id, checkpoint_ns, self.keep_checkpoints - 1)
+        ).fetchone()
+        if row is None:
+            return
+        for table in ("checkpoints", "writes"):
+            conn.execute(
+                f"DELETE FROM {table} WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?",
+                (thread_id, checkpoint_ns, row[0])
+            )
+    
+    def sweep(self) -> int:
+        """Delete threads with no checkpoint newer than ``ttl_seconds``; returns how many were deleted."""
+        with self._lock:
+            conn = self._connection()
+            expired = [row[0] for row in conn.execute(
+                "SELECT thread_id FROM checkpoints GROUP BY thread_id HAVING MAX(created_at) < ?",
+                (time.time() - self.ttl_seconds,)
+            )]
+            for thread_id in expired:
+                self.delete_thread(thread_id)
+        if expired:
+            logger.info(f"Deleted {len(expired)} expired conversation threads")
+        return len(expired)
+    
+    def delete_thread(self, thread_id: str):
+        with self._lock:
+            with self._buffer_lock:
+                self._pending_checkpoints = [row for row in self._pending_checkpoints if row[0] != thread_id]
+                self._pending_writes = [row for row in self._pending_writes if row[0] != thread_id]
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+            conn.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
+            conn.execute("COMMIT")
+    
+    async def adelete_thread(self, thread_id: str):
+        await asyncio.get_running_loop().run_in_executor(None, self.delete_thread, thread_id)
+    
+    def release(self, thread_id: str):
+        """Durable threads outlive their connection; they are only deleted once ``ttl_seconds`` pass."""
+    
+    def _count_stored(self, conn: sqlite3.Connection):
+        self.stored_threads = conn.execute("SELECT COUNT(DISTINCT thread_id) FROM checkpoints").fetchone()[0]
+        self.stored_bytes = conn.execute(
+            "SELECT (SELECT COALESCE(SUM(LENGTH(checkpoint) + LENGTH(metadata)), 0) FROM checkpoints)"
+            " + (SELECT COALESCE(SUM(LENGTH(value)), 0) FROM writes)"
+        ).fetchone()[0]
+    
+    def _tuple(self, conn: sqlite3.Connection, row: tuple) -> CheckpointTuple:
+        thread_id, checkpoint_ns, checkpoint_id, parent_id, kind, data, metadata_kind, metadata_data = row
+        writes = conn.execute(
+            "SELECT task_id, channel, type, value FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id)
+        ).fetchall()
+        return CheckpointTuple(
+            config={"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id}},
+            checkpoint=self._loads(kind, data),
+            metadata=self._loads(metadata_kind, metadata_data),
+            parent_config=(
+                {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": parent_id}}
+                if parent_id else None
+            ),
+            pending_writes=[(task_id, channel, self._loads(value_kind, value)) for task_id, channel, value_kind, value in writes]
+        )
+    
+    def get_tuple(self, config) -> Optional[CheckpointTuple]:
+        thread_id, checkpoint_ns, checkpoint_id = _configurable(config)
+        with self._lock:
+            self.flush()
+            conn = self._connection()
+            columns = ("SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+                       "type, checkpoint, metadata_type, metadata FROM checkpoints ")
+            if checkpoint_id:
+                row = conn.execute(
+                    columns + "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id)
+                ).fetchone()
+            else:
+                row = conn.execute(
+                    columns + "WHERE thread_id = ? AND checkpoint_ns = ? ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns)
+                ).fetchone()
+            return self._tuple(conn, row) if row else None
+    
+    def list(self, config, *, filter: Optional[Dict[str, Any]] = None, before=None,
+             limit: Optional[int] = None) -> Iterator[CheckpointTuple]:
+        clauses, params = [], []
+        if config:
+            thread_id, checkpoint_ns, checkpoint_id = _configurable(config)
+            clauses.append("thread_id = ?")
+            params.append(thread_id)
+            if "checkpoint_ns" in config["configurable"]:
+                clauses.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id:
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and before.get("configurable", {}).get("checkpoint_id"):
+            clauses.append("checkpoint_id < ?")
+            params.append(before["configurable"]["checkpoint_id"])
+        query = ("SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+                 "type, checkpoint, metadata_type, metadata FROM checkpoints")
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY checkpoint_id DESC"
+        
+        with self._lock:
+            self.flush()
+            conn = self._connection()
+            tuples = []
+            for row in conn.execute(query, params).fetchall():
+                if limit is not None and len(tuples) >= limit:
+                    break
+                checkpoint_tuple = self._tuple(conn, row)
+                if filter and not all(checkpoint_tuple.metadata.get(k) == v for k, v in filter.items()):
+                    continue
+                tuples.append(checkpoint_tuple)
+        yield from tuples
+    
+    async def aget_tuple(self, config) -> Optional[CheckpointTuple]:
+        return await asyncio.get_running_loop().run_in_executor(None, self.get_tuple, config)
+    
+    async def alist(self, config, *, filter: Optional[Dict[str, Any]] = None, before=None,
+                    limit: Optional[int] = None) -> AsyncIterator[CheckpointTuple]:
+        tuples = await asyncio.get_running_loop().run_in_executor(
+            None, lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint_tuple in tuples:
+            yield checkpoint_tuple
+    
+    async def aput(self, config, checkpoint, metadata, new_versions=None):
+        stored, full = self._buffer_checkpoint(config, checkpoint, metadata)
+        if full:
+            await self.aflush()
+        return stored
+    
+    async def aput_writes(self, config, writes: Sequence[Tuple[str, Any]], task_id: str, task_path: str = ""):
+        if self._buffer_writes(config, writes, task_id, task_path):
+            await self.aflush()
+    
+    def get_next_version(self, current, channel) -> str:
+        # Same string versions as MemorySaver, so they sort lexically in SQL
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{int(time.time() * 1000000) % 10 ** 16:016}"
+    
+    def close(self):
+        with self._lock:
+            self.flush()
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "sqlite",
+            "threads": self.stored_threads,
+            "bytes": self.stored_bytes,
+            "pending_rows": len(self._pending_checkpoints) + len(self._pending_writes),
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+            "ttl_seconds": self.ttl_seconds
+        }
@@ -3,12 +3,14 @@ import os
 import json
 import requests
 from typing import Dict, Any, Optional
+from core.metrics import observe_stage
 
 logger = logging.getLogger("alt_calendar_service")
 
 class SimpleCalendarService:
     
     @staticmethod
+    @observe_stage("calendar_post")
     async def schedule_event(title: str, 
                            start_time: str, 
                            end_time: str, 
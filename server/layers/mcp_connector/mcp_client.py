@@ -5,6 +5,8 @@ from typing import Dict, Any
 from contextlib import AsyncExitStack, suppress
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
+from core.metrics import track_stage
+from core.tracing import tracer, TRACE_PARAM
 
 logger = logging.getLogger("mcp_connector.client")
 
@@ -101,17 +103,27 @@ if __name__ == "__main__":
                 "message": "Not connected to MCP server"
             }
         
-        try:
-            logger.info(f"Calling MCP tool: {tool_name} with params: {params}")
-            result = await self.session.call_tool(tool_name, params)
-            logger.info(f"MCP tool result: {result}")
-            return result
-        except Exception as e:
-            logger.error(f"Error calling MCP tool {tool_name}: {str(e)}")
-            return {
-                "status": "error",
-                "message": f"Error calling MCP tool: {str(e)}"
-            }
+        with track_stage("mcp_call_tool", tool=tool_name) as stage:
+            try:
+                logger.info(f"Calling MCP tool: {tool_name} with params: {params}")
+                trace_context = tracer.current_context()
+                if trace_context:
+                    if isinstance(params.get("params"), dict):
+                        params = {**params, "params": {**params["params"], TRACE_PARAM: trace_context}}
+                    else:
+                        params = {**params, TRACE_PARAM: trace_context}
+                result = await self.session.call_tool(tool_name, params)
+                logger.info(f"MCP tool result: {result}")
+                if getattr(result, "isError", False):
+                    stage.fail()
+                return result
+            except Exception as e:
+                stage.fail()
+                logger.error(f"Error calling MCP tool {tool_name}: {str(e)}")
+                return {
+                    "status": "error",
+                    "message": f"Error calling MCP tool: {str(e)}"
+                }
     
     async def disconnect(self):
         """Safely disconnect from the MCP server with proper resource cleanup"""
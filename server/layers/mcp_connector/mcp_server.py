@@ -1,8 +1,11 @@
 import logging
+import functools
 from typing import Dict, Any, Optional, List
 from mcp.server.fastmcp import FastMCP
 from pydantic import BaseModel
 from ..external_services import BrowserService, EmailService, CalendarService, CalendarEventParams
+from ..external_services.youtube_search import cached_youtube_search, video_urls
+from core.tracing import tracer, TRACE_PARAM
 
 logger = logging.getLogger("mcp_connector.server")
 
@@ -33,6 +36,19 @@ class CalendarEventParams(BaseModel):
     end_time: str
     description: Optional[str] = None
 
+def traced_tool(fn):
+    """Continue the caller's trace, passed along in the tool params, around an MCP tool."""
+    @functools.wraps(fn)
+    async def wrapper(params: Dict[str, Any]) -> Dict[str, Any]:
+        remote_parent = None
+        if isinstance(params, dict):
+            remote_parent = params.pop(TRACE_PARAM, None)
+            if isinstance(params.get("params"), dict):
+                remote_parent = params["params"].pop(TRACE_PARAM, None) or remote_parent
+        with tracer.start_span(f"mcp_tool.{fn.__name__}", remote_parent=remote_parent):
+            return await fn(params)
+    return wrapper
+
 class MCPConnector:
     """MCP Connector that bridges agents and external services"""
     
@@ -51,6 +67,7 @@ class MCPConnector:
         """Register all tools with the MCP server"""
         
         @self.mcp.tool()
+        @traced_tool
         async def navigate(params: Dict[str, Any]) -> Dict[str, Any]:
             """Navigate to a URL in the browser"""
             try:
@@ -82,6 +99,7 @@ class MCPConnector:
                 }
         
         @self.mcp.tool()
+        @traced_tool
         async def search_youtube(params: Dict[str, Any]) -> Dict[str, Any]:
             """Search for a video on YouTube"""
             try:
@@ -95,14 +113,26 @@ class MCPConnector:
                         "message": "search_query parameter is required"
                     }
                 
-                query = search_query.replace(" ", "+")
-                url = f"https://www.youtube.com/results?search_query={query}"
-                success = await self.browser_service.navigate(url)
+                urls = []
+                try:
+                    urls = video_urls(await cached_youtube_search(search_query))
+                except Exception as e:
+                    logger.warning(f"YouTube result lookup failed for '{search_query}': {str(e)}")
+                
+                # The lookup already found the videos, so open the first one instead of loading the results page
+                if urls:
+                    success = await self.browser_service.navigate(urls[0])
+                else:
+                    query = search_query.replace(" ", "+")
+                    url = f"https://www.youtube.com/results?search_query={query}"
+                    success = await self.browser_service.navigate(url)
+                    if success:
+                        await self.browser_service.click_element("a#video-title")
                 if success:
-                    await self.browser_service.click_element("a#video-title")
                     return {
                         "status": "success",
-                        "message": f"Successfully searched for and played YouTube video: {search_query}"
+                        "message": f"Successfully searched for and played YouTube video: {search_query}",
+                        "video_urls": urls
                     }
                 return {
                     "status": "error",
@@ -116,6 +146,7 @@ class MCPConnector:
                 }
         
         @self.mcp.tool()
+        @traced_tool
         async def fill_form(params: Dict[str, Any]) -> Dict[str, Any]:
             """Fill a form with the provided data"""
             try:
@@ -153,6 +184,7 @@ class MCPConnector:
                 }
         
         @self.mcp.tool()
+        @traced_tool
         async def click_element(params: Dict[str, Any]) -> Dict[str, Any]:
             """Click on an element in the browser"""
             try:
@@ -184,6 +216,7 @@ class MCPConnector:
                 }
         
         @self.mcp.tool()
+        @traced_tool
         async def send_email(params: Dict[str, Any]) -> Dict[str, Any]:
             """Send an email"""
             try:
@@ -228,6 +261,7 @@ class MCPConnector:
                 }
         
         @self.mcp.tool()
+        @traced_tool
         async def schedule_calendar_event(params: Dict[str, Any]) -> Dict[str, Any]:
             """Schedule an event in Google Calendar using a pre-configured Google Apps Script."""
             try:
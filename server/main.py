@@ -8,24 +8,78 @@ import signal
 import sys
 from fastapi import FastAPI, WebSocket, Request
 from fastapi.middleware.cors import CORSMiddleware
-from contextlib import asynccontextmanager
+from contextlib import aclosing, asynccontextmanager, suppress
 import uuid
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse, PlainTextResponse
+
+from config import (
+    BATCH_MAX_COMMANDS, BATCH_DEFAULT_CONCURRENCY, BATCH_MAX_CONCURRENCY,
+    JOB_MAX_JOBS, JOB_TTL_SECONDS,
+    ADMISSION_MAX_CONCURRENT, ADMISSION_MAX_QUEUE, ADMISSION_QUEUE_TIMEOUT, ADMISSION_INTENT_LIMITS,
+    LOG_FILE, LOG_ASYNC, LOG_MAX_BYTES, LOG_BACKUP_COUNT, LOG_COMPRESS, LOG_SAMPLING, LOG_TRUNCATE,
+    TRACING_ENABLED, TRACE_FILE, TRACE_BUFFER_SIZE,
+    INTENT_MODEL_PATH, INTENT_CLASSIFIER_THRESHOLD,
+    YOUTUBE_CACHE_MAX_ENTRIES, YOUTUBE_CACHE_TTL, YOUTUBE_CACHE_STALE, YOUTUBE_CACHE_FILE,
+    YOUTUBE_SEARCH_WORKERS, YOUTUBE_SEARCH_TIMEOUT, YOUTUBE_QUERY_CANONICALIZE, YOUTUBE_QUERY_SIMILARITY,
+    YOUTUBE_API_KEY, YOUTUBE_API_URL, YOUTUBE_METADATA_STUB, YOUTUBE_METADATA_TTL,
+    LLM_CONCURRENCY_LIMITS, LLM_CACHE_FILE, LLM_CACHE_MAX_BYTES, LLM_CACHE_TTL
+)
+from core import JobStore, JobStoreFullError, AdmissionController, AdmissionRejectedError, TurnQueue
+from core.metrics import REGISTRY
+from core.logging_setup import configure_logging, parse_logger_settings, shutdown_logging
+from core.tracing import tracer
 
 from layers.langchain_agent import AgentOrchestrator
+from layers.langchain_agent.intent_classifier import load_classifier
+from layers.langchain_agent.llm_registry import llm_registry
+from layers.langchain_agent.llm_cache import SQLiteLLMCache
 from layers.mcp_connector import MCPConnector, AlrisMCPClient
-from layers.external_services import BrowserService
+from layers.external_services import BrowserService, youtube_cache, youtube_search, youtube_metadata
 
-logging.basicConfig(
+configure_logging(
     level=logging.DEBUG,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler("alris_server.log")
-    ]
+    log_file=LOG_FILE,
+    async_mode=LOG_ASYNC,
+    max_bytes=LOG_MAX_BYTES,
+    backup_count=LOG_BACKUP_COUNT,
+    compress=LOG_COMPRESS,
+    sample_rates=parse_logger_settings(LOG_SAMPLING),
+    truncate_limits=parse_logger_settings(LOG_TRUNCATE)
 )
 logger = logging.getLogger("alris_server")
 
+tracer.configure(enabled=TRACING_ENABLED, file_path=TRACE_FILE, buffer_size=TRACE_BUFFER_SIZE)
+youtube_cache.configure(
+    max_entries=YOUTUBE_CACHE_MAX_ENTRIES,
+    ttl_seconds=YOUTUBE_CACHE_TTL,
+    stale_seconds=YOUTUBE_CACHE_STALE,
+    persist_path=YOUTUBE_CACHE_FILE
+)
+youtube_search.configure(
+    max_workers=YOUTUBE_SEARCH_WORKERS,
+    timeout=YOUTUBE_SEARCH_TIMEOUT,
+    canonicalize=YOUTUBE_QUERY_CANONICALIZE,
+    similarity_threshold=YOUTUBE_QUERY_SIMILARITY
+)
+youtube_metadata.configure(
+    source=youtube_metadata.create_source(api_key=YOUTUBE_API_KEY, base_url=YOUTUBE_API_URL, stub_file=YOUTUBE_METADATA_STUB),
+    ttl_seconds=YOUTUBE_METADATA_TTL
+)
+llm_registry.configure(
+    limits=LLM_CONCURRENCY_LIMITS,
+    response_cache=SQLiteLLMCache(
+        LLM_CACHE_FILE, max_bytes=LLM_CACHE_MAX_BYTES, ttl_seconds=LLM_CACHE_TTL
+    ) if LLM_CACHE_FILE else None
+)
+
+# Current values only; monotonic totals are counters incremented where they happen
+ADMISSION_GAUGE = REGISTRY.gauge("alris_admission", "Admission controller state", ("field",))
+JOBS_GAUGE = REGISTRY.gauge("alris_jobs", "Jobs in the job store by status", ("status",))
+SINGLE_FLIGHT_GAUGE = REGISTRY.gauge("alris_single_flight", "Coalescable YouTube searches currently running", ("field",))
+YOUTUBE_CACHE_GAUGE = REGISTRY.gauge("alris_youtube_cache", "YouTube search result cache and query canonicalizer state", ("field",))
+MEMORY_GAUGE = REGISTRY.gauge("alris_conversation_memory", "Conversation threads and estimated bytes held in agent memory", ("field",))
+LLM_GAUGE = REGISTRY.gauge("alris_llm", "Agent runs holding or waiting for an LLM concurrency slot", ("model", "field"))
+
 mcp_client = None
 mcp_thread = None
 mcp_connector = None
@@ -81,7 +135,10 @@ async def lifespan(app: FastAPI):
                     else:
                         logger.error("Failed to connect MCP client after maximum retries")
         
-        agent_orchestrator = AgentOrchestrator()
+        agent_orchestrator = AgentOrchestrator(
+            intent_classifier=load_classifier(INTENT_MODEL_PATH),
+            classifier_threshold=INTENT_CLASSIFIER_THRESHOLD
+        )
         agent_orchestrator.set_mcp_client(mcp_client)
         logger.info("Agent orchestrator initialized with MCP client")
         
@@ -89,11 +146,21 @@ async def lifespan(app: FastAPI):
         app.state.mcp_thread = mcp_thread
         app.state.mcp_client = mcp_client
         app.state.agent_orchestrator = agent_orchestrator
+        app.state.job_store = JobStore(max_jobs=JOB_MAX_JOBS, ttl_seconds=JOB_TTL_SECONDS)
+        app.state.admission = AdmissionController(
+            max_concurrent=ADMISSION_MAX_CONCURRENT,
+            max_queue=ADMISSION_MAX_QUEUE,
+            queue_timeout=ADMISSION_QUEUE_TIMEOUT,
+            intent_limits=ADMISSION_INTENT_LIMITS
+        )
         
         yield
     finally:
         logger.info("FastAPI application shutting down")
         
+        if hasattr(app.state, 'job_store'):
+            app.state.job_store.cancel_all()
+        
         if mcp_client and hasattr(mcp_client, 'disconnect'):
             try:
                 await asyncio.wait_for(mcp_client.disconnect(), timeout=3.0)
@@ -111,9 +178,15 @@ async def lifespan(app: FastAPI):
                 mcp_connector = None
             except Exception as e:
                 logger.error(f"Error shutting down MCP connector: {str(e)}")
-
+        
         if hasattr(app.state, 'agent_orchestrator'):
             await app.state.agent_orchestrator.cleanup()
+        
+        youtube_search.shutdown()
+        youtube_cache.flush()
+        if llm_registry.response_cache is not None:
+            llm_registry.response_cache.close()
+        shutdown_logging()
 
 app = FastAPI(
     title="Alris Server", 
@@ -130,98 +203,227 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def admit_command(route):
+    """Reserve capacity for a routed command with the admission controller, keyed by its route."""
+    return app.state.admission.admit(app.state.agent_orchestrator.classify_command(route))
+
+def admission_rejected(e: AdmissionRejectedError) -> JSONResponse:
+    return JSONResponse(
+        status_code=e.status_code,
+        content={"type": "error", "message": str(e)},
+        headers={"Retry-After": str(int(e.retry_after))}
+    )
+
+def request_thread_id(value):
+    """Return ``(thread_id, resumed)``: the client's thread id to continue a conversation, else a fresh one."""
+    if value is None:
+        return str(uuid.uuid4()), False
+    if not isinstance(value, str) or not value or len(value) > 128:
+        raise ValueError("thread_id must be a non-empty string of at most 128 characters")
+    return value, True
+
+def release_unless_resumed(thread_id: str, resumed: bool):
+    # A thread the client named may be continued later; it stays until it expires
+    if not resumed:
+        app.state.agent_orchestrator.release_thread(thread_id)
+
+def format_agent_response(response, thread_id: str = None) -> dict:
+    """Shape an orchestrator response into the ``{"type": "response"}`` payload sent to clients."""
+    video_urls = None
+    if isinstance(response, dict):
+        if "video_urls" in response:
+            video_urls = response["video_urls"]
+        elif isinstance(response.get("result"), dict) and "video_urls" in response["result"]:
+            video_urls = response["result"]["video_urls"]
+    
+    message_content = ""
+    if isinstance(response, dict):
+        if "intent" in response and response["intent"] == "youtube_search":
+            if isinstance(response.get("result"), dict):
+                message_content = response["result"].get("message", "")
+        elif isinstance(response.get("result"), dict):
+            if "message" in response["result"]:
+                message_content = response["result"]["message"]
+            elif "result" in response["result"]:
+                message_content = response["result"]["result"]
+            else:
+                message_content = str(response["result"])
+        else:
+            message_content = str(response.get("result", response))
+    else:
+        message_content = str(response)
+    
+    formatted = {
+        "type": "response",
+        "data": message_content,
+        "metadata": {}
+    }
+    
+    if video_urls:
+        formatted["video_urls"] = video_urls
+        formatted["metadata"]["content_type"] = "youtube_videos"
+        formatted["metadata"]["query"] = response.get("result", {}).get("query", "")
+        formatted["metadata"]["count"] = len(video_urls)
+    
+    if isinstance(response, dict) and response.get("videos"):
+        formatted["metadata"]["videos"] = response["videos"]
+    
+    if isinstance(response, dict) and "intent" in response:
+        formatted["metadata"]["intent"] = response["intent"]
+    
+    if isinstance(response, dict) and response.get("trace_id"):
+        formatted["metadata"]["trace_id"] = response["trace_id"]
+    
+    if thread_id:
+        formatted["metadata"]["thread_id"] = thread_id
+    
+    return formatted
+
+async def run_ws_command(send, data: dict, thread_id: str, route, turn=None):
+    """Process one routed WebSocket command and send its frames, tagged with the client's request id if any.
+    
+    ``turn`` is the command's place in the connection's agent turn order,
+    reserved when it was received; it is awaited before admission.
+    """
+    request_id = data.get("id")
+    tag = {"id": request_id} if request_id is not None else {}
+    command = data["command"]
+    
+    response = None
+    try:
+        if turn is not None:
+            await turn.wait()
+        async with admit_command(route):
+            if data.get("stream"):
+                # Drain and close the stream here, so its command span ends in this context and is not left current
+                async with aclosing(app.state.agent_orchestrator.stream_command(command, thread_id=thread_id, request=route)) as events:
+                    async for event in events:
+                        if event["type"] == "final":
+                            response = event["response"]
+                        else:
+                            await send({**event, **tag})
+            else:
+                response = await app.state.agent_orchestrator.process_command(command, thread_id=thread_id, request=route)
+        if response is None:
+            # A stream that ended without its final event has nothing to format
+            logger.error(f"WebSocket request {request_id} produced no response")
+            await send({"type": "error", "message": "Command produced no response", **tag})
+            return
+        logger.debug(f"Agent response: {response}")
+        
+        ws_response = format_agent_response(response, thread_id)
+        if ws_response.get("video_urls"):
+            logger.info(f"Including {len(ws_response['video_urls'])} video URLs in WebSocket response")
+        
+        logger.debug(f"Sending WebSocket response: {ws_response}")
+        
+        await send({**ws_response, **tag})
+    except AdmissionRejectedError as e:
+        await send({"type": "error", "message": str(e), "code": e.status_code, **tag})
+    except asyncio.CancelledError:
+        logger.info(f"WebSocket request {request_id} cancelled")
+        with suppress(Exception):
+            await send({"type": "cancelled", **tag})
+        raise
+    except Exception as e:
+        logger.error(f"Error processing message: {e}", exc_info=True)
+        await send({"type": "error", "message": str(e), **tag})
+    finally:
+        if turn is not None:
+            turn.release()
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     logger.info("Received WebSocket connection")
     await websocket.accept()
     
-    thread_id = str(uuid.uuid4())
-    logger.debug(f"Generated thread ID for connection: {thread_id}")
+    try:
+        thread_id, resumed = request_thread_id(websocket.query_params.get("thread_id"))
+    except ValueError as e:
+        await websocket.send_text(json.dumps({"type": "error", "message": str(e)}))
+        await websocket.close()
+        return
+    logger.debug(f"{'Resuming' if resumed else 'Generated'} thread ID for connection: {thread_id}")
+    
+    send_lock = asyncio.Lock()
+    in_flight = {}
+    agent_turns = TurnQueue()
+    
+    async def send(payload: dict):
+        async with send_lock:
+            await websocket.send_text(json.dumps(payload, default=str))
     
     try:
         while True:
             message = await websocket.receive_text()
             logger.debug(f"Received WebSocket message: {message}")
             
+            request_id = None
             try:
                 data = json.loads(message)
-                command = data.get("command")
-                
-                if not command:
-                    raise ValueError("Command is required")
-                
-                response = await app.state.agent_orchestrator.process_command(command, thread_id=thread_id)
-                logger.debug(f"Agent response: {response}")
-                
-                video_urls = None
-                if isinstance(response, dict):
-                    if "video_urls" in response:
-                        video_urls = response["video_urls"]
-                    elif isinstance(response.get("result"), dict) and "video_urls" in response["result"]:
-                        video_urls = response["result"]["video_urls"]
-                
-                message_content = ""
-                if isinstance(response, dict):
-                    if "intent" in response and response["intent"] == "youtube_search":
-                        if isinstance(response.get("result"), dict):
-                            message_content = response["result"].get("message", "")
-                    elif isinstance(response.get("result"), dict):
-                        if "message" in response["result"]:
-                            message_content = response["result"]["message"]
-                        elif "result" in response["result"]:
-                            message_content = response["result"]["result"]
-                        else:
-                            message_content = str(response["result"])
-                    else:
-                        message_content = str(response.get("result", response))
-                else:
-                    message_content = str(response)
+                request_id = data.get("id")
                 
-                ws_response = {
-                    "type": "response",
-                    "data": message_content
-                }
+                if data.get("type") == "cancel":
+                    task = in_flight.get(request_id)
+                    if not task:
+                        raise ValueError(f"No in-flight request with id {request_id}")
+                    task.cancel()
+                    continue
                 
-                ws_response["metadata"] = {}
+                if not data.get("command"):
+                    raise ValueError("Command is required")
                 
-                if video_urls:
-                    ws_response["video_urls"] = video_urls
-                    logger.info(f"Including {len(video_urls)} video URLs in WebSocket response")
-                    ws_response["metadata"]["content_type"] = "youtube_videos"
-                    ws_response["metadata"]["query"] = response.get("result", {}).get("query", "")
-                    ws_response["metadata"]["count"] = len(video_urls)
+                if request_id in in_flight:
+                    raise ValueError(f"Request id {request_id} is already in flight")
                 
-                if isinstance(response, dict) and "intent" in response:
-                    intent_type = response["intent"]
-                    ws_response["metadata"]["intent"] = intent_type
+                route = app.state.agent_orchestrator.route(data["command"], thread_id)
+                # Agent turns take their place in line on receipt, so admission cannot reorder them
+                turn = agent_turns.reserve() if route.routed is None else None
                 
-                logger.debug(f"Sending WebSocket response: {ws_response}")
+                # Untagged commands keep the original one-at-a-time behaviour
+                if request_id is None:
+                    await run_ws_command(send, data, thread_id, route, turn)
+                    continue
                 
-                await websocket.send_text(json.dumps(ws_response))
-                    
+                task = asyncio.create_task(run_ws_command(send, data, thread_id, route, turn))
+                in_flight[request_id] = task
+                task.add_done_callback(lambda _, rid=request_id: in_flight.pop(rid, None))
+                if turn is not None:
+                    # Also covers a task cancelled before it started running
+                    task.add_done_callback(lambda _, turn=turn: turn.release())
+            
             except json.JSONDecodeError:
                 logger.error("Invalid JSON format received")
-                await websocket.send_text(json.dumps({
+                await send({
                     "type": "error",
                     "message": "Invalid JSON format"
-                }))
+                })
             except ValueError as e:
                 logger.error(f"Validation error: {e}")
-                await websocket.send_text(json.dumps({
+                await send({
                     "type": "error",
-                    "message": str(e)
-                }))
+                    "message": str(e),
+                    **({"id": request_id} if request_id is not None else {})
+                })
             except Exception as e:
                 logger.error(f"Error processing message: {e}", exc_info=True)
-                await websocket.send_text(json.dumps({
+                await send({
                     "type": "error",
                     "message": str(e)
-                }))
-                
+                })
+    
     except Exception as e:
         logger.error(f"WebSocket error: {e}", exc_info=True)
     finally:
-        await websocket.close()
+        tasks = list(in_flight.values())
+        for task in tasks:
+            task.cancel()
+        try:
+            # Let cancelled commands unwind before their thread's memory is released
+            await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            release_unless_resumed(thread_id, resumed)
+            await websocket.close()
 
 @app.get("/health")
 async def health_check():
@@ -229,6 +431,7 @@ async def health_check():
     
     mcp_status = "running" if app.state.mcp_thread and app.state.mcp_thread.is_alive() else "stopped"
     mcp_client_status = "connected" if app.state.mcp_client and app.state.mcp_client.connected else "disconnected"
+    cascade = app.state.agent_orchestrator.browser_agent.cascade
     
     return {
         "status": "healthy",
@@ -242,16 +445,65 @@ async def health_check():
             },
             "agent_orchestrator": {
                 "status": "initialized",
-                "agents": ["BrowserAgent"]
+                "agents": ["BrowserAgent"],
+                "single_flight": app.state.agent_orchestrator.single_flight.stats(),
+                "fast_path": app.state.agent_orchestrator.fast_path.stats(),
+                "youtube_cache": youtube_cache.stats(),
+                "query_canonicalizer": youtube_search.query_canonicalizer.stats(),
+                "youtube_metadata": youtube_metadata.metadata_cache.stats() if youtube_metadata.enabled() else {"status": "disabled"},
+                "llm": llm_registry.stats(),
+                "memory": app.state.agent_orchestrator.browser_agent.memory.stats(),
+                "history": app.state.agent_orchestrator.browser_agent.history_policy.stats(),
+                "cascade": cascade.usage.stats() if cascade is not None else {"status": "disabled"}
             },
             "websocket": {
                 "status": "available",
                 "endpoint": "/ws"
-            }
+            },
+            "admission": app.state.admission.stats(),
+            "jobs": app.state.job_store.stats()
         },
         "version": "2.0.0"
     }
 
+@app.get("/metrics")
+async def metrics_endpoint():
+    # Rebuilt on every scrape, so a status, model or field that went away is not reported forever
+    for gauge in (ADMISSION_GAUGE, JOBS_GAUGE, SINGLE_FLIGHT_GAUGE, YOUTUBE_CACHE_GAUGE, MEMORY_GAUGE, LLM_GAUGE):
+        gauge.clear()
+    admission = app.state.admission.stats()
+    for field in ("active", "queue_depth", "wait_seconds_avg", "wait_seconds_max"):
+        ADMISSION_GAUGE.set(admission[field], field=field)
+    for status, count in app.state.job_store.stats().items():
+        JOBS_GAUGE.set(count, status=status)
+    SINGLE_FLIGHT_GAUGE.set(app.state.agent_orchestrator.single_flight.stats()["in_flight"], field="in_flight")
+    cache = youtube_cache.stats()
+    YOUTUBE_CACHE_GAUGE.set(cache["size"], field="size")
+    YOUTUBE_CACHE_GAUGE.set(cache["hit_rate"], field="hit_rate")
+    YOUTUBE_CACHE_GAUGE.set(youtube_search.query_canonicalizer.stats()["representatives"], field="canonical_representatives")
+    memory = app.state.agent_orchestrator.browser_agent.memory.stats()
+    MEMORY_GAUGE.set(memory["threads"], field="threads")
+    MEMORY_GAUGE.set(memory["bytes"], field="bytes")
+    for model, usage in llm_registry.stats()["models"].items():
+        LLM_GAUGE.set(usage["in_flight"], model=model, field="in_flight")
+        LLM_GAUGE.set(usage["waiting"], model=model, field="waiting")
+    
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/traces")
+async def traces_endpoint(limit: int = 50):
+    return {"traces": tracer.recent_traces(limit)}
+
+@app.get("/traces/{trace_id}")
+async def trace_endpoint(trace_id: str):
+    trace = tracer.get_trace(trace_id)
+    if not trace:
+        return JSONResponse(
+            status_code=404,
+            content={"type": "error", "message": f"Trace {trace_id} not found"}
+        )
+    return trace
+
 @app.post("/command")
 async def command_endpoint(request: Request):
     try:
@@ -262,58 +514,203 @@ async def command_endpoint(request: Request):
                 status_code=400,
                 content={"type": "error", "message": "Command is required"}
             )
+        
+        thread_id, resumed = request_thread_id(data.get("thread_id"))
+        try:
+            route = app.state.agent_orchestrator.route(command, thread_id)
+            async with admit_command(route):
+                response = await app.state.agent_orchestrator.process_command(command, thread_id=thread_id, request=route)
+        finally:
+            release_unless_resumed(thread_id, resumed)
+        
+        api_response = format_agent_response(response, thread_id)
+        
+        return JSONResponse(content=api_response)
+    
+    except AdmissionRejectedError as e:
+        return admission_rejected(e)
+    
+    except ValueError as e:
+        return JSONResponse(
+            status_code=400,
+            content={"type": "error", "message": str(e)}
+        )
+    
+    except Exception as e:
+        logger.error(f"Error in /command endpoint: {e}", exc_info=True)
+        return JSONResponse(
+            status_code=500,
+            content={"type": "error", "message": str(e)}
+        )
 
-        thread_id = str(uuid.uuid4())
-        response = await app.state.agent_orchestrator.process_command(command, thread_id=thread_id)
-
-        message_content = ""
-        video_urls = None
-        if isinstance(response, dict):
-            if "video_urls" in response:
-                video_urls = response["video_urls"]
-            elif isinstance(response.get("result"), dict) and "video_urls" in response["result"]:
-                video_urls = response["result"]["video_urls"]
-
-        if isinstance(response, dict):
-            if "intent" in response and response["intent"] == "youtube_search":
-                if isinstance(response.get("result"), dict):
-                    message_content = response["result"].get("message", "")
-            elif isinstance(response.get("result"), dict):
-                if "message" in response["result"]:
-                    message_content = response["result"]["message"]
-                elif "result" in response["result"]:
-                    message_content = response["result"]["result"]
-                else:
-                    message_content = str(response["result"])
-            else:
-                message_content = str(response.get("result", response))
-        else:
-            message_content = str(response)
-
-        api_response = {
-            "type": "response",
-            "data": message_content,
-            "metadata": {}
-        }
+async def run_batch_command(index: int, item, semaphore: asyncio.Semaphore) -> dict:
+    async with semaphore:
+        command = item.get("command") if isinstance(item, dict) else item
+        if not isinstance(command, str) or not command:
+            return {"index": index, "type": "error", "message": "Command is required"}
+        try:
+            thread_id, resumed = request_thread_id(item.get("thread_id") if isinstance(item, dict) else None)
+            try:
+                route = app.state.agent_orchestrator.route(command, thread_id)
+                async with admit_command(route):
+                    response = await app.state.agent_orchestrator.process_command(command, thread_id=thread_id, request=route)
+            finally:
+                release_unless_resumed(thread_id, resumed)
+            return {"index": index, **format_agent_response(response, thread_id)}
+        except AdmissionRejectedError as e:
+            return {"index": index, "type": "error", "message": str(e), "code": e.status_code}
+        except Exception as e:
+            logger.error(f"Error in batch command {index}: {e}", exc_info=True)
+            return {"index": index, "type": "error", "message": str(e)}
 
-        if video_urls:
-            api_response["video_urls"] = video_urls
-            api_response["metadata"]["content_type"] = "youtube_videos"
-            api_response["metadata"]["query"] = response.get("result", {}).get("query", "")
-            api_response["metadata"]["count"] = len(video_urls)
+@app.post("/commands")
+async def batch_command_endpoint(request: Request):
+    try:
+        data = await request.json()
+        commands = data.get("commands")
+        if not isinstance(commands, list) or not commands:
+            return JSONResponse(
+                status_code=400,
+                content={"type": "error", "message": "commands must be a non-empty list"}
+            )
+        if len(commands) > BATCH_MAX_COMMANDS:
+            return JSONResponse(
+                status_code=400,
+                content={"type": "error", "message": f"A batch may contain at most {BATCH_MAX_COMMANDS} commands"}
+            )
+        
+        concurrency = data.get("concurrency", BATCH_DEFAULT_CONCURRENCY)
+        if not isinstance(concurrency, int) or concurrency < 1:
+            return JSONResponse(
+                status_code=400,
+                content={"type": "error", "message": "concurrency must be a positive integer"}
+            )
+        concurrency = min(concurrency, BATCH_MAX_CONCURRENCY)
+        semaphore = asyncio.Semaphore(concurrency)
+        logger.info(f"Processing batch of {len(commands)} commands with concurrency {concurrency}")
+        
+        if data.get("stream"):
+            async def ndjson_results():
+                tasks = [asyncio.create_task(run_batch_command(i, c, semaphore)) for i, c in enumerate(commands)]
+                try:
+                    for next_result in asyncio.as_completed(tasks):
+                        yield json.dumps(await next_result, default=str) + "\n"
+                finally:
+                    for task in tasks:
+                        task.cancel()
+            
+            return StreamingResponse(ndjson_results(), media_type="application/x-ndjson")
+        
+        results = await asyncio.gather(*(run_batch_command(i, c, semaphore) for i, c in enumerate(commands)))
+        return JSONResponse(content={"type": "batch", "results": results})
+    
+    except Exception as e:
+        logger.error(f"Error in /commands endpoint: {e}", exc_info=True)
+        return JSONResponse(
+            status_code=500,
+            content={"type": "error", "message": str(e)}
+        )
 
-        if isinstance(response, dict) and "intent" in response:
-            api_response["metadata"]["intent"] = response["intent"]
+async def run_job(job, thread_id: str, resumed: bool):
+    try:
+        try:
+            route = app.state.agent_orchestrator.route(job.command, thread_id)
+            async with admit_command(route):
+                # Until admitted the job stays pending, so a job waiting in the admission queue is not reported as running
+                job.start()
+                response = await app.state.agent_orchestrator.process_command(job.command, thread_id=thread_id, request=route)
+        finally:
+            release_unless_resumed(thread_id, resumed)
+        job.complete(format_agent_response(response, thread_id))
+        logger.info(f"Job {job.id} completed")
+    except AdmissionRejectedError as e:
+        job.fail(str(e))
+    except asyncio.CancelledError:
+        job.mark_cancelled()
+        logger.info(f"Job {job.id} cancelled")
+        raise
+    except Exception as e:
+        logger.error(f"Job {job.id} failed: {e}", exc_info=True)
+        job.fail(str(e))
 
-        return JSONResponse(content=api_response)
+def job_not_found(job_id: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=404,
+        content={"type": "error", "message": f"Job {job_id} not found"}
+    )
 
+@app.post("/jobs")
+async def create_job_endpoint(request: Request):
+    try:
+        data = await request.json()
+        command = data.get("command")
+        if not command:
+            return JSONResponse(
+                status_code=400,
+                content={"type": "error", "message": "Command is required"}
+            )
+        
+        try:
+            thread_id, resumed = request_thread_id(data.get("thread_id"))
+        except ValueError as e:
+            return JSONResponse(
+                status_code=400,
+                content={"type": "error", "message": str(e)}
+            )
+        
+        try:
+            job = app.state.job_store.create(command)
+        except JobStoreFullError as e:
+            logger.warning(str(e))
+            return JSONResponse(
+                status_code=503,
+                content={"type": "error", "message": str(e)}
+            )
+        
+        job.task = asyncio.create_task(run_job(job, thread_id, resumed))
+        logger.info(f"Accepted job {job.id} for command: {command}")
+        
+        return JSONResponse(status_code=202, content={"type": "job", "job": job.to_dict()})
+    
     except Exception as e:
-        logger.error(f"Error in /command endpoint: {e}", exc_info=True)
+        logger.error(f"Error in /jobs endpoint: {e}", exc_info=True)
         return JSONResponse(
             status_code=500,
             content={"type": "error", "message": str(e)}
         )
 
+@app.get("/jobs/{job_id}")
+async def get_job_endpoint(job_id: str):
+    job = app.state.job_store.get(job_id)
+    if not job:
+        return job_not_found(job_id)
+    return {"type": "job", "job": job.to_dict()}
+
+@app.get("/jobs/{job_id}/events")
+async def job_events_endpoint(job_id: str):
+    """Server-sent events: the current job state now, then the final state when it finishes."""
+    job = app.state.job_store.get(job_id)
+    if not job:
+        return job_not_found(job_id)
+    
+    async def job_events():
+        yield f"event: status\ndata: {json.dumps(job.to_dict(), default=str)}\n\n"
+        while not await job.wait(timeout=15):
+            yield ": keep-alive\n\n"
+        yield f"event: status\ndata: {json.dumps(job.to_dict(), default=str)}\n\n"
+    
+    return StreamingResponse(job_events(), media_type="text/event-stream")
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job_endpoint(job_id: str):
+    job = app.state.job_store.get(job_id)
+    if not job:
+        return job_not_found(job_id)
+    if job.task and not job.task.done():
+        job.task.cancel()
+        await job.wait(timeout=5)
+    return {"type": "job", "job": job.to_dict()}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
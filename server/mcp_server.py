@@ -1,5 +1,12 @@
 import logging
+from config import (
+    TRACING_ENABLED, TRACE_FILE,
+    YOUTUBE_CACHE_MAX_ENTRIES, YOUTUBE_CACHE_TTL, YOUTUBE_CACHE_STALE, YOUTUBE_CACHE_FILE,
+    YOUTUBE_SEARCH_WORKERS, YOUTUBE_SEARCH_TIMEOUT, YOUTUBE_QUERY_CANONICALIZE, YOUTUBE_QUERY_SIMILARITY
+)
+from core.tracing import tracer
 from layers.mcp_connector import MCPConnector
+from layers.external_services import youtube_cache, youtube_search
 
 logging.basicConfig(
     level=logging.INFO,
@@ -11,7 +18,26 @@ logging.basicConfig(
 )
 logger = logging.getLogger("mcp_server")
 
+tracer.configure(enabled=TRACING_ENABLED, file_path=TRACE_FILE, service_name="alris-mcp-server")
+# Pointing ALRIS_YOUTUBE_CACHE_FILE at the API server's file lets this process start with its results
+youtube_cache.configure(
+    max_entries=YOUTUBE_CACHE_MAX_ENTRIES,
+    ttl_seconds=YOUTUBE_CACHE_TTL,
+    stale_seconds=YOUTUBE_CACHE_STALE,
+    persist_path=YOUTUBE_CACHE_FILE
+)
+youtube_search.configure(
+    max_workers=YOUTUBE_SEARCH_WORKERS,
+    timeout=YOUTUBE_SEARCH_TIMEOUT,
+    canonicalize=YOUTUBE_QUERY_CANONICALIZE,
+    similarity_threshold=YOUTUBE_QUERY_SIMILARITY
+)
+
 if __name__ == "__main__":
     logger.info("Starting standalone MCP server")
     mcp_connector = MCPConnector()
-    mcp_connector.run()
+    try:
+        mcp_connector.run()
+    finally:
+        youtube_search.shutdown()
+        youtube_cache.flush()
@@ -0,0 +1,7 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The Gemini client is created at import time but never called in tests
+os.environ.setdefault("GOOGLE_API_KEY", "test")
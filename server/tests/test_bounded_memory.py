@@ -0,0 +1,98 @@
+import asyncio
+import time
+from typing import Annotated, TypedDict
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.message import add_messages
+
+from layers.langchain_agent.bounded_memory import BoundedMemorySaver
+
+class State(TypedDict):
+    messages: Annotated[list, add_messages]
+
+def build(saver):
+    graph = StateGraph(State)
+    graph.add_node("reply", lambda state: {"messages": [AIMessage(f"reply {len(state['messages'])}")]})
+    graph.add_edge(START, "reply")
+    graph.add_edge("reply", END)
+    return graph.compile(checkpointer=saver)
+
+def turn(app, thread_id, text="hello"):
+    asyncio.run(app.ainvoke({"messages": [HumanMessage(text)]}, {"configurable": {"thread_id": thread_id}}))
+
+def stored_bytes(saver):
+    return (
+        sum(len(checkpoint[1]) + len(metadata[1])
+            for namespaces in saver.storage.values() for checkpoints in namespaces.values()
+            for checkpoint, metadata, _ in checkpoints.values())
+        + sum(len(blob[1]) for blob in saver.blobs.values())
+        + sum(len(write[2][1]) for writes in saver.writes.values() for write in writes.values())
+    )
+
+def test_byte_count_matches_what_is_stored():
+    saver = BoundedMemorySaver(max_threads=0, max_bytes=0)
+    app = build(saver)
+    for index in range(5):
+        turn(app, "a", f"message {index}")
+    turn(app, "b")
+    assert saver.stats()["bytes"] == stored_bytes(saver)
+    
+    saver.delete_thread("a")
+    assert saver.stats()["bytes"] == stored_bytes(saver)
+
+def test_checkpoints_are_not_serialized_again():
+    saver = BoundedMemorySaver()
+    app = build(saver)
+    dumps_typed = saver.serde.dumps_typed
+    serialized = []
+    
+    def recording(value):
+        serialized.append(value)
+        return dumps_typed(value)
+    
+    saver.serde.dumps_typed = recording
+    turn(app, "a")
+    # Only MemorySaver itself serializes: one checkpoint per step, never the full state again
+    full_states = [value for value in serialized if isinstance(value, dict) and "channel_values" in value]
+    assert full_states == []
+
+def test_idle_threads_expire():
+    saver = BoundedMemorySaver(ttl_seconds=60, sweep_interval=0)
+    app = build(saver)
+    turn(app, "old")
+    turn(app, "recent")
+    
+    assert saver.sweep(time.monotonic() + 30) == 0
+    saver._threads["old"][0] -= 120
+    assert saver.sweep() == 1
+    assert saver.stats()["threads"] == 1 and saver.evictions["ttl"] == 1
+    assert "old" not in saver.storage and "recent" in saver.storage
+    assert saver.stats()["bytes"] == stored_bytes(saver)
+
+def test_least_recently_used_threads_are_dropped_over_capacity():
+    saver = BoundedMemorySaver(max_threads=2)
+    app = build(saver)
+    for thread_id in ("a", "b", "a", "c"):
+        turn(app, thread_id)
+    assert list(saver.storage) == ["a", "c"]
+    assert saver.evictions["capacity"] == 1
+    
+    # A byte cap below two threads keeps only the most recent one
+    capped = BoundedMemorySaver(max_threads=0)
+    app = build(capped)
+    turn(app, "a")
+    capped.max_bytes = capped.stats()["bytes"] * 3 // 2
+    turn(app, "b")
+    assert list(capped.storage) == ["b"]
+    assert capped.stats()["bytes"] == stored_bytes(capped)
+
+def test_released_threads_are_dropped():
+    saver = BoundedMemorySaver()
+    app = build(saver)
+    turn(app, "a")
+    saver.release("a")
+    saver.release("unknown")
+    assert saver.stats()["threads"] == 0 and saver.stats()["bytes"] == 0
+    assert saver.evictions["released"] == 1
+    assert app.get_state({"configurable": {"thread_id": "a"}}).values == {}
@@ -0,0 +1,48 @@
+import asyncio
+
+from core.metrics import STAGE_CALLS
+from core.tracing import tracer
+from layers.langchain_agent import AgentOrchestrator
+from layers.langchain_agent.fast_path_router import FastPathHandler
+
+class FakeClassifier:
+    def predict(self, commands):
+        return [("calendar", 0.95) for _ in commands]
+
+async def handle_weather(request, matched):
+    return {"intent": "weather", "command": request.command, "result": matched}
+
+def test_classify_command_follows_registered_fast_paths():
+    orchestrator = AgentOrchestrator()
+    handler = orchestrator.fast_path.register(FastPathHandler(
+        "weather",
+        match=lambda request: "weather" in request.command and "sunny",
+        handle=handle_weather,
+        priority=200
+    ))
+    
+    route = orchestrator.route("weather in youtube.com/watch?v=abc")
+    assert orchestrator.classify_command(route) == "weather"
+    response = asyncio.run(orchestrator.process_command(route.command, request=route))
+    assert response["result"] == "sunny"
+    assert handler.evaluations == 1
+    
+    assert orchestrator.classify_command("search youtube for lofi") == "youtube_search"
+    assert orchestrator.classify_command("what is the capital of France?") == "general"
+
+def test_classifier_routes_are_classified_by_the_predicted_intent():
+    orchestrator = AgentOrchestrator(intent_classifier=FakeClassifier())
+    assert orchestrator.classify_command("tell me about my day tomorrow") == "calendar"
+
+def test_routing_is_measured_once_and_traced_under_the_command():
+    tracer.configure(enabled=True)
+    orchestrator = AgentOrchestrator()
+    orchestrator.fast_path.register(FastPathHandler("weather", match=lambda request: "weather" in request.command, handle=handle_weather))
+    calls = STAGE_CALLS._values.get(("intent_detection", "ok"), 0)
+    
+    route = orchestrator.route("weather today")
+    response = asyncio.run(orchestrator.process_command(route.command, request=route))
+    
+    assert STAGE_CALLS._values[("intent_detection", "ok")] == calls + 1
+    spans = tracer.get_trace(response["trace_id"])["spans"]
+    assert [child["name"] for child in spans[0]["children"]] == ["intent_detection"]
@@ -0,0 +1,79 @@
+import asyncio
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from layers.langchain_agent.history_policy import HistoryPolicy, split_turns
+
+def conversation(count, tool_output="result"):
+    messages = []
+    for index in range(count):
+        messages += [
+            HumanMessage(content=f"question {index}"),
+            AIMessage(content="", tool_calls=[{"name": "search", "args": {}, "id": f"call-{index}"}]),
+            ToolMessage(content=tool_output, tool_call_id=f"call-{index}", name="search"),
+            AIMessage(content=f"answer {index}")
+        ]
+    return messages
+
+def questions(messages):
+    return [message.content for message in messages if isinstance(message, HumanMessage)]
+
+def test_window_keeps_the_most_recent_turns():
+    policy = HistoryPolicy(max_turns=3, max_tokens=0)
+    assert policy._window(split_turns(conversation(5))) == 2
+    assert policy._window(split_turns(conversation(2))) == 0
+
+def test_window_drops_turns_over_the_token_budget_but_keeps_the_current_one():
+    policy = HistoryPolicy(max_turns=0, max_tokens=100)
+    turns = split_turns(conversation(3, tool_output="x" * 1000))
+    assert policy._window(turns) == 2
+
+def test_truncate_cuts_earlier_tool_outputs_only():
+    policy = HistoryPolicy(max_tool_chars=10)
+    messages = policy._truncate(split_turns(conversation(2, tool_output="y" * 50)))
+    earlier, current = [message for message in messages if isinstance(message, ToolMessage)]
+    assert earlier.content == "y" * 10 + "... [40 characters truncated]"
+    assert earlier.tool_call_id == "call-0"
+    assert current.content == "y" * 50
+
+def test_summary_is_extended_once_per_summary_every_dropped_turns():
+    policy = HistoryPolicy(max_turns=2, max_tokens=0, summary_every=3)
+    prompts = []
+    
+    async def summarizer(prompt):
+        prompts.append(prompt)
+        return f"synopsis {len(prompts)}"
+    
+    async def scenario():
+        return [await policy.acompact(conversation(count), "system", "thread", summarizer) for count in range(1, 11)]
+    
+    results = asyncio.run(scenario())
+    # 10 turns with 2 kept verbatim drop 8; summarized at 3 and 6 dropped turns only
+    assert len(prompts) == 2
+    # The second call only sends the newly dropped turns along with the previous synopsis
+    assert "question 2" not in prompts[1] and "question 5" in prompts[1]
+    assert "synopsis 1" in prompts[1]
+    
+    # Turns dropped since the last synopsis are replayed verbatim instead of being lost
+    fourth = results[3]
+    assert fourth[0].content == "system"
+    assert questions(fourth) == ["question 0", "question 1", "question 2", "question 3"]
+    assert questions(results[6]) == ["question 3", "question 4", "question 5", "question 6"]
+    last = results[-1]
+    assert last[0].content.endswith("synopsis 2")
+    assert questions(last) == ["question 6", "question 7", "question 8", "question 9"]
+    
+    # The synchronous path reuses the cached synopsis without calling the model
+    assert policy.compact(conversation(10), "system", "thread") == last
+    policy.forget("thread")
+    assert questions(policy.compact(conversation(10), "system", "thread")) == questions(last)[-2:]
+
+def test_failed_summary_keeps_the_turns_verbatim():
+    policy = HistoryPolicy(max_turns=1, max_tokens=0, summary_every=1)
+    
+    async def summarizer(prompt):
+        raise RuntimeError("model unavailable")
+    
+    messages = asyncio.run(policy.acompact(conversation(3), "system", "thread", summarizer))
+    assert isinstance(messages[0], SystemMessage) and messages[0].content == "system"
+    assert questions(messages) == ["question 0", "question 1", "question 2"]
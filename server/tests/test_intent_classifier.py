@@ -0,0 +1,37 @@
+import json
+import os
+import random
+
+from layers.langchain_agent import AgentOrchestrator
+from layers.langchain_agent.intent_classifier import IntentClassifier, load_corpus
+
+CORPUS = os.path.join(os.path.dirname(__file__), "..", "config", "intent_corpus.jsonl")
+
+def test_corpus_is_plain_jsonl():
+    with open(CORPUS, encoding="utf-8") as f:
+        examples = [json.loads(line) for line in f if line.strip()]
+    assert {example["intent"] for example in examples} == {"youtube_search", "calendar", "agent"}
+
+def test_held_out_accuracy():
+    # The same split train_intent_classifier.py reports on
+    examples = list(zip(*load_corpus(CORPUS)))
+    random.Random(0).shuffle(examples)
+    split = int(len(examples) * 0.8)
+    train, held_out = examples[:split], examples[split:]
+    
+    classifier = IntentClassifier(sorted({label for _, label in examples}))
+    classifier.fit([text for text, _ in train], [label for _, label in train])
+    result = classifier.evaluate([text for text, _ in held_out], [label for _, label in held_out])
+    assert result["examples"] == len(held_out)
+    assert result["accuracy"] >= 0.8
+
+def test_predictions_below_the_threshold_go_to_the_agent():
+    texts, labels = load_corpus(CORPUS)
+    classifier = IntentClassifier(sorted(set(labels))).fit(texts, labels)
+    command = "put on something relaxing"
+    (intent, confidence), = classifier.predict([command])
+    assert intent == "youtube_search" and confidence < 0.8
+    
+    assert AgentOrchestrator(intent_classifier=classifier, classifier_threshold=0.8).classify_command(command) == "general"
+    lowered = AgentOrchestrator(intent_classifier=classifier, classifier_threshold=confidence - 0.01)
+    assert lowered.classify_command(command) == "youtube_search"
@@ -0,0 +1,29 @@
+import asyncio
+
+import main
+from core import AdmissionController, Job
+from layers.langchain_agent.fast_path_router import RouteRequest
+
+class EchoOrchestrator:
+    def route(self, command, thread_id=None):
+        return RouteRequest(command, thread_id)
+    
+    def classify_command(self, request):
+        return "general"
+    
+    async def process_command(self, command, thread_id=None, request=None):
+        return {"intent": "general", "command": command, "result": "done"}
+
+def test_job_waiting_for_admission_is_pending_not_running():
+    async def scenario():
+        main.app.state.agent_orchestrator = EchoOrchestrator()
+        admission = main.app.state.admission = AdmissionController(max_concurrent=1, max_queue=4, queue_timeout=5)
+        job = Job("queued command")
+        async with admission.admit("general"):
+            task = asyncio.create_task(main.run_job(job, "thread", True))
+            await asyncio.sleep(0.01)
+            status_while_queued = job.status
+        await task
+        return status_while_queued, job.status
+    
+    assert asyncio.run(scenario()) == ("pending", "completed")
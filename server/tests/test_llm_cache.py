@@ -0,0 +1,48 @@
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from layers.langchain_agent.llm_cache import SQLiteLLMCache
+
+def model(cache, *responses):
+    return FakeListChatModel(responses=list(responses), cache=cache)
+
+def test_repeated_single_turn_prompt_is_served_from_the_cache(tmp_path):
+    cache = SQLiteLLMCache(str(tmp_path / "llm.db"))
+    llm = model(cache, "I am Alris", "something else")
+    prompt = [SystemMessage("You are Alris"), HumanMessage("who are you?")]
+    
+    assert llm.invoke(prompt).content == "I am Alris"
+    assert llm.invoke(prompt).content == "I am Alris"
+    assert (cache.hits, cache.misses) == (1, 1)
+    
+    # A different system prompt is a different key
+    assert llm.invoke([SystemMessage("You are terse"), HumanMessage("who are you?")]).content == "something else"
+
+def test_prompts_with_history_bypass_the_cache(tmp_path):
+    cache = SQLiteLLMCache(str(tmp_path / "llm.db"))
+    llm = model(cache, "first", "second", "third", "fourth")
+    with_reply = [HumanMessage("hi"), AIMessage("hello"), HumanMessage("who are you?")]
+    with_tool = [
+        HumanMessage("find lofi"),
+        AIMessage("", tool_calls=[{"name": "search", "args": {}, "id": "call-1"}]),
+        ToolMessage("https://youtu.be/aaaaaaaaaaa", tool_call_id="call-1")
+    ]
+    
+    assert [llm.invoke(with_reply).content, llm.invoke(with_reply).content] == ["first", "second"]
+    assert [llm.invoke(with_tool).content, llm.invoke(with_tool).content] == ["third", "fourth"]
+    assert cache.bypassed == 4
+    assert cache.stats()["entries"] == 0
+
+def test_expired_responses_are_fetched_again(tmp_path):
+    cache = SQLiteLLMCache(str(tmp_path / "llm.db"), ttl_seconds=60)
+    llm = model(cache, "old answer", "new answer")
+    prompt = [HumanMessage("what's new?")]
+    
+    assert llm.invoke(prompt).content == "old answer"
+    cache._conn.execute("UPDATE llm_responses SET created_at = created_at - 61")
+    cache._conn.commit()
+    
+    assert llm.invoke(prompt).content == "new answer"
+    assert cache.expirations == 1
+    assert llm.invoke(prompt).content == "new answer"
+    assert cache.hits == 1
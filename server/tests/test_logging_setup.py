@@ -0,0 +1,24 @@
+import logging
+import logging.handlers
+
+from core.logging_setup import configure_logging, shutdown_logging
+
+def test_shutdown_detaches_the_queue_and_keeps_logging(capsys):
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    try:
+        configure_logging(level=logging.INFO, async_mode=True, truncate_limits={"*": 10})
+        logging.getLogger("core.test").info("before shutdown")
+        shutdown_logging()
+        logging.getLogger("core.test").info("after shutdown, still written")
+        
+        assert not any(isinstance(handler, logging.handlers.QueueHandler) for handler in root.handlers)
+        output = capsys.readouterr().err
+        assert "before shu" in output
+        assert "after shut... [truncated" in output
+    finally:
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        for handler in saved_handlers:
+            root.addHandler(handler)
+        root.setLevel(saved_level)
@@ -0,0 +1,47 @@
+import asyncio
+
+from layers.mcp_connector import mcp_server
+from layers.mcp_connector.mcp_server import MCPConnector
+
+class FakeBrowser:
+    def __init__(self):
+        self.actions = []
+    
+    async def navigate(self, url):
+        self.actions.append(("navigate", url))
+        return True
+    
+    async def click_element(self, selector):
+        self.actions.append(("click", selector))
+        return True
+
+def search(monkeypatch, lookup):
+    monkeypatch.setattr(mcp_server, "cached_youtube_search", lookup)
+    connector = MCPConnector()
+    connector.browser_service = FakeBrowser()
+    tool = connector.mcp._tool_manager.get_tool("search_youtube").fn
+    return asyncio.run(tool({"search_query": "lofi beats"})), connector.browser_service.actions
+
+def test_found_video_is_opened_without_the_results_page(monkeypatch):
+    calls = []
+    
+    async def lookup(query):
+        calls.append(query)
+        return ["/watch?v=aaaaaaaaaaa&pp=1", "/watch?v=bbbbbbbbbbb"]
+    
+    result, actions = search(monkeypatch, lookup)
+    assert calls == ["lofi beats"]
+    assert actions == [("navigate", "https://www.youtube.com/watch?v=aaaaaaaaaaa")]
+    assert result["status"] == "success"
+    assert result["video_urls"] == ["https://www.youtube.com/watch?v=aaaaaaaaaaa", "https://www.youtube.com/watch?v=bbbbbbbbbbb"]
+
+def test_failed_lookup_falls_back_to_the_results_page(monkeypatch):
+    async def lookup(query):
+        raise TimeoutError("search timed out")
+    
+    result, actions = search(monkeypatch, lookup)
+    assert actions == [
+        ("navigate", "https://www.youtube.com/results?search_query=lofi+beats"),
+        ("click", "a#video-title")
+    ]
+    assert result["status"] == "success" and result["video_urls"] == []
@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+import main
+from core import AdmissionController
+from core.result_cache import ResultCache
+from layers.langchain_agent.single_flight import SingleFlight
+
+class FakeJobStore:
+    def __init__(self, counts):
+        self.counts = counts
+    
+    def stats(self):
+        return dict(self.counts)
+
+def scrape(job_counts):
+    memory = SimpleNamespace(stats=lambda: {"threads": 0, "bytes": 0})
+    main.app.state.agent_orchestrator = SimpleNamespace(single_flight=SingleFlight(), browser_agent=SimpleNamespace(memory=memory))
+    main.app.state.admission = AdmissionController(max_concurrent=4, max_queue=4, queue_timeout=1)
+    main.app.state.job_store = FakeJobStore(job_counts)
+    return TestClient(main.app).get("/metrics").text
+
+def test_gauges_drop_series_that_are_no_longer_reported():
+    assert 'alris_jobs{status="running"} 1' in scrape({"running": 1})
+    assert 'alris_jobs{status="running"}' not in scrape({"completed": 1})
+
+def test_monotonic_totals_are_counters():
+    cache = ResultCache("metrics_test")
+    cache.set("a", 1)
+    cache.get_many(["a", "b"])
+    
+    text = scrape({})
+    assert "# TYPE alris_result_cache_total counter" in text
+    assert 'alris_result_cache_total{cache="metrics_test",event="hit"} 1' in text
+    assert 'alris_result_cache_total{cache="metrics_test",event="miss"} 1' in text
+    assert 'field="admitted"' not in text
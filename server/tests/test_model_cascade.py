@@ -0,0 +1,32 @@
+from langchain_core.messages import AIMessage
+
+from layers.langchain_agent.model_cascade import escalation_reason
+
+TOOLS = ("youtube_search", "navigate")
+
+def reply(content="", finish_reason="STOP", **kwargs):
+    return AIMessage(content=content, response_metadata={"finish_reason": finish_reason}, **kwargs)
+
+def test_unknown_tool_is_a_bad_tool_plan():
+    message = reply(tool_calls=[{"name": "delete_everything", "args": {}, "id": "call-1"}])
+    assert escalation_reason(message, TOOLS) == "tool_plan"
+
+def test_unparseable_tool_call_is_a_bad_tool_plan():
+    message = reply(invalid_tool_calls=[{"name": "navigate", "args": "{url:", "id": "call-1", "error": "bad json"}])
+    assert escalation_reason(message, TOOLS) == "tool_plan"
+    assert escalation_reason(reply(finish_reason="MALFORMED_FUNCTION_CALL"), TOOLS) == "tool_plan"
+
+def test_failed_finish_reason_escalates():
+    assert escalation_reason(reply("The first part of the answer", finish_reason="MAX_TOKENS"), TOOLS) == "validation"
+    assert escalation_reason(reply("Sure", finish_reason="FinishReason.SAFETY"), TOOLS) == "validation"
+
+def test_empty_text_escalates():
+    assert escalation_reason(reply("   "), TOOLS) == "validation"
+
+def test_low_confidence_phrase_escalates():
+    assert escalation_reason(reply("Sorry, I'm not sure which video you mean."), TOOLS) == "low_confidence"
+
+def test_confident_reply_is_kept():
+    assert escalation_reason(reply("Opening the lofi playlist on YouTube now."), TOOLS) is None
+    planned = reply(tool_calls=[{"name": "youtube_search", "args": {"query": "lofi"}, "id": "call-1"}])
+    assert escalation_reason(planned, TOOLS) is None
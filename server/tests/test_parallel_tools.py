@@ -0,0 +1,64 @@
+import asyncio
+import time
+
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.tools import StructuredTool
+from langgraph.types import Command
+
+from layers.langchain_agent.parallel_tools import ParallelToolNode
+
+events = []
+
+async def slow_search(query: str) -> str:
+    await asyncio.sleep(0.2)
+    return f"results for {query}"
+
+async def navigate(url: str) -> str:
+    events.append(f"start {url}")
+    await asyncio.sleep(0.05)
+    events.append(f"end {url}")
+    return f"opened {url}"
+
+async def handoff(target: str) -> Command:
+    # Answers the second call of the reply in test_command_results_pass_through
+    return Command(update={"messages": [ToolMessage(f"handed to {target}", tool_call_id="1")]})
+
+TOOLS = [
+    StructuredTool.from_function(coroutine=slow_search, name="search", description="search"),
+    StructuredTool.from_function(coroutine=navigate, name="navigate", description="navigate"),
+    StructuredTool.from_function(coroutine=handoff, name="handoff", description="handoff")
+]
+
+def reply(*calls):
+    return {"messages": [AIMessage("", tool_calls=[
+        {"name": name, "args": args, "id": str(index)} for index, (name, args) in enumerate(calls)
+    ])]}
+
+def run(node, state):
+    started = time.perf_counter()
+    result = asyncio.run(node.ainvoke(state))
+    return result, time.perf_counter() - started
+
+def test_independent_calls_run_concurrently_in_call_order():
+    node = ParallelToolNode(TOOLS, max_concurrency=4)
+    result, elapsed = run(node, reply(("search", {"query": "a"}), ("search", {"query": "b"}), ("search", {"query": "c"})))
+    assert [message.content for message in result["messages"]] == ["results for a", "results for b", "results for c"]
+    assert elapsed < 0.45
+
+def test_concurrency_limit_applies_per_reply():
+    node = ParallelToolNode(TOOLS, max_concurrency=1)
+    _, elapsed = run(node, reply(("search", {"query": "a"}), ("search", {"query": "b"})))
+    assert elapsed >= 0.4
+
+def test_exclusive_calls_keep_planned_order():
+    events.clear()
+    node = ParallelToolNode(TOOLS, max_concurrency=4, exclusive=["navigate"])
+    result, _ = run(node, reply(("navigate", {"url": "one"}), ("search", {"query": "a"}), ("navigate", {"url": "two"})))
+    assert events == ["start one", "end one", "start two", "end two"]
+    assert [message.tool_call_id for message in result["messages"]] == ["0", "1", "2"]
+
+def test_command_results_pass_through():
+    node = ParallelToolNode(TOOLS)
+    result, _ = run(node, reply(("search", {"query": "a"}), ("handoff", {"target": "b"})))
+    assert isinstance(result[1], Command)
+    assert result[0]["messages"][0].content == "results for a"
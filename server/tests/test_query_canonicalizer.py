@@ -0,0 +1,47 @@
+from layers.external_services.query_canonicalizer import QueryCanonicalizer, content_tokens, signature
+
+def test_symbols_keep_languages_apart():
+    assert len({signature("c++ tutorial"), signature("c# tutorial"), signature("c tutorial")}) == 3
+
+def test_symbol_tokens_never_near_match():
+    canonicalizer = QueryCanonicalizer()
+    first = canonicalizer.resolve("c++ tutorial for beginners")
+    assert canonicalizer.resolve("c# tutorial for beginners") != first
+    assert canonicalizer.resolve("c tutorial for beginners") != first
+
+def test_meaningful_words_are_kept():
+    assert sorted(content_tokens("up and down dance")) == ["and", "dance", "down", "up"]
+
+def test_plurals_are_not_folded():
+    assert content_tokens("world news") == ["world", "news"]
+    assert signature("cat") != signature("cats")
+
+def test_filler_is_removed():
+    assert signature("search for lofi beats videos please") == signature("lofi beats")
+    assert signature("video lofi beats") == signature("lofi beats")
+
+def test_version_numbers_stay_distinct():
+    canonicalizer = QueryCanonicalizer()
+    first = canonicalizer.resolve("python 3.10 release notes")
+    assert canonicalizer.resolve("python 3.1 release notes") != first
+
+def test_rephrasings_share_a_key():
+    canonicalizer = QueryCanonicalizer()
+    first = canonicalizer.resolve("react hooks")
+    assert canonicalizer.resolve("hooks react videos please") == first
+    assert canonicalizer.resolve("search for react hooks") == first
+
+def test_one_differing_word_keeps_queries_apart_by_default():
+    canonicalizer = QueryCanonicalizer()
+    for first, second in (
+        ("best pizza in new jersey", "best pizza in new york"),
+        ("how to cook rice in rice cooker", "how to cook rice in microwave"),
+        ("beginner yoga evening routine", "beginner yoga morning routine")
+    ):
+        assert canonicalizer.resolve(second) != canonicalizer.resolve(first)
+        assert canonicalizer.resolve(first) != canonicalizer.resolve(second)
+
+def test_lower_threshold_merges_near_duplicates():
+    canonicalizer = QueryCanonicalizer(threshold=0.6)
+    first = canonicalizer.resolve("react hooks")
+    assert canonicalizer.resolve("videos on react hooks") == first
@@ -0,0 +1,26 @@
+import time
+import asyncio
+
+from core.result_cache import ResultCache
+
+def test_stale_refresh_task_is_held_until_it_finishes():
+    async def scenario():
+        cache = ResultCache("refresh_test", ttl_seconds=10, stale_seconds=60)
+        cache.set("key", "old", stored_at=time.time() - 20)
+        release = asyncio.Event()
+        
+        async def fetch():
+            await release.wait()
+            return "new"
+        
+        assert await cache.get_or_fetch("key", fetch) == "old"
+        assert len(cache._refresh_tasks) == 1
+        release.set()
+        await asyncio.gather(*cache._refresh_tasks)
+        await asyncio.sleep(0)
+        return cache
+    
+    cache = asyncio.run(scenario())
+    assert not cache._refresh_tasks
+    assert cache.get("key")[0] == "new"
+    assert cache.refreshes == 1
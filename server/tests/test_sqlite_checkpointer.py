@@ -0,0 +1,84 @@
+import asyncio
+import sqlite3
+import threading
+from typing import Annotated, TypedDict
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.message import add_messages
+
+from layers.langchain_agent.sqlite_checkpointer import SQLiteCheckpointSaver
+
+class State(TypedDict):
+    messages: Annotated[list, add_messages]
+
+def build(saver):
+    graph = StateGraph(State)
+    graph.add_node("reply", lambda state: {"messages": [AIMessage(f"reply {len(state['messages'])}")]})
+    graph.add_edge(START, "reply")
+    graph.add_edge("reply", END)
+    return graph.compile(checkpointer=saver)
+
+async def turn(app, saver, thread_id, text):
+    await app.ainvoke({"messages": [HumanMessage(text)]}, {"configurable": {"thread_id": thread_id}})
+    await saver.aflush()
+
+def test_released_thread_can_be_resumed_by_another_saver(tmp_path):
+    path = str(tmp_path / "checkpoints.db")
+    first = SQLiteCheckpointSaver(path)
+    asyncio.run(turn(build(first), first, "client-thread", "hello"))
+    first.release("client-thread")
+    first.close()
+    
+    second = SQLiteCheckpointSaver(path)
+    app = build(second)
+    asyncio.run(turn(app, second, "client-thread", "again"))
+    messages = app.get_state({"configurable": {"thread_id": "client-thread"}}).values["messages"]
+    assert [message.content for message in messages] == ["hello", "reply 1", "again", "reply 3"]
+
+def test_database_work_stays_off_the_event_loop(tmp_path):
+    saver = SQLiteCheckpointSaver(str(tmp_path / "checkpoints.db"), max_batch=1)
+    flush_threads = []
+    flush = saver.flush
+    
+    def recording_flush():
+        flush_threads.append(threading.get_ident())
+        flush()
+    
+    saver.flush = recording_flush
+    app = build(saver)
+    
+    async def run():
+        await turn(app, saver, "t", "hello")
+        return threading.get_ident()
+    
+    loop_thread = asyncio.run(run())
+    assert flush_threads
+    assert loop_thread not in flush_threads
+    assert saver.stats()["pending_rows"] == 0
+
+def test_failed_flush_keeps_the_rows_buffered(tmp_path):
+    path = str(tmp_path / "checkpoints.db")
+    saver = SQLiteCheckpointSaver(path, busy_timeout=0.05)
+    app = build(saver)
+    asyncio.run(app.ainvoke({"messages": [HumanMessage("hello")]}, {"configurable": {"thread_id": "t"}}))
+    pending = saver.stats()["pending_rows"]
+    assert pending
+    
+    # Another worker holds the write lock past the busy timeout
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    try:
+        with pytest.raises(sqlite3.OperationalError):
+            saver.flush()
+    finally:
+        other.execute("ROLLBACK")
+        other.close()
+    assert saver.stats()["pending_rows"] == pending
+    
+    saver.flush()
+    assert saver.stats()["pending_rows"] == 0
+    reader = SQLiteCheckpointSaver(path)
+    messages = build(reader).get_state({"configurable": {"thread_id": "t"}}).values["messages"]
+    assert [message.content for message in messages] == ["hello", "reply 1"]
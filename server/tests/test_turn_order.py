@@ -0,0 +1,36 @@
+import asyncio
+
+from core import TurnQueue
+
+async def run_in_turn(turn, name, delay, log):
+    try:
+        await turn.wait()
+        log.append(f"{name} start")
+        await asyncio.sleep(delay)
+        log.append(f"{name} end")
+    finally:
+        turn.release()
+
+def test_turns_run_in_reservation_order_whatever_order_they_start_in():
+    async def scenario():
+        queue, log = TurnQueue(), []
+        turns = [queue.reserve() for _ in range(3)]
+        # Started in reverse, as admission or scheduling might
+        await asyncio.gather(*(run_in_turn(turns[i], str(i), 0.01, log) for i in (2, 1, 0)))
+        return log
+    
+    assert asyncio.run(scenario()) == ["0 start", "0 end", "1 start", "1 end", "2 start", "2 end"]
+
+def test_cancelled_turn_does_not_let_later_turns_jump_the_line():
+    async def scenario():
+        queue, log = TurnQueue(), []
+        first, second, third = queue.reserve(), queue.reserve(), queue.reserve()
+        running = asyncio.create_task(run_in_turn(first, "first", 0.05, log))
+        queued = asyncio.create_task(run_in_turn(second, "second", 0, log))
+        last = asyncio.create_task(run_in_turn(third, "third", 0, log))
+        await asyncio.sleep(0.01)
+        queued.cancel()
+        await asyncio.gather(running, queued, last, return_exceptions=True)
+        return log
+    
+    assert asyncio.run(scenario()) == ["first start", "first end", "third start", "third end"]
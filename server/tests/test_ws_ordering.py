@@ -0,0 +1,114 @@
+import json
+import asyncio
+
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+import main
+from core import AdmissionController
+from layers.langchain_agent.fast_path_router import RouteRequest
+
+class SlowAgentOrchestrator:
+    """Commands read "<fast|agent> <admission class> <seconds to run>"."""
+    
+    def __init__(self):
+        self.log = []
+    
+    def route(self, command, thread_id=None):
+        request = RouteRequest(command, thread_id)
+        request.routed = (None, True) if command.startswith("fast") else None
+        return request
+    
+    def classify_command(self, request):
+        return request.command.split()[1]
+    
+    async def process_command(self, command, thread_id=None, request=None):
+        self.log.append(f"{command} start")
+        try:
+            await asyncio.sleep(float(command.split()[-1]))
+        except asyncio.CancelledError:
+            self.log.append(f"{command} cancelled")
+            raise
+        self.log.append(f"{command} end")
+        return {"intent": "general", "command": command, "result": "done"}
+    
+    def release_thread(self, thread_id):
+        self.log.append("released")
+
+def receive_responses(websocket, count):
+    ids = []
+    while len(ids) < count:
+        frame = websocket.receive_json()
+        if frame["type"] == "response":
+            ids.append(frame["id"])
+    return ids
+
+def test_agent_turns_keep_arrival_order_when_admission_would_reorder_them():
+    orchestrator = main.app.state.agent_orchestrator = SlowAgentOrchestrator()
+    main.app.state.admission = AdmissionController(max_concurrent=4, max_queue=4, queue_timeout=5, intent_limits={"slow": 1})
+    
+    with TestClient(main.app).websocket_connect("/ws") as websocket:
+        # Holds the only "slow" slot, so the first agent turn waits for admission and the second does not
+        websocket.send_json({"id": "a", "command": "fast slow 0.05"})
+        websocket.send_json({"id": "b", "command": "agent slow 0"})
+        websocket.send_json({"id": "c", "command": "agent general 0"})
+        ids = receive_responses(websocket, 3)
+    
+    assert ids.index("b") < ids.index("c")
+    agent_log = [entry for entry in orchestrator.log if entry.startswith("agent")]
+    assert agent_log == ["agent slow 0 start", "agent slow 0 end", "agent general 0 start", "agent general 0 end"]
+
+class ScriptedWebSocket:
+    """Delivers the given messages, then waits ``linger`` seconds and disconnects."""
+    
+    def __init__(self, messages, linger):
+        self.query_params = {}
+        self.messages = list(messages)
+        self.linger = linger
+        self.sent = []
+    
+    async def accept(self):
+        pass
+    
+    async def receive_text(self):
+        if self.messages:
+            return json.dumps(self.messages.pop(0))
+        await asyncio.sleep(self.linger)
+        raise WebSocketDisconnect(1000)
+    
+    async def send_text(self, text):
+        self.sent.append(json.loads(text))
+    
+    async def close(self):
+        pass
+
+def test_socket_close_waits_for_cancelled_commands_before_releasing_the_thread():
+    orchestrator = main.app.state.agent_orchestrator = SlowAgentOrchestrator()
+    main.app.state.admission = AdmissionController(max_concurrent=4, max_queue=4, queue_timeout=5)
+    websocket = ScriptedWebSocket([{"id": "a", "command": "agent general 5"}], linger=0.01)
+    
+    asyncio.run(main.websocket_endpoint(websocket))
+    
+    assert orchestrator.log == ["agent general 5 start", "agent general 5 cancelled", "released"]
+    assert websocket.sent[-1] == {"type": "cancelled", "id": "a"}
+
+class TruncatedStreamOrchestrator(SlowAgentOrchestrator):
+    async def stream_command(self, command, thread_id=None, request=None):
+        yield {"type": "step", "step": "thinking"}
+
+def test_stream_without_a_final_event_sends_an_error_frame():
+    main.app.state.agent_orchestrator = TruncatedStreamOrchestrator()
+    main.app.state.admission = AdmissionController(max_concurrent=4, max_queue=4, queue_timeout=5)
+    sent = []
+    
+    async def send(frame):
+        sent.append(frame)
+    
+    data = {"id": "a", "command": "agent general 0", "stream": True}
+    route = main.app.state.agent_orchestrator.route(data["command"], "t")
+    asyncio.run(main.run_ws_command(send, data, "t", route))
+    
+    assert sent == [
+        {"type": "step", "step": "thinking", "id": "a"},
+        {"type": "error", "message": "Command produced no response", "id": "a"}
+    ]
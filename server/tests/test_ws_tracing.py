@@ -0,0 +1,55 @@
+from fastapi.testclient import TestClient
+
+import main
+from core import AdmissionController
+from core.tracing import tracer
+from layers.langchain_agent import AgentOrchestrator
+from layers.langchain_agent.fast_path_router import RouteRequest
+
+class StreamingOrchestrator:
+    """Runs the real ``stream_command`` over a canned agent stream."""
+    
+    stream_command = AgentOrchestrator.stream_command
+    _trace_routing = AgentOrchestrator._trace_routing
+    
+    def route(self, command, thread_id=None):
+        return RouteRequest(command, thread_id)
+    
+    def classify_command(self, request):
+        return "general"
+    
+    async def _stream_route_command(self, request):
+        with tracer.start_span("agent_stream"):
+            yield {"type": "partial", "data": "working"}
+        yield {"type": "final", "response": {"intent": "general", "command": request.command, "result": f"done: {request.command}"}}
+    
+    async def _attach_video_metadata(self, response):
+        pass
+    
+    def release_thread(self, thread_id):
+        pass
+
+def receive_response(websocket):
+    while True:
+        frame = websocket.receive_json()
+        if frame["type"] == "response":
+            return frame
+
+def test_streamed_commands_on_one_socket_get_separate_traces():
+    tracer.configure(enabled=True)
+    main.app.state.agent_orchestrator = StreamingOrchestrator()
+    main.app.state.admission = AdmissionController(max_concurrent=4, max_queue=4, queue_timeout=1)
+    
+    with TestClient(main.app).websocket_connect("/ws") as websocket:
+        trace_ids = []
+        for command in ("first command", "second command"):
+            websocket.send_json({"command": command, "stream": True})
+            trace_ids.append(receive_response(websocket)["metadata"]["trace_id"])
+    
+    assert trace_ids[0] != trace_ids[1]
+    for trace_id in trace_ids:
+        roots = tracer.get_trace(trace_id)["spans"]
+        assert len(roots) == 1
+        assert roots[0]["name"] == "command"
+        assert roots[0]["parentSpanId"] is None
+        assert roots[0]["status"] == "ok"
@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from layers.external_services import youtube_metadata
+from layers.external_services.youtube_metadata import StaticMetadataSource, VideoMetadataSource
+
+RECORDS = {
+    "aaaaaaaaaaa": {"title": "First", "duration_seconds": 60},
+    "bbbbbbbbbbb": {"title": "Second", "duration_seconds": 120}
+}
+
+class RecordingSource(StaticMetadataSource):
+    def __init__(self, records):
+        super().__init__(records)
+        self.requested = []
+    
+    def fetch(self, video_ids):
+        self.requested.append(list(video_ids))
+        return super().fetch(video_ids)
+
+class FailingSource(VideoMetadataSource):
+    def fetch(self, video_ids):
+        raise ConnectionError("quota exceeded")
+
+@pytest.fixture
+def configure():
+    def apply(source):
+        youtube_metadata.configure(source)
+        youtube_metadata.metadata_cache.clear()
+        return source
+    yield apply
+    youtube_metadata.configure(None)
+
+def test_source_must_implement_fetch():
+    class Incomplete(VideoMetadataSource):
+        pass
+    with pytest.raises(TypeError):
+        Incomplete()
+
+def test_misses_are_fetched_in_one_batch_in_url_order(configure):
+    source = configure(RecordingSource(RECORDS))
+    videos = asyncio.run(youtube_metadata.enrich_videos([
+        "https://www.youtube.com/watch?v=bbbbbbbbbbb",
+        "https://youtu.be/aaaaaaaaaaa",
+        "https://www.youtube.com/watch?v=ccccccccccc",
+        "https://youtu.be/aaaaaaaaaaa"
+    ]))
+    assert source.requested == [["bbbbbbbbbbb", "aaaaaaaaaaa", "ccccccccccc"]]
+    assert [video.get("title") for video in videos] == ["Second", "First", None, "First"]
+    assert videos[2] == {"video_id": "ccccccccccc", "url": "https://www.youtube.com/watch?v=ccccccccccc"}
+
+def test_cached_videos_skip_the_lookup(configure):
+    source = configure(RecordingSource(RECORDS))
+    
+    async def scenario():
+        await youtube_metadata.enrich_videos(["https://youtu.be/aaaaaaaaaaa"])
+        return await youtube_metadata.enrich_videos(["https://youtu.be/aaaaaaaaaaa", "https://youtu.be/bbbbbbbbbbb"])
+    
+    videos = asyncio.run(scenario())
+    assert source.requested == [["aaaaaaaaaaa"], ["bbbbbbbbbbb"]]
+    assert [video["title"] for video in videos] == ["First", "Second"]
+    
+    asyncio.run(youtube_metadata.enrich_videos(["https://youtu.be/bbbbbbbbbbb"]))
+    assert len(source.requested) == 2
+
+def test_failed_lookup_returns_bare_entries_and_caches_nothing(configure):
+    configure(FailingSource())
+    videos = asyncio.run(youtube_metadata.enrich_videos(["https://youtu.be/aaaaaaaaaaa"]))
+    assert videos == [{"video_id": "aaaaaaaaaaa", "url": "https://youtu.be/aaaaaaaaaaa"}]
+    assert youtube_metadata.metadata_cache.get("aaaaaaaaaaa")[1] == "miss"
+
+def test_no_source_disables_enrichment():
+    youtube_metadata.configure(None)
+    assert asyncio.run(youtube_metadata.enrich_videos(["https://youtu.be/aaaaaaaaaaa"])) is None
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Train the local intent classifier used to route easy commands away from the LLM.
+
+Example:
+    python train_intent_classifier.py --corpus config/intent_corpus.jsonl --output intent_classifier.npz
+
+Then point the server at the model with ALRIS_INTENT_MODEL=intent_classifier.npz.
+"""
+import argparse
+import logging
+import random
+from layers.langchain_agent.intent_classifier import IntentClassifier, load_corpus
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger("train_intent_classifier")
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the Alris intent classifier")
+    parser.add_argument("--corpus", default="config/intent_corpus.jsonl", help="JSONL file of {text, intent} examples")
+    parser.add_argument("--output", default="intent_classifier.npz", help="Where to write the trained model")
+    parser.add_argument("--epochs", type=int, default=100)
+    parser.add_argument("--learning-rate", type=float, default=1.0)
+    parser.add_argument("--n-features", type=int, default=2 ** 15)
+    parser.add_argument("--holdout", type=float, default=0.2, help="Fraction of examples held out for evaluation")
+    args = parser.parse_args()
+    
+    texts, labels = load_corpus(args.corpus)
+    logger.info(f"Loaded {len(texts)} examples with labels {sorted(set(labels))}")
+    
+    examples = list(zip(texts, labels))
+    random.Random(0).shuffle(examples)
+    split = int(len(examples) * (1 - args.holdout))
+    train, held_out = examples[:split], examples[split:]
+    
+    classifier = IntentClassifier(sorted(set(labels)), n_features=args.n_features)
+    classifier.fit([t for t, _ in train], [l for _, l in train], epochs=args.epochs, learning_rate=args.learning_rate)
+    if held_out:
+        logger.info(f"Held-out evaluation: {classifier.evaluate([t for t, _ in held_out], [l for _, l in held_out])}")
+    
+    # Retrain on everything for the shipped model
+    classifier = IntentClassifier(sorted(set(labels)), n_features=args.n_features)
+    classifier.fit(texts, labels, epochs=args.epochs, learning_rate=args.learning_rate)
+    logger.info(f"Training-set evaluation: {classifier.evaluate(texts, labels)}")
+    classifier.save(args.output)
+
+if __name__ == "__main__":
+    main()